@@ -3,6 +3,15 @@ ASGI config for MothersGarage project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Async endpoints (MothersGarage.async_views.AsyncAPIView subclasses) only pay
+off when served from here, e.g.:
+
+    gunicorn MothersGarage.asgi:application -k uvicorn.workers.UvicornWorker -w 4
+
+Synchronous DRF views keep working under ASGI; Django runs them in a thread.
+Server-Sent Events (/api/v1/events/stream) are only served from here; the
+WSGI application answers them with 501.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
@@ -0,0 +1,72 @@
+"""
+Base class for native async endpoints.
+
+DRF views are synchronous, so under ASGI every request that waits on PayPal,
+SMTP or LibreTranslate holds a thread. AsyncAPIView is a small async Django
+View that speaks the same JSON + JWT contract as the DRF views, letting one
+worker overlap many outbound waits. Deploy with an ASGI server, e.g.
+
+    gunicorn MothersGarage.asgi:application -k uvicorn.workers.UvicornWorker
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import PROFILE_RELATIONS
+
+User = get_user_model()
+
+
+class AsyncAPIView(View):
+    # Mirrors DRF's IsAuthenticated / AllowAny choice
+    require_authentication = True
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # JWT-authenticated API, same as the DRF views: no CSRF cookie involved
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def authenticate(self, request):
+        jwt = JWTAuthentication()
+        header = jwt.get_header(request)
+        if header is None:
+            return None
+        raw_token = jwt.get_raw_token(header)
+        if raw_token is None:
+            return None
+        try:
+            token = jwt.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
+        return await User.objects.select_related(*PROFILE_RELATIONS).filter(
+            **{api_settings.USER_ID_FIELD: token[api_settings.USER_ID_CLAIM]},
+            is_active=True,
+        ).afirst()
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await self.authenticate(request)
+        if user is None and self.require_authentication:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=401,
+            )
+        request.user = user or AnonymousUser()
+
+        if request.content_type == "application/json":
+            try:
+                request.data = json.loads(request.body or b"{}")
+            except ValueError:
+                return JsonResponse({"detail": "Malformed JSON body."}, status=400)
+        else:
+            request.data = request.POST.dict()
+
+        return await super().dispatch(request, *args, **kwargs)
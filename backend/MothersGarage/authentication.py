@@ -0,0 +1,46 @@
+"""
+JWT authentication that loads the caller's profile with the user.
+
+Views read request.user.mother_profile / provider_profile for the caller's
+preferred_language, country and pinned location. With simplejwt's default
+lookup each of those is one more query per request; here the user row and
+both reverse one-to-one profiles come back in a single joined SELECT, and a
+missing profile is cached as missing too.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+PROFILE_RELATIONS = ("mother_profile", "provider_profile")
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        # Same checks as JWTAuthentication.get_user, with the profiles joined
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = self.user_model.objects.select_related(*PROFILE_RELATIONS).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
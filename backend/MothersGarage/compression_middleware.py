@@ -0,0 +1,171 @@
+import gzip
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .middleware_base import SyncAndAsyncMiddleware
+
+try:
+    import brotli
+except ImportError:  # gzip only without the Brotli package
+    brotli = None
+
+
+def _accepted_encodings(header):
+    """
+    {"gzip": 1.0, "br": 0.8, ...} from an Accept-Encoding header.
+    """
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(header):
+    """
+    The best encoding the client accepts: Brotli over gzip on equal q-values.
+    None when neither is acceptable.
+    """
+    accepted = _accepted_encodings(header)
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(encoding, data):
+    if encoding == "br":
+        return brotli.compress(
+            data, mode=brotli.MODE_TEXT, quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+    return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """
+    Incremental compressor that flushes after every chunk, so streamed
+    responses (CSV exports, event streams) still reach the client promptly.
+    """
+
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(
+                mode=brotli.MODE_TEXT, quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits=31: gzip container
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        if self._brotli is not None:
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _compress_stream(encoding, chunks):
+    compressor = _StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _acompress_stream(encoding, chunks):
+    compressor = _StreamCompressor(encoding)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(SyncAndAsyncMiddleware):
+    """
+    gzip/Brotli for API responses, negotiated from Accept-Encoding.
+
+    Only COMPRESSIBLE_CONTENT_TYPES are touched, so PDFs, images and other
+    already-compressed media pass through untouched, as do partial (206)
+    responses, responses that already have a Content-Encoding and bodies
+    smaller than COMPRESSION_MIN_SIZE, where the framing costs more than it
+    saves. Streaming responses are compressed chunk by chunk.
+    """
+
+    def handle(self, request):
+        return self.process(request, self.get_response(request))
+
+    async def ahandle(self, request):
+        return self.process(request, await self.get_response(request))
+
+    def process(self, request, response):
+        if not self._is_compressible(response):
+            return response
+
+        # From here the representation depends on Accept-Encoding, even for
+        # clients that did not ask for compression
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _acompress_stream(
+                    encoding, response.streaming_content
+                )
+            else:
+                response.streaming_content = _compress_stream(
+                    encoding, response.streaming_content
+                )
+            # The compressed length is unknown until the stream ends
+            del response["Content-Length"]
+        else:
+            compressed = compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The compressed body is a different byte sequence: weaken strong ETags
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+    def _is_compressible(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.has_header("Content-Encoding"):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if not content_type.startswith(settings.COMPRESSIBLE_CONTENT_TYPES):
+            return False
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return False
+        return True
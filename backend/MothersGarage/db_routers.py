@@ -0,0 +1,46 @@
+"""
+Read-replica routing.
+
+Views opt in with ``read_replica = True``; ReplicaRoutingMiddleware turns that
+into a per-request flag for safe methods. Everything else, and every read
+after the request has written anything, goes to "default" (read-your-writes).
+With no DB_REPLICAS configured all traffic stays on the primary.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_use_replica = ContextVar("mg_use_replica", default=False)
+_pinned_to_primary = ContextVar("mg_pinned_to_primary", default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+def pin_to_primary():
+    """
+    Forces the rest of the current request onto the primary.
+    """
+    _pinned_to_primary.set(True)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or _pinned_to_primary.get():
+            return "default"
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else "default"
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
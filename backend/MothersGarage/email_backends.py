@@ -0,0 +1,17 @@
+from django.core.mail.backends.smtp import EmailBackend
+
+from .metrics import count_upstream_error, track_upstream
+
+
+class InstrumentedSMTPBackend(EmailBackend):
+    """
+    SMTP backend that reports send latency and failures to /metrics.
+    """
+
+    def send_messages(self, email_messages):
+        with track_upstream("smtp", "send"):
+            sent = super().send_messages(email_messages)
+        # fail_silently swallows errors; a short count is the only trace left
+        if email_messages and sent < len(email_messages):
+            count_upstream_error("smtp", "send")
+        return sent
@@ -0,0 +1,98 @@
+"""
+Server-Sent Events endpoints (see MothersGarage.events).
+
+Browsers' EventSource cannot send an Authorization header, so a stream is
+opened with a signed channel token in the query string: logged-in users get
+one from EventTokenView, provider applicants with their sign-up response.
+
+    const source = new EventSource(`/api/v1/events/stream?token=${token}`);
+    source.addEventListener("provider.approved", ...);
+
+Streams are only served under ASGI (see asgi.py), e.g.
+
+    gunicorn MothersGarage.asgi:application -k uvicorn.workers.UvicornWorker
+
+Under WSGI Django consumes an async streaming body completely before sending
+the first byte, so a subscriber would get nothing for EVENT_STREAM_MAX_AGE
+while holding a worker; the stream endpoint answers 501 there instead. Route
+/api/v1/events/stream to an ASGI worker when the rest of the API runs WSGI.
+"""
+
+import json
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .events import channel_from_token, channel_token, get_broker, user_channel
+
+
+class EventTokenView(APIView):
+    """
+    GET /api/v1/events/token
+    Token for the current user's event stream.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {
+                "token": channel_token(user_channel(request.user.pk)),
+                "expires_in": settings.EVENT_TOKEN_MAX_AGE,
+            }
+        )
+
+
+def _format(event_id, event, data):
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream(channel, last_event_id):
+    deadline = time.monotonic() + settings.EVENT_STREAM_MAX_AGE
+    # Subscribing on first read: a response that is never sent never subscribes
+    subscription = get_broker().subscribe(channel, last_event_id=last_event_id)
+    try:
+        # Reconnect delay hint for EventSource after the stream ends
+        yield f"retry: {settings.EVENT_STREAM_RETRY_MS}\n\n"
+        while time.monotonic() < deadline:
+            message = await subscription.get(timeout=settings.EVENT_STREAM_HEARTBEAT)
+            if message is None:
+                # Comment line: keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+            else:
+                yield _format(*message)
+    finally:
+        subscription.close()
+
+
+async def event_stream_view(request):
+    """
+    GET /api/v1/events/stream?token=...
+    Ends after EVENT_STREAM_MAX_AGE seconds; EventSource reconnects on its own
+    and sends Last-Event-ID, so events published in between are replayed.
+    ASGI only: 501 when served by the WSGI handler.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed."}, status=405)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event streams are served by the ASGI application only."},
+            status=501,
+        )
+    channel = channel_from_token(request.GET.get("token", ""))
+    if channel is None:
+        return JsonResponse({"detail": "Invalid or expired token."}, status=403)
+
+    response = StreamingHttpResponse(
+        _stream(channel, request.headers.get("Last-Event-ID")),
+        content_type="text/event-stream",
+    )
+    # no-transform also keeps CompressionMiddleware from buffering the stream
+    response["Cache-Control"] = "no-cache, no-transform"
+    response["X-Accel-Buffering"] = "no"
+    return response
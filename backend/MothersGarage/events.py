@@ -0,0 +1,186 @@
+"""
+Push events for clients that would otherwise poll (approval, subscription and
+booking-usage status), delivered as Server-Sent Events by
+MothersGarage.event_stream.
+
+Code publishes to a channel (user_channel / applicant_channel) through
+publish_on_commit; the broker named by settings.EVENT_BROKER fans events out
+to the streams subscribed to that channel. InProcessBroker only reaches
+streams served by the same process: with several workers, point EVENT_BROKER
+at a network broker (e.g. Redis pub/sub) implementing the same two methods.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import uuid
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = "MothersGarage.events"
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+def applicant_channel(pending_id):
+    """
+    Provider applicants have no account (and no JWT) until approved.
+    """
+    return f"applicant:{pending_id}"
+
+
+def channel_token(channel):
+    return signing.dumps(channel, salt=TOKEN_SALT)
+
+
+def channel_from_token(token):
+    """
+    The channel a token grants, or None if it is forged or expired.
+    """
+    try:
+        channel = signing.loads(token, salt=TOKEN_SALT)
+        # Applicant tokens outlive the review; user tokens are fetched again
+        # with a fresh JWT
+        if channel.startswith("applicant:"):
+            max_age = settings.EVENT_APPLICANT_TOKEN_MAX_AGE
+        else:
+            max_age = settings.EVENT_TOKEN_MAX_AGE
+        signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:  # includes SignatureExpired
+        return None
+    return channel
+
+
+class Subscription:
+    """
+    One stream's view of a channel: events missed since last_event_id first,
+    then live ones. Returned by a broker's subscribe().
+    """
+
+    def __init__(self, broker, channel, backlog):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=settings.EVENT_QUEUE_SIZE)
+        self.backlog = deque(backlog)
+
+    def offer(self, message):
+        # Runs on the subscriber's loop; a stream that stopped reading loses
+        # events rather than growing without bound
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("Dropped event for slow stream on %s", self.channel)
+
+    async def get(self, timeout):
+        """
+        The next (id, event, data), or None after timeout seconds of silence.
+        """
+        if self.backlog:
+            return self.backlog.popleft()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Fan-out within this process, safe to publish from any thread. The last
+    EVENT_REPLAY_SIZE events of each recent channel are kept so a client that
+    reconnects with Last-Event-ID does not miss anything.
+    """
+
+    max_channels = 10_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self._history = OrderedDict()
+        # Ids are unique to this process, so a replayed id from before a
+        # restart is never mistaken for a recent one
+        self._id_prefix = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+
+    def publish(self, channel, event, data):
+        with self._lock:
+            message = (f"{self._id_prefix}-{next(self._counter)}", event, data)
+            history = self._history.pop(channel, None)
+            if history is None:
+                history = deque(maxlen=settings.EVENT_REPLAY_SIZE)
+            history.append(message)
+            self._history[channel] = history
+            while len(self._history) > self.max_channels:
+                self._history.popitem(last=False)
+            subscriptions = list(self._subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:  # the stream's loop is gone
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel, last_event_id=None):
+        """
+        Must be called from the stream's event loop.
+        """
+        with self._lock:
+            backlog = []
+            if last_event_id:
+                history = list(self._history.get(channel, ()))
+                ids = [message[0] for message in history]
+                # Unknown id (expired, or another process): replay what we have
+                start = ids.index(last_event_id) + 1 if last_event_id in ids else 0
+                backlog = history[start:]
+            subscription = Subscription(self, channel, backlog)
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENT_BROKER)()
+    return _broker
+
+
+def publish(channel, event, data):
+    try:
+        get_broker().publish(channel, event, data)
+    except Exception:
+        # Events are a convenience on top of the API, never a reason to fail
+        logger.exception("Publishing %s to %s failed", event, channel)
+
+
+def publish_on_commit(channel, event, data):
+    """
+    Publishes once the surrounding transaction commits, so clients never hear
+    about a change they cannot read yet (or one that was rolled back).
+    """
+    transaction.on_commit(lambda: publish(channel, event, data))
@@ -0,0 +1,213 @@
+"""
+Per-request query and latency instrumentation.
+
+For every request the middleware records the resolved endpoint (URL name),
+number of SQL queries across all database aliases, time spent in SQL, the
+remaining Python time and the response size. Each request is logged to
+"MothersGarage.instrumentation_middleware" (INFO, fields also in record
+extras) and folded into the process-wide ``endpoint_stats`` aggregate and the
+Prometheus histograms in MothersGarage.metrics.
+
+QUERY_BUDGETS caps queries per URL name. Over-budget requests log a warning,
+or raise QueryBudgetExceeded when QUERY_BUDGET_STRICT is on (the default
+under ``manage.py test``), which fails the test that made the request.
+Queries run while a streaming response is consumed are not counted.
+
+Queries are counted by an execute wrapper installed once on every database
+connection, reporting to the collector in a ContextVar. Under ASGI the ORM
+runs in sync_to_async threads with their own connections; the ContextVar
+follows the request there, so the middleware itself stays async.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import metrics
+from .middleware_base import SyncAndAsyncMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class _QueryCollector:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+_collector_var = ContextVar("query_collector", default=None)
+
+
+def _collect(execute, sql, params, many, context):
+    collector = _collector_var.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    return collector(execute, sql, params, many, context)
+
+
+def _install(connection):
+    if _collect not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_collect)
+
+
+@receiver(connection_created, dispatch_uid="instrumentation_collect_queries")
+def _install_on_new_connection(sender, connection, **kwargs):
+    _install(connection)
+
+
+class EndpointStats:
+    """
+    Running per-endpoint totals for this process, keyed by URL name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, endpoint, queries, sql_ms, total_ms, size):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "sql_ms": 0.0,
+                    "total_ms": 0.0,
+                    "max_total_ms": 0.0,
+                    "bytes": 0,
+                }
+            stats["requests"] += 1
+            stats["queries"] += queries
+            stats["max_queries"] = max(stats["max_queries"], queries)
+            stats["sql_ms"] += sql_ms
+            stats["total_ms"] += total_ms
+            stats["max_total_ms"] = max(stats["max_total_ms"], total_ms)
+            stats["bytes"] += size or 0
+
+    def snapshot(self):
+        """
+        {endpoint: totals plus per-request averages}, safe to serialise.
+        """
+        with self._lock:
+            result = {}
+            for endpoint, stats in self._stats.items():
+                count = stats["requests"]
+                result[endpoint] = {
+                    **stats,
+                    "avg_queries": stats["queries"] / count,
+                    "avg_sql_ms": stats["sql_ms"] / count,
+                    "avg_total_ms": stats["total_ms"] / count,
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+endpoint_stats = EndpointStats()
+
+
+def endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.url_name or match.route
+
+
+class RequestInstrumentationMiddleware(SyncAndAsyncMiddleware):
+    def _start(self):
+        # Connections opened before this module was imported (e.g. the test
+        # database) missed connection_created
+        for alias in connections:
+            _install(connections[alias])
+        collector = _QueryCollector()
+        return collector, _collector_var.set(collector), time.perf_counter()
+
+    def handle(self, request):
+        collector, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _collector_var.reset(token)
+        return self._finish(request, response, collector, start)
+
+    async def ahandle(self, request):
+        collector, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _collector_var.reset(token)
+        return self._finish(request, response, collector, start)
+
+    def _finish(self, request, response, collector, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        sql_ms = collector.duration * 1000
+        python_ms = total_ms - sql_ms
+        size = None if response.streaming else len(response.content)
+        endpoint = endpoint_name(request)
+
+        endpoint_stats.record(endpoint, collector.count, sql_ms, total_ms, size)
+        metrics.observe_request(
+            endpoint,
+            request.method,
+            response.status_code,
+            total_ms / 1000,
+            collector.count,
+            collector.duration,
+        )
+        logger.info(
+            "%s %s endpoint=%s status=%s queries=%d sql_ms=%.1f python_ms=%.1f bytes=%s",
+            request.method,
+            request.path,
+            endpoint,
+            response.status_code,
+            collector.count,
+            sql_ms,
+            python_ms,
+            size,
+            extra={
+                "endpoint": endpoint,
+                "status": response.status_code,
+                "queries": collector.count,
+                "sql_ms": round(sql_ms, 2),
+                "python_ms": round(python_ms, 2),
+                "response_bytes": size,
+            },
+        )
+
+        if settings.REQUEST_TIMING_HEADERS:
+            response["X-Query-Count"] = str(collector.count)
+            response["Server-Timing"] = (
+                f"db;dur={sql_ms:.1f}, app;dur={python_ms:.1f}, total;dur={total_ms:.1f}"
+            )
+
+        budget = settings.QUERY_BUDGETS.get(endpoint)
+        if budget is not None and collector.count > budget:
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(
+                    f"{endpoint} ran {collector.count} queries (budget {budget})."
+                )
+            logger.warning(
+                "%s ran %d queries (budget %d)", endpoint, collector.count, budget
+            )
+        return response
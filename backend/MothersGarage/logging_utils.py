@@ -0,0 +1,60 @@
+"""
+Logging helpers referenced from settings.LOGGING.
+
+Kept free of Django imports at module level: logging is configured while
+settings are still loading.
+"""
+
+import json
+import logging
+import random
+from contextvars import ContextVar
+
+request_id_var = ContextVar("mg_request_id", default="-")
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps records with the current request's id (see RequestIdMiddleware).
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: the usual fields plus any extra={...} values.
+    """
+
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def debug_sampled(logger):
+    """
+    True for a LOG_DEBUG_SAMPLE_RATE share of calls when DEBUG is enabled on
+    logger. Guards debug logging of whole payloads so it stays cheap even
+    when debug logging is switched on in production.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    from django.conf import settings
+
+    return random.random() < settings.LOG_DEBUG_SAMPLE_RATE
@@ -0,0 +1,114 @@
+"""
+Prometheus metrics, served at /metrics.
+
+Request and database metrics are fed by RequestInstrumentationMiddleware;
+outbound calls (PayPal, LibreTranslate, SMTP) are wrapped in track_upstream().
+Under gunicorn, point PROMETHEUS_MULTIPROC_DIR at an empty directory shared by
+the workers (cleared on every deploy) so all workers' samples are aggregated.
+Without prometheus_client everything here is a no-op.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    prometheus_client = None
+
+_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        "mg_http_request_duration_seconds",
+        "Time to produce a response, by URL name.",
+        ["endpoint", "method"],
+    )
+    RESPONSES = Counter(
+        "mg_http_responses_total",
+        "Responses by URL name and status code.",
+        ["endpoint", "method", "status"],
+    )
+    DB_QUERIES = Histogram(
+        "mg_db_queries_per_request",
+        "SQL queries per request, by URL name.",
+        ["endpoint"],
+        buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+    )
+    DB_DURATION = Histogram(
+        "mg_db_duration_seconds_per_request",
+        "Total SQL time per request, by URL name.",
+        ["endpoint"],
+    )
+    UPSTREAM_LATENCY = Histogram(
+        "mg_upstream_request_duration_seconds",
+        "Outbound call latency.",
+        ["service", "operation"],
+    )
+    UPSTREAM_ERRORS = Counter(
+        "mg_upstream_errors_total",
+        "Failed outbound calls.",
+        ["service", "operation"],
+    )
+
+
+def observe_request(endpoint, method, status, duration, queries, sql_duration):
+    if prometheus_client is None:
+        return
+    method = method if method in _METHODS else "other"
+    REQUEST_LATENCY.labels(endpoint, method).observe(duration)
+    RESPONSES.labels(endpoint, method, str(status)).inc()
+    DB_QUERIES.labels(endpoint).observe(queries)
+    DB_DURATION.labels(endpoint).observe(sql_duration)
+
+
+def count_upstream_error(service, operation):
+    if prometheus_client is not None:
+        UPSTREAM_ERRORS.labels(service, operation).inc()
+
+
+@contextmanager
+def track_upstream(service, operation):
+    """
+    Times the enclosed outbound call; an exception escaping the block counts
+    as an error. Works around awaits as well.
+    """
+    if prometheus_client is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        count_upstream_error(service, operation)
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(service, operation).observe(time.perf_counter() - start)
+
+
+def metrics_view(request):
+    if prometheus_client is None:
+        return HttpResponse(
+            "prometheus_client is not installed.\n", status=501, content_type="text/plain"
+        )
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        return HttpResponse(status=403)
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import CollectorRegistry, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(
+        prometheus_client.generate_latest(registry),
+        content_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
@@ -0,0 +1,48 @@
+"""
+Pagination helpers for very large tables.
+"""
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def table_row_estimate(queryset):
+    """
+    PostgreSQL's statistics-based row count for the queryset's table; -1 when
+    the table has never been analyzed.
+    """
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else -1
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    COUNT(*) on a large table is a full scan, and the admin changelist runs it
+    on every page view. For the unfiltered list of a table above
+    ADMIN_ESTIMATED_COUNT_THRESHOLD rows the count is pg_class.reltuples
+    instead, so page totals are approximate there. Filtered or searched lists
+    are always counted exactly: planner estimates for a WHERE clause can be
+    off by orders of magnitude, which would show empty or missing pages.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if (
+            not isinstance(queryset, QuerySet)
+            or queryset.query.where
+            or connections[queryset.db].vendor != "postgresql"
+        ):
+            return super().count
+        estimate = table_row_estimate(queryset)
+        if estimate < settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+        return estimate
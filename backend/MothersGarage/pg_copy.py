@@ -0,0 +1,75 @@
+"""
+Bulk loading with PostgreSQL COPY, for imports and synthetic data where
+INSERTs (even bulk_create) are the bottleneck.
+"""
+
+import io
+from datetime import datetime
+
+from django.db import connection
+from django.utils import timezone
+
+
+def _copy_value(value):
+    if value is None:
+        return r"\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, (list, tuple)):
+        items = (
+            '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"' for item in value
+        )
+        value = "{" + ",".join(items) + "}"
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class CopyWriter:
+    """
+    Streams rows (dicts of attname -> value) into one table with COPY.
+    Columns missing from a row get the field's default; the primary key is
+    only written when include_pk is set, otherwise the database assigns it.
+    """
+
+    def __init__(self, cursor, model, include_pk=False):
+        self.cursor = cursor
+        self.table = connection.ops.quote_name(model._meta.db_table)
+        now = timezone.now()
+        self.fields = []
+        for field in model._meta.concrete_fields:
+            if field.primary_key and not include_pk:
+                continue
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                default = now
+            else:
+                default = field.get_default()
+            self.fields.append((field.attname, field.column, default))
+
+    def write(self, rows):
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(
+                "\t".join(
+                    _copy_value(row.get(attname, default))
+                    for attname, _, default in self.fields
+                )
+            )
+            buffer.write("\n")
+        columns = ", ".join(connection.ops.quote_name(column) for _, column, _ in self.fields)
+        sql = f"COPY {self.table} ({columns}) FROM STDIN"
+        buffer.seek(0)
+        if hasattr(self.cursor, "copy_expert"):  # psycopg2
+            self.cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with self.cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
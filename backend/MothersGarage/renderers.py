@@ -0,0 +1,50 @@
+"""
+orjson-backed JSON rendering for DRF, with a transparent fallback to DRF's
+own JSONRenderer when orjson is not installed.
+"""
+
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from django.contrib.gis.geos import GEOSGeometry
+except Exception:  # GEOS missing: geometries can't appear in payloads anyway
+    GEOSGeometry = None
+
+_drf_encoder = JSONEncoder()
+
+
+def default(obj):
+    """
+    Types orjson does not handle natively. Geometries become GeoJSON objects;
+    everything else (Decimal, datetimes, lazy strings, querysets...) goes
+    through DRF's encoder so responses look exactly as before.
+    """
+    if GEOSGeometry is not None and isinstance(obj, GEOSGeometry):
+        return json.loads(obj.geojson)
+    return _drf_encoder.default(obj)
+
+
+if orjson is not None:
+    # Datetimes pass through to default() so the wire format doesn't change
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            # Pretty-printing was requested (browsable API, ?indent=): rare path
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
@@ -0,0 +1,61 @@
+from django.conf import settings
+
+from .db_routers import _pinned_to_primary, _use_replica
+from .middleware_base import SyncAndAsyncMiddleware
+
+PIN_COOKIE = "mg_read_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware(SyncAndAsyncMiddleware):
+    """
+    Scopes replica routing to one request. A request that writes sets a short
+    cookie so the same client keeps reading from the primary until replicas
+    have caught up (REPLICA_PIN_SECONDS).
+    """
+
+    def _start(self, request):
+        already_pinned = request.COOKIES.get(PIN_COOKIE) == "1"
+        pinned_token = _pinned_to_primary.set(already_pinned)
+        return already_pinned, pinned_token, _use_replica.set(False)
+
+    def _finish(self, response, already_pinned):
+        if _pinned_to_primary.get() and not already_pinned:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def _reset(self, pinned_token, replica_token):
+        _pinned_to_primary.reset(pinned_token)
+        _use_replica.reset(replica_token)
+
+    def handle(self, request):
+        already_pinned, pinned_token, replica_token = self._start(request)
+        try:
+            response = self.get_response(request)
+            return self._finish(response, already_pinned)
+        finally:
+            self._reset(pinned_token, replica_token)
+
+    async def ahandle(self, request):
+        # Same ContextVars: sync views run via sync_to_async, which hands the
+        # router a copy of this context and copies writes (the pin) back
+        already_pinned, pinned_token, replica_token = self._start(request)
+        try:
+            response = await self.get_response(request)
+            return self._finish(response, already_pinned)
+        finally:
+            self._reset(pinned_token, replica_token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None) or getattr(
+            view_func, "cls", None
+        )
+        if request.method in SAFE_METHODS and getattr(view_class, "read_replica", False):
+            _use_replica.set(True)
+        return None
@@ -0,0 +1,43 @@
+import re
+import uuid
+
+from .logging_utils import request_id_var
+from .middleware_base import SyncAndAsyncMiddleware
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Accept ids from the proxy/client only if they look like ids
+_VALID_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware(SyncAndAsyncMiddleware):
+    """
+    Gives every request an id (the incoming X-Request-ID, else a new one),
+    attaches it to all log records emitted while handling the request and
+    echoes it in the response so clients and logs can be correlated.
+    """
+
+    def _start(self, request):
+        request_id = request.headers.get(REQUEST_ID_HEADER, "")
+        if not _VALID_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        return request_id_var.set(request_id)
+
+    def handle(self, request):
+        token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
+
+    async def ahandle(self, request):
+        # The ContextVar is per task; sync_to_async views inherit a copy of it
+        token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -47,15 +49,27 @@ INSTALLED_APPS = [
     "onboarding",
     "authentication",
     "payments",
+    "bookings",
 ]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # simplejwt's JWTAuthentication, with the caller's profile joined in
+        "MothersGarage.authentication.ProfileJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
+    # orjson-backed JSON (falls back to DRF's stdlib json without orjson)
+    "DEFAULT_RENDERER_CLASSES": (
+        "MothersGarage.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "MothersGarage.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 
@@ -69,8 +83,12 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    "MothersGarage.request_id_middleware.RequestIdMiddleware",
+    # Next, so its timings cover the rest of the middleware stack
+    "MothersGarage.instrumentation_middleware.RequestInstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "MothersGarage.compression_middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -78,6 +96,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "MothersGarage.replica_middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "MothersGarage.urls"
@@ -104,17 +123,79 @@ WSGI_APPLICATION = "MothersGarage.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+#
+# Connection reuse. Every connection costs a TCP+TLS handshake, backend fork
+# and PostGIS session setup, so connections are kept open between requests:
+#
+# - Persistent mode (default): each gunicorn worker thread holds at most one
+#   connection for DB_CONN_MAX_AGE seconds, re-validated by CONN_HEALTH_CHECKS
+#   before reuse. Connections in use = workers * threads.
+# - Pool mode (DB_POOL=1, needs psycopg>=3 and psycopg-pool): each worker
+#   process keeps DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections shared by its
+#   threads. Connections in use = workers * DB_POOL_MAX_SIZE.
+#
+# Sizing: keep (gunicorn workers per host * hosts * per-worker connections)
+# below PostgreSQL max_connections minus ~10 reserved for admin/migrations.
+# Example: 2 hosts * 5 workers * 4 threads = 40 connections fits the default
+# max_connections=100; beyond that put PgBouncer (transaction mode) in front
+# and keep DB_CONN_MAX_AGE but disable server-side cursors.
+# benchmarks/db_connections.py measures per-request latency for each mode.
+
+DB_POOL = os.environ.get("DB_POOL", "") == "1"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.contrib.gis.db.backends.postgis",
-        "NAME": "mgd",
-        "USER": "postgres",
-        "PASSWORD": "Gotyouwillis@1998",
-        "HOST": "localhost",
-        "PORT": "5432",
+        "NAME": os.environ.get("DB_NAME", "mgd"),
+        "USER": os.environ.get("DB_USER", "postgres"),
+        "PASSWORD": os.environ.get("DB_PASSWORD", "Gotyouwillis@1998"),
+        "HOST": os.environ.get("DB_HOST", "localhost"),
+        "PORT": os.environ.get("DB_PORT", "5432"),
+        # Django's pool and persistent connections are mutually exclusive
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "1") == "1",
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", "5")),
+            # Let the OS notice dead peers on long-lived connections
+            "keepalives": 1,
+            "keepalives_idle": 60,
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
+        },
     }
 }
 
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "4")),
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        # Pool-side health check before handing out a connection
+        "check": ConnectionPool.check_connection,
+    }
+
+# Read replicas: DB_REPLICAS="host[:port][/name],..." adds replica0, replica1...
+# aliases used by MothersGarage.db_routers for views marked read_replica = True.
+# For local testing two databases on one server work too, e.g.
+# DB_REPLICAS="localhost:5432/mgd_replica". Test runs mirror them to "default".
+for index, replica in enumerate(filter(None, os.environ.get("DB_REPLICAS", "").split(","))):
+    host_port, _, replica_name = replica.strip().partition("/")
+    replica_host, _, replica_port = host_port.partition(":")
+    DATABASES[f"replica{index}"] = {
+        **DATABASES["default"],
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+        "NAME": replica_name or DATABASES["default"]["NAME"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["MothersGarage.db_routers.ReplicaRouter"]
+# How long a client that just wrote keeps reading from the primary
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "5"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -181,21 +262,166 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_ALL_ORIGINS = True
 
 
-GDAL_LIBRARY_PATH = r"C:\Users\willi\GDAL\.pixi\envs\default\Library\bin\gdal.dll"
+# Empty GDAL_LIBRARY_PATH lets Django find GDAL itself (Linux containers)
+GDAL_LIBRARY_PATH = (
+    os.environ.get(
+        "GDAL_LIBRARY_PATH", r"C:\Users\willi\GDAL\.pixi\envs\default\Library\bin\gdal.dll"
+    )
+    or None
+)
 
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
-EMAIL_HOST_USER = "jamesokadibong@gmail.com"
-EMAIL_HOST_PASSWORD = "mylm arrq gvwt cfku"
+# SMTP with send latency/failures exported to /metrics
+EMAIL_BACKEND = "MothersGarage.email_backends.InstrumentedSMTPBackend"
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "smtp.gmail.com")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "587"))
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "1") == "1"
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "jamesokadibong@gmail.com")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "mylm arrq gvwt cfku")
 
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
 
+# Logging. LOG_LEVEL sets the default; LOG_LEVELS overrides single loggers,
+# e.g. LOG_LEVELS="onboarding=DEBUG,django.db.backends=DEBUG". LOG_FORMAT=json
+# emits one JSON object per line. Every record carries the request id.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+# Share of requests whose full debug payloads are logged when DEBUG is on
+LOG_DEBUG_SAMPLE_RATE = float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {"()": "MothersGarage.logging_utils.RequestIdFilter"},
+    },
+    "formatters": {
+        "text": {
+            "format": "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s",
+        },
+        "json": {"()": "MothersGarage.logging_utils.JsonFormatter"},
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "filters": ["request_id"],
+            "formatter": LOG_FORMAT,
+        },
+    },
+    "root": {"handlers": ["console"], "level": LOG_LEVEL},
+    "loggers": {
+        # Django's own handlers would print request errors a second time
+        "django": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+for _entry in filter(None, os.environ.get("LOG_LEVELS", "").split(",")):
+    _name, _, _level = _entry.partition("=")
+    LOGGING["loggers"].setdefault(_name.strip(), {})["level"] = _level.strip().upper()
+
+
+# Per-request instrumentation (MothersGarage.instrumentation_middleware)
+TESTING = sys.argv[1:2] == ["test"]
+# Max SQL queries per URL name, JWT user lookup included. Ceilings to catch
+# N+1 regressions; tighten them as views get optimised.
+QUERY_BUDGETS = {
+    "interest_list": 3,
+    "service_type_list": 3,
+    "service_specialities": 3,
+    "mother_dashboard": 4,
+    "search_providers": 8,
+    "provider-workspace-dashboard": 10,
+    "admin_dashboard": 10,
+    "subscription_status": 5,
+    "provider_free_slots": 4,
+    "my_bookings": 3,
+    "admin_coverage": 4,
+}
+# Over-budget requests raise instead of logging a warning (always in tests)
+QUERY_BUDGET_STRICT = TESTING or os.environ.get("QUERY_BUDGET_STRICT", "") == "1"
+# X-Query-Count / Server-Timing response headers (read by benchmarks/)
+REQUEST_TIMING_HEADERS = DEBUG or os.environ.get("REQUEST_TIMING_HEADERS", "") == "1"
+
+
+# Prometheus metrics at /metrics (MothersGarage.metrics). Set
+# PROMETHEUS_MULTIPROC_DIR in the environment under gunicorn; when
+# METRICS_TOKEN is set scrapers must send "Authorization: Bearer <token>".
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+
+# Unfiltered admin changelists of tables above this many rows show estimated
+# counts; filtered ones are always counted exactly
+# (MothersGarage.paginators.EstimatedCountPaginator)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(
+    os.environ.get("ADMIN_ESTIMATED_COUNT_THRESHOLD", "50000")
+)
+
+
+# Provider roster CSV import/export in the admin (onboarding.provider_csv):
+# rows validated and COPYed per batch; export rows fetched per cursor chunk
+PROVIDER_IMPORT_BATCH_SIZE = int(os.environ.get("PROVIDER_IMPORT_BATCH_SIZE", "1000"))
+PROVIDER_EXPORT_CHUNK_SIZE = int(os.environ.get("PROVIDER_EXPORT_CHUNK_SIZE", "2000"))
+
+
+# Bookings (bookings.services): longest wait for a contended slot/usage row
+# lock before a reservation fails with 503 and the client retries
+BOOKING_LOCK_TIMEOUT_MS = int(os.environ.get("BOOKING_LOCK_TIMEOUT_MS", "2000"))
+BOOKING_MAX_SLOT_HOURS = 12
+
+
+# Provider search ranking (onboarding.ranking): relative weight of the
+# interests/needs match, shared language and closeness
+PROVIDER_RANKING_WEIGHTS = {
+    "interests": 0.6,
+    "language": 0.15,
+    "distance": 0.25,
+}
+
+
+# Precomputed dashboard recommendations (onboarding.recommendations), rebuilt
+# in the background; pinned mothers only get providers within the radius
+RECOMMENDATIONS_PER_MOTHER = 10
+RECOMMENDATION_RADIUS_KM = float(os.environ.get("RECOMMENDATION_RADIUS_KM", "50"))
+RECOMMENDATION_BATCH_SIZE = 500
+
+
+# Admin coverage map (onboarding.coverage): grid zoom levels kept in
+# CoverageTile (cell = 360 / 2**zoom degrees) and most cells per response
+COVERAGE_ZOOM_LEVELS = tuple(range(4, 13))
+COVERAGE_MAX_TILES = 5000
+
+
+# Server-Sent Events (MothersGarage.events / MothersGarage.event_stream),
+# served by the ASGI application only (501 under WSGI).
+# The in-process broker only reaches streams served by the same process; run
+# a single ASGI worker for streams or swap in a network broker.
+EVENT_BROKER = os.environ.get("EVENT_BROKER", "MothersGarage.events.InProcessBroker")
+EVENT_REPLAY_SIZE = 20  # events kept per channel for Last-Event-ID replay
+EVENT_QUEUE_SIZE = 100  # undelivered events per stream before dropping
+EVENT_STREAM_HEARTBEAT = 15  # seconds
+EVENT_STREAM_MAX_AGE = int(os.environ.get("EVENT_STREAM_MAX_AGE", "600"))
+EVENT_STREAM_RETRY_MS = 3000
+EVENT_TOKEN_MAX_AGE = 12 * 60 * 60
+EVENT_APPLICANT_TOKEN_MAX_AGE = 30 * 24 * 60 * 60
+
+
+# Response compression (MothersGarage.compression_middleware)
+# Bodies under ~1 KB fit in a couple of TCP segments either way; level 6 gzip
+# and quality 5 Brotli keep per-request CPU low for dynamic JSON.
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
 # Paypal settings
 PAYPAL_CLIENT_ID = (
     "AZD1ErVVH6cM_hUg_1UyB13kPixd_kp_JFEa8Dk7Zpq_WkctUjHWDK9fTeKexqd2bpMz9AgUU061sQzD"
@@ -203,7 +429,45 @@ PAYPAL_CLIENT_ID = (
 PAYPAL_SECRET = (
     "EHa7dhzro__2yu7cBvQDBm_LreledoWGectOhwTdoQWmK3Gkogo_DvQKkQXtYs6JMyzSeZOCmXNBSub4"
 )
-PAYPAL_API_BASE = "https://api-m.sandbox.paypal.com"  # switch to live when ready
+PAYPAL_API_BASE = os.environ.get(
+    "PAYPAL_API_BASE", "https://api-m.sandbox.paypal.com"
+)  # switch to live when ready
+# (connect, read) seconds for every PayPal call, sync and async
+PAYPAL_TIMEOUT = (3.05, 10)
 
 # Optional: expected recipient email
 PAYPAL_MERCHANT_EMAIL = "sb-1sglf38950789@business.example.com"
+
+
+# Background jobs (MothersGarage.tasks): translations and other post-commit work
+BACKGROUND_TASK_WORKERS = int(os.environ.get("BACKGROUND_TASK_WORKERS", "2"))
+BACKGROUND_TASKS_EAGER = os.environ.get("BACKGROUND_TASKS_EAGER", "") == "1"
+
+
+# Provider certificate uploads (onboarding.certificate_storage)
+CERTIFICATE_MAX_UPLOAD_SIZE = int(
+    os.environ.get("CERTIFICATE_MAX_UPLOAD_SIZE", 10 * 1024 * 1024)
+)
+CERTIFICATE_MAX_FILES = int(os.environ.get("CERTIFICATE_MAX_FILES", "10"))
+CERTIFICATE_ALLOWED_TYPES = {
+    "application/pdf": ".pdf",
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+}
+
+
+# Protected media serving (onboarding.media)
+# "python": FileResponse with Range/ETag (sendfile via gunicorn's file_wrapper)
+# "nginx": X-Accel-Redirect, needs e.g.
+#     location /protected-media/ { internal; alias /srv/mothersgarage/media/; }
+# "sendfile": X-Sendfile for Apache mod_xsendfile / lighttpd
+MEDIA_SERVE_MODE = os.environ.get("MEDIA_SERVE_MODE", "python")
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/"
+)
+MEDIA_SIGNED_URL_MAX_AGE = int(os.environ.get("MEDIA_SIGNED_URL_MAX_AGE", "3600"))
+
+# First-page previews/thumbnails of certificates (onboarding.previews)
+CERTIFICATE_PREVIEW_SIZE = 1024  # px, longest side
+CERTIFICATE_THUMBNAIL_SIZE = 256
+CERTIFICATE_PREVIEW_DPI = 100
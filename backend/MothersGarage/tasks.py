@@ -0,0 +1,51 @@
+"""
+Minimal in-process background jobs.
+
+Work is handed to a small thread pool once the surrounding transaction commits,
+so request handlers never wait on follow-up work such as translations.
+Set BACKGROUND_TASKS_EAGER = True to run jobs inline (useful in scripts/tests).
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "BACKGROUND_TASK_WORKERS", 2),
+                    thread_name_prefix="mg-background",
+                )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__name__)
+    finally:
+        # Worker threads own their DB connections; don't leak them between jobs.
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Schedules func(*args, **kwargs) to run after the current transaction commits.
+    """
+    if getattr(settings, "BACKGROUND_TASKS_EAGER", False):
+        transaction.on_commit(lambda: func(*args, **kwargs))
+        return
+    transaction.on_commit(lambda: _get_executor().submit(_run, func, args, kwargs))
@@ -0,0 +1,347 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks import explain_indexes
+from bookings import services
+from bookings.models import AvailabilitySlot
+from onboarding.models import PendingMotherRegistration
+from onboarding.recommendations import refresh_recommendations
+from payments.models import Subscription
+from users.country_partitions import rebuild_entries
+from users.models import (
+    Interest,
+    MotherProfile,
+    ProviderProfile,
+    ServiceType,
+    Speciality,
+    User,
+)
+
+from .instrumentation_middleware import QueryBudgetExceeded
+from .replica_middleware import PIN_COOKIE
+
+KAMPALA = (32.5825, 0.3476)
+
+
+def _user(username, role):
+    return User.objects.create_user(
+        username=username, email=f"{username}@example.com", password="pw", role=role
+    )
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(TestCase):
+    """
+    Calls QUERY_BUDGETS endpoints the way clients do (JWT header, full
+    middleware stack) with several rows behind each list, so an N+1 pushes a
+    request over its budget and RequestInstrumentationMiddleware raises.
+    """
+
+    PROVIDERS = 6
+
+    @classmethod
+    def setUpTestData(cls):
+        catalog = []
+        for name, specialities in (
+            ("Home Care", ["Night nurse", "Newborn bathing"]),
+            ("Lactation", ["Breastfeeding", "Pumping"]),
+            ("Teletherapy", ["Postpartum depression", "Sleep"]),
+        ):
+            service = ServiceType.objects.create(name=name)
+            for speciality in specialities:
+                Speciality.objects.create(name=speciality, service_type=service)
+            catalog.append(service)
+        interests = [
+            Interest.objects.create(name=name)
+            for name in ("Breastfeeding", "Sleep", "Mental health")
+        ]
+
+        cls.mother = MotherProfile.objects.create(
+            user=_user("mother", "mother"),
+            country="Uganda",
+            pinned_location=Point(*KAMPALA, srid=4326),
+            postpartum_needs="Help with breastfeeding",
+        )
+        cls.mother.interests.set(interests)
+
+        cls.providers = []
+        for i in range(cls.PROVIDERS):
+            provider = ProviderProfile.objects.create(
+                user=_user(f"provider{i}", "provider"),
+                country="Uganda",
+                subscription_plan="standard",
+                pinned_location=Point(KAMPALA[0] + i * 0.01, KAMPALA[1], srid=4326),
+                bio=f"Provider {i}",
+            )
+            provider.service_types.set(catalog[: 1 + i % len(catalog)])
+            provider.specialities.set(
+                Speciality.objects.filter(service_type__in=catalog[:2])
+            )
+            cls.providers.append(provider)
+
+        start = timezone.now() + timedelta(days=1)
+        cls.slots = [
+            AvailabilitySlot.objects.create(
+                provider=cls.providers[0],
+                start=start + timedelta(hours=2 * i),
+                end=start + timedelta(hours=2 * i + 1),
+            )
+            for i in range(5)
+        ]
+        for slot in cls.slots[:2]:
+            services.reserve(cls.mother, slot.pk)
+
+        refresh_recommendations([cls.mother.pk])
+        cls.admin = _user("admin", "admin")
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def get(self, user, name, *args, **params):
+        response = self.client_for(user).get(reverse(name, args=args), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_budgets_name_routed_endpoints(self):
+        # A budget under a name no URL carries is never checked
+        routed = get_resolver().reverse_dict
+        for name in settings.QUERY_BUDGETS:
+            with self.subTest(endpoint=name):
+                self.assertIn(name, routed)
+
+    def test_catalog_endpoints(self):
+        for user in (self.mother.user, self.providers[0].user):
+            for name in ("interest_list", "service_type_list", "service_specialities"):
+                with self.subTest(user=user.username, endpoint=name):
+                    self.get(user, name)
+
+    def test_mother_dashboard(self):
+        response = self.get(self.mother.user, "mother_dashboard")
+        self.assertTrue(response.data["recommended_providers"])
+
+    def test_search_providers(self):
+        response = self.get(self.mother.user, "search_providers", service="Home Care")
+        self.assertEqual(len(response.data["providers"]), self.PROVIDERS)
+
+        response = self.get(
+            self.mother.user,
+            "search_providers",
+            service="Home Care",
+            radius_km="50",
+            available_from=timezone.now().isoformat(),
+            available_to=(timezone.now() + timedelta(days=3)).isoformat(),
+        )
+        # Only the first provider has free slots in the window
+        self.assertEqual(
+            [p["id"] for p in response.data["providers"]], [self.providers[0].user_id]
+        )
+
+    def test_provider_free_slots(self):
+        response = self.get(
+            self.mother.user, "provider_free_slots", self.providers[0].user_id
+        )
+        self.assertEqual(len(response.data["slots"]), len(self.slots) - 2)
+
+    def test_my_bookings(self):
+        for user in (self.mother.user, self.providers[0].user):
+            with self.subTest(user=user.username):
+                response = self.get(user, "my_bookings")
+                self.assertEqual(len(response.data["bookings"]), 2)
+
+    def test_provider_endpoints(self):
+        for name in ("subscription_status", "provider-workspace-dashboard"):
+            with self.subTest(endpoint=name):
+                self.get(self.providers[0].user, name)
+
+    def test_admin_endpoints(self):
+        for name in ("admin_dashboard", "admin_coverage"):
+            with self.subTest(endpoint=name):
+                self.get(self.admin, name)
+
+    def test_over_budget_request_raises(self):
+        budgets = {"service_specialities": 1}
+        with override_settings(QUERY_BUDGETS=budgets):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "service_specialities"):
+                self.client_for(self.mother.user).get(reverse("service_specialities"))
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_over_budget_request_warns_when_not_strict(self):
+        with override_settings(QUERY_BUDGETS={"service_specialities": 1}):
+            with self.assertLogs("MothersGarage.instrumentation_middleware", "WARNING"):
+                self.get(self.mother.user, "service_specialities")
+
+
+class IndexUsageTests(TestCase):
+    """
+    The hot lookups of benchmarks/explain_indexes.py, explained on seeded and
+    analyzed tables: each plan must use the index built for its query shape.
+    """
+
+    ROWS = 200
+
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("Doula", "Home Care", "Lactation"):
+            ServiceType.objects.create(name=name)
+        users = User.objects.bulk_create(
+            User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="!",
+                role="provider",
+            )
+            for i in range(cls.ROWS)
+        )
+        providers = ProviderProfile.objects.bulk_create(
+            ProviderProfile(
+                user=user,
+                country="Uganda" if i % 2 else "Canada",
+                subscription_plan="basic",
+                pinned_location=Point(KAMPALA[0] + i * 0.01, KAMPALA[1], srid=4326),
+            )
+            for i, user in enumerate(users)
+        )
+        rebuild_entries(ProviderProfile)
+
+        now = timezone.now()
+        Subscription.objects.bulk_create(
+            Subscription(
+                user=user,
+                plan="standard",
+                is_active=i % 3 != 0,
+                end_date=now + timedelta(days=i - cls.ROWS // 2),
+            )
+            for i, user in enumerate(users)
+        )
+        PendingMotherRegistration.objects.bulk_create(
+            PendingMotherRegistration(
+                username=f"mother{i}",
+                email=f"mother{i}@example.com",
+                password="!",
+                otp="123456",
+                otp_created_at=now - timedelta(hours=i),
+            )
+            for i in range(cls.ROWS)
+        )
+        AvailabilitySlot.objects.bulk_create(
+            AvailabilitySlot(
+                provider=provider,
+                start=now + timedelta(hours=2 * hour),
+                end=now + timedelta(hours=2 * hour + 1),
+            )
+            for provider in providers[:20]
+            for hour in range(10)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_hot_lookups_use_their_indexes(self):
+        for label, queryset, index_name, _ in explain_indexes.checks():
+            with self.subTest(label):
+                self.assertTrue(index_name, "no such index")
+                # Test tables stay small enough that the planner rightly
+                # prefers seq scans, so plans are checked the way the
+                # benchmark checks its small tables
+                plan = explain_indexes.explain(queryset, small=True)
+                self.assertIn(index_name, plan)
+                if "partition only" in label:
+                    self.assertNotIn("_canada", plan)
+                    self.assertNotIn("_default", plan)
+
+
+REPLICA = "replica0"
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Routing with a replica alias mirroring the test database, as a test run
+    with DB_REPLICAS configures it. Transactional: the mirror is a connection
+    of its own and only sees committed rows.
+    """
+
+    databases = {"default", REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        if REPLICA not in connections:
+            primary = connections["default"].settings_dict
+            # connections.settings is settings.DATABASES, read by the router
+            connections.settings[REPLICA] = {
+                **primary,
+                "OPTIONS": dict(primary["OPTIONS"]),
+                "TEST": {**primary["TEST"], "MIRROR": "default"},
+            }
+            cls.addClassCleanup(cls._remove_replica)
+        super().setUpClass()
+
+    @classmethod
+    def _remove_replica(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        # bulk_create: no catalog translation job reaching for LibreTranslate
+        Interest.objects.bulk_create([Interest(name="Breastfeeding")])
+        self.mother = MotherProfile.objects.create(
+            user=_user("mother", "mother"), country="Uganda"
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.mother.user)}"
+        )
+
+    def request(self, method, name):
+        """
+        (response, queries on the primary, queries on the replica)
+        """
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                response = getattr(self.client, method)(reverse(name))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, len(primary), len(replica)
+
+    def test_read_replica_views_read_from_the_replica(self):
+        response, primary, replica = self.request("get", "interest_list")
+        self.assertEqual(response.data[0]["name"], "Breastfeeding")
+        # The JWT user lookup included
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        # Views without read_replica stay on the primary
+        _, primary, replica = self.request("get", "check_mother_first_time")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_write_pins_later_reads_to_the_primary(self):
+        response, primary, replica = self.request("post", "complete_mother_tutorial")
+        self.assertEqual(response.cookies[PIN_COOKIE].value, "1")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        self.mother.refresh_from_db()
+        self.assertTrue(self.mother.has_completed_tutorial)
+
+        # The client sends the cookie back: reads stay on the primary
+        response, primary, replica = self.request("get", "interest_list")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        # Once it expires, reads go back to the replica
+        del self.client.cookies[PIN_COOKIE]
+        _, primary, replica = self.request("get", "interest_list")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
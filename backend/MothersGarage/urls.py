@@ -1,15 +1,24 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from MothersGarage.event_stream import EventTokenView, event_stream_view
+from MothersGarage.metrics import metrics_view
+from onboarding.views import ProtectedMediaView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/auth/", include("authentication.urls")),
     path("api/v1/onboarding/", include("onboarding.urls")),
     path("api/v1/payments/", include("payments.urls")),
+    path("api/v1/bookings/", include("bookings.urls")),
+    path("api/v1/events/token", EventTokenView.as_view(), name="event_token"),
+    path("api/v1/events/stream", event_stream_view, name="event_stream"),
+    path("metrics", metrics_view, name="metrics"),
+    # Media files (e.g. certificate PDFs) are admin-only, in DEBUG and production
+    path(
+        settings.MEDIA_URL.lstrip("/") + "<path:path>",
+        ProtectedMediaView.as_view(),
+        name="protected_media",
+    ),
 ]
-
-# Enable serving of media files (e.g. certificate PDFs)
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
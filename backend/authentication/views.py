@@ -36,14 +36,12 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         user = None
         user = authenticate(request, username=login_key, password=password)
         if not user:
-            # If not found, try email
-            try:
-                found_user = User.objects.get(email=login_key)
+            # If not found, try email (case-insensitive)
+            found_user = User.objects.filter(email__iexact=login_key).first()
+            if found_user:
                 user = authenticate(
                     request, username=found_user.username, password=password
                 )
-            except User.DoesNotExist:
-                pass
 
         if user is None:
             return Response({"detail": "Invalid credentials."}, status=401)
@@ -126,9 +124,8 @@ class ForgotPasswordView(generics.GenericAPIView):
                 {"detail": "Email is required."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
+        user = User.objects.filter(email__iexact=email).first()
+        if user is None:
             return Response(
                 {"detail": "If that email exists, we have sent instructions."},
                 status=status.HTTP_200_OK,
@@ -0,0 +1,165 @@
+"""
+Concurrency of the PayPal verification endpoint under WSGI vs. ASGI.
+
+Starts a PayPal stub that answers after --upstream-delay seconds, then runs
+the app three ways against it and fires --concurrency simultaneous requests:
+
+  wsgi        gunicorn sync workers      -> paypal-verify
+  asgi-sync   uvicorn workers, DRF view  -> paypal-verify (thread per request)
+  asgi-async  uvicorn workers, async view -> paypal-verify-async
+
+The servers load the real settings, so every request crosses the full
+settings.MIDDLEWARE stack. Sync-only middleware would put each ASGI request
+back on a thread; such entries are listed before the run.
+
+    python -m benchmarks.asgi_vs_wsgi --concurrency 200 --upstream-delay 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, format_summary, setup_django, summarize
+from benchmarks.stubs import server_url, start_paypal_stub
+
+MODES = {
+    "wsgi": (["MothersGarage.wsgi:application"], "/api/v1/payments/paypal-verify"),
+    "asgi-sync": (
+        ["MothersGarage.asgi:application", "-k", "uvicorn.workers.UvicornWorker"],
+        "/api/v1/payments/paypal-verify",
+    ),
+    "asgi-async": (
+        ["MothersGarage.asgi:application", "-k", "uvicorn.workers.UvicornWorker"],
+        "/api/v1/payments/paypal-verify-async",
+    ),
+}
+
+
+def bench_token():
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from django.contrib.auth import get_user_model
+    from users.models import ProviderProfile
+
+    user, _ = get_user_model().objects.get_or_create(
+        username="bench_provider",
+        defaults={"email": "bench_provider@example.com", "role": "provider"},
+    )
+    ProviderProfile.objects.get_or_create(user=user)
+    return str(RefreshToken.for_user(user).access_token)
+
+
+def sync_only_middleware():
+    """
+    settings.MIDDLEWARE entries Django has to wrap in sync_to_async under ASGI.
+    """
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    return [
+        path
+        for path in settings.MIDDLEWARE
+        if not getattr(import_string(path), "async_capable", False)
+    ]
+
+
+def start_server(mode, port, workers, paypal_base, extra_env=None):
+    app_args, _ = MODES[mode]
+    env = {**os.environ, "PAYPAL_API_BASE": paypal_base, **(extra_env or {})}
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            *app_args,
+            "-w",
+            str(workers),
+            "-b",
+            f"127.0.0.1:{port}",
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_until_up(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(base_url + "/api/v1/onboarding/landing")
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def fire(base_url, path, token, concurrency):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def one(i):
+            start = time.perf_counter()
+            response = await client.post(
+                path,
+                json={"order_id": f"BENCH-{i}", "plan": "standard"},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            return (time.perf_counter() - start) * 1000, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies = [ms for ms, _ in results]
+    errors = sum(1 for _, status in results if status != 200)
+    return summarize(latencies), elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--upstream-delay", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", default=",".join(MODES))
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    token = bench_token()
+    print(f"middleware: {len(settings.MIDDLEWARE)} entries from settings.MIDDLEWARE")
+    for path in sync_only_middleware():
+        print(f"  sync-only (thread hop per ASGI request): {path}")
+    stub = start_paypal_stub(
+        delay=args.upstream_delay, merchant_email=settings.PAYPAL_MERCHANT_EMAIL
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    for mode in args.modes.split(","):
+        server = start_server(mode, args.port, args.workers, server_url(stub))
+        try:
+            asyncio.run(wait_until_up(base_url))
+            summary, elapsed, errors = asyncio.run(
+                fire(base_url, MODES[mode][1], token, args.concurrency)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        print(format_summary(mode, summary))
+        print(
+            f"{'':<32} wall={elapsed:6.2f}s "
+            f"throughput={args.concurrency / elapsed:7.1f} req/s errors={errors}"
+        )
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
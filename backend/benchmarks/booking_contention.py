@@ -0,0 +1,191 @@
+"""
+Concurrent reservations against a few popular providers.
+
+Many threads (each with its own database connection) try to book the same
+handful of slots at once through bookings.services.reserve, then the results
+are checked: at most one confirmed booking per slot, one success per booked
+slot, and BookingUsage counters that moved by exactly the number of
+successes. Needs seeded bench mothers/providers (python -m benchmarks.seed).
+
+    python -m benchmarks.booking_contention --attempts 500 --concurrency 50
+    python -m benchmarks.booking_contention --plan standard   # hits the 50/month limit
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from benchmarks.common import format_summary, setup_django, summarize
+from benchmarks.seed import MOTHER_PREFIX, PROVIDER_PREFIX
+
+
+def prepare(providers, slots_per_provider, plan):
+    """
+    Gives each provider `plan` and a fresh set of future slots; returns the
+    slot ids and the providers' usage counters before the run.
+    """
+    from django.utils import timezone
+
+    from bookings.models import AvailabilitySlot
+    from payments.models import BookingUsage, Subscription
+
+    now = timezone.now()
+    start = now.replace(minute=0, second=0, microsecond=0) + timedelta(days=60)
+    slot_ids = []
+    usage_before = {}
+    for provider in providers:
+        provider.availability_slots.filter(start__gte=start).delete()
+        Subscription.objects.update_or_create(
+            user_id=provider.user_id,
+            defaults={"plan": plan, "is_active": True, "end_date": now + timedelta(days=30)},
+        )
+        usage, _ = BookingUsage.objects.get_or_create(user_id=provider.user_id)
+        usage.used_this_month = 0
+        usage.save()
+        provider.is_searchable = True
+        provider.save(update_fields=["is_searchable"])
+        usage_before[provider.user_id] = 0
+        slots = AvailabilitySlot.objects.bulk_create(
+            AvailabilitySlot(
+                provider=provider,
+                start=start + timedelta(hours=i),
+                end=start + timedelta(hours=i, minutes=45),
+            )
+            for i in range(slots_per_provider)
+        )
+        slot_ids.extend(slot.pk for slot in slots)
+    return slot_ids, usage_before, start
+
+
+def attempt(mother, slot_id, barrier):
+    # Each pool thread keeps its own connection across attempts
+    from bookings import services
+
+    barrier.wait()
+    started = time.perf_counter()
+    try:
+        services.reserve(mother, slot_id)
+        outcome = "booked"
+    except services.SlotBusy:
+        outcome = "busy"
+    except services.ProviderLimitReached:
+        outcome = "limit"
+    except services.SlotUnavailable:
+        outcome = "unavailable"
+    except Exception as exc:  # reported as a failure below
+        outcome = f"error: {exc.__class__.__name__}: {exc}"
+    return outcome, slot_id, (time.perf_counter() - started) * 1000
+
+
+def verify(slot_ids, usage_before, results):
+    from django.db.models import Count, Q
+
+    from bookings.models import AvailabilitySlot, Booking
+    from payments.models import BookingUsage
+
+    problems = []
+    confirmed = dict(
+        AvailabilitySlot.objects.filter(pk__in=slot_ids)
+        .annotate(n=Count("bookings", filter=Q(bookings__status=Booking.STATUS_CONFIRMED)))
+        .values_list("pk", "n")
+    )
+    double = [pk for pk, n in confirmed.items() if n > 1]
+    if double:
+        problems.append(f"{len(double)} slots booked more than once")
+
+    booked_per_slot = Counter(slot_id for outcome, slot_id, _ in results if outcome == "booked")
+    for slot_id, n in booked_per_slot.items():
+        if n != confirmed.get(slot_id):
+            problems.append(f"slot {slot_id}: {n} successes, {confirmed.get(slot_id)} bookings")
+
+    successes_per_user = Counter(
+        dict(
+            Booking.objects.filter(slot_id__in=slot_ids, status=Booking.STATUS_CONFIRMED)
+            .values("provider__user_id")
+            .annotate(n=Count("pk"))
+            .values_list("provider__user_id", "n")
+        )
+    )
+    for user_id, before in usage_before.items():
+        after = BookingUsage.objects.get(user_id=user_id).used_this_month
+        if after - before != successes_per_user[user_id]:
+            problems.append(
+                f"provider {user_id}: usage moved by {after - before}, "
+                f"{successes_per_user[user_id]} bookings"
+            )
+    errors = [outcome for outcome, _, _ in results if outcome.startswith("error")]
+    if errors:
+        problems.append(f"{len(errors)} unexpected errors, e.g. {errors[0]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--providers", type=int, default=3)
+    parser.add_argument("--slots", type=int, default=20, help="Slots per provider.")
+    parser.add_argument("--attempts", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--plan", default="premium", choices=("basic", "standard", "premium"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Keep the slots and bookings.")
+    args = parser.parse_args()
+
+    setup_django()
+    from bookings.models import AvailabilitySlot
+    from users.models import MotherProfile, ProviderProfile
+
+    rng = random.Random(args.seed)
+    providers = list(
+        ProviderProfile.objects.filter(user__username__startswith=PROVIDER_PREFIX)
+        .order_by("pk")[: args.providers]
+    )
+    mothers = list(
+        MotherProfile.objects.filter(user__username__startswith=MOTHER_PREFIX)
+        .order_by("pk")[: args.attempts]
+    )
+    if len(providers) < args.providers or not mothers:
+        sys.exit("Not enough bench users; run python -m benchmarks.seed first.")
+
+    slot_ids, usage_before, start = prepare(providers, args.slots, args.plan)
+    concurrency = min(args.concurrency, args.attempts)
+    # Whole waves start together so every wave really contends
+    attempts = args.attempts - args.attempts % concurrency
+    barrier = threading.Barrier(concurrency)
+    jobs = [(rng.choice(mothers), rng.choice(slot_ids)) for _ in range(attempts)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda job: attempt(*job, barrier), jobs))
+    elapsed = time.perf_counter() - started
+
+    latencies = defaultdict(list)
+    for outcome, _, ms in results:
+        latencies[outcome.split(":")[0]].append(ms)
+    print(
+        f"{len(results)} attempts on {len(slot_ids)} slots of {len(providers)} providers, "
+        f"{concurrency} concurrent, {elapsed:.2f}s"
+    )
+    print(format_summary("all attempts", summarize([ms for *_, ms in results])))
+    for outcome, samples in sorted(latencies.items()):
+        print(format_summary(outcome, summarize(samples)))
+
+    problems = verify(slot_ids, usage_before, results)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if not problems:
+        print("ok   no double bookings; usage counters match bookings")
+
+    if not args.keep:
+        AvailabilitySlot.objects.filter(
+            provider__in=providers, start__gte=start
+        ).delete()
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
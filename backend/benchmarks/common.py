@@ -0,0 +1,55 @@
+"""
+Shared helpers for the scripts in backend/benchmarks.
+
+Run scripts from the backend directory, e.g. ``python -m benchmarks.db_connections``.
+They use the regular settings, so point DB_* at a disposable database first:
+
+    docker run --rm -d -p 5433:5432 -e POSTGRES_PASSWORD=bench postgis/postgis:16-3.4
+    export DB_PORT=5433 DB_PASSWORD=bench DB_NAME=postgres GDAL_LIBRARY_PATH=
+    python manage.py migrate
+"""
+
+import os
+import statistics
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "MothersGarage.settings")
+    import django
+
+    django.setup()
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(samples_ms):
+    """
+    p50/p95/p99/mean in milliseconds for a list of latencies.
+    """
+    ordered = sorted(samples_ms)
+    return {
+        "n": len(ordered),
+        "mean": statistics.fmean(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+    }
+
+
+def format_summary(label, summary):
+    return (
+        f"{label:<32} n={summary['n']:<6} mean={summary['mean']:8.2f}ms "
+        f"p50={summary['p50']:8.2f}ms p95={summary['p95']:8.2f}ms "
+        f"p99={summary['p99']:8.2f}ms"
+    )
@@ -0,0 +1,63 @@
+"""
+Per-request latency with fresh vs. persistent database connections.
+
+Simulates the request lifecycle (request_started -> a few typical queries ->
+request_finished) so Django's close_old_connections applies CONN_MAX_AGE
+exactly as under gunicorn. Compare:
+
+    python -m benchmarks.db_connections --requests 500
+    DB_POOL=1 python -m benchmarks.db_connections --requests 500   # psycopg 3
+"""
+
+import argparse
+import time
+
+from benchmarks.common import format_summary, setup_django, summarize
+
+
+def run(requests, conn_max_age, health_checks):
+    from django.core.signals import request_finished, request_started
+    from django.db import connection, connections
+
+    from users.models import ProviderProfile, ServiceType
+
+    connections.close_all()
+    connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+    connection.settings_dict["CONN_HEALTH_CHECKS"] = health_checks
+
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        request_started.send(sender=None)
+        # Roughly what a catalog/search request does
+        list(ServiceType.objects.values_list("id", "name")[:20])
+        ProviderProfile.objects.filter(is_searchable=True).exists()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT postgis_lib_version()")
+        request_finished.send(sender=None)
+        samples.append((time.perf_counter() - start) * 1000)
+    connections.close_all()
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+
+    if "pool" in settings.DATABASES["default"].get("OPTIONS", {}):
+        print(format_summary("pool (DB_POOL=1)", run(args.requests, 0, False)))
+        return
+
+    print(format_summary("fresh connection per request", run(args.requests, 0, False)))
+    print(format_summary("persistent (CONN_MAX_AGE=60)", run(args.requests, 60, False)))
+    print(format_summary("persistent + health checks", run(args.requests, 60, True)))
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Checks with EXPLAIN that the hot lookups use their indexes.
+
+Run against a seeded database (``manage.py seed_scale``); exits non-zero when
+a plan does not use the expected index. Tiny tables (the service catalog,
+pending registrations) are checked with seq scans disabled, because the
+planner rightly prefers scanning a few pages; that still proves the index
+matches the query shape.
+
+    python -m benchmarks.explain_indexes
+    python -m benchmarks.explain_indexes --verbose   # print every plan
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+
+from benchmarks.common import setup_django
+
+
+def spatial_index_name(cursor, model, column):
+    cursor.execute(
+        "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexdef ILIKE %s",
+        [model._meta.db_table, f"%USING gist%{column}%"],
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def checks():
+    """
+    (label, queryset, expected index name, small table?)
+    """
+    from django.contrib.auth import get_user_model
+    from django.contrib.gis.geos import Point
+    from django.contrib.gis.measure import D
+    from django.db import connection
+    from django.db.models.functions import Upper
+    from django.utils import timezone
+
+    from bookings.models import AvailabilitySlot
+    from onboarding.models import PendingMotherRegistration
+    from payments.models import Subscription
+    from users.models import ProviderProfile, ProviderSearchEntry, ServiceType
+
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        gist_index = spatial_index_name(cursor, ProviderProfile, "pinned_location")
+
+    return [
+        (
+            "search: searchable providers by country",
+            ProviderProfile.objects.filter(is_searchable=True, country__iexact="uganda"),
+            "provider_search_country_idx",
+            False,
+        ),
+        (
+            "search: providers of a service, Uganda partition only",
+            ProviderSearchEntry.objects.filter(
+                country="UGANDA", service_type_ids__overlap=[1]
+            ),
+            "users_providersearchentry_uganda",
+            False,
+        ),
+        (
+            "search: service type by name",
+            ServiceType.objects.filter(name__iexact="doula"),
+            "servicetype_name_upper_idx",
+            True,
+        ),
+        (
+            "login / forgot password: user by email",
+            get_user_model().objects.filter(email__iexact="Someone@Example.com"),
+            "users_user_email_upper_idx",
+            False,
+        ),
+        (
+            "roster import: taken usernames",
+            get_user_model()
+            .objects.annotate(value_upper=Upper("username"))
+            .filter(value_upper__in=["NURSEJOY", "DOULA.ANN"]),
+            "users_user_username_upper_idx",
+            False,
+        ),
+        (
+            "active subscriptions past their end date",
+            Subscription.objects.filter(is_active=True, end_date__lte=now),
+            "subscription_active_end_idx",
+            False,
+        ),
+        (
+            "stale mother OTPs",
+            PendingMotherRegistration.objects.filter(
+                otp_created_at__lt=now - timedelta(days=1)
+            ),
+            "pending_mother_otp_idx",
+            True,
+        ),
+        (
+            "search: provider free in a time window (GiST)",
+            AvailabilitySlot.objects.within(now, now + timedelta(hours=4)).filter(
+                provider_id=1
+            ),
+            "availability_slot_no_overlap",
+            True,
+        ),
+        (
+            "providers within 10 km (GiST)",
+            ProviderProfile.objects.filter(
+                pinned_location__dwithin=(Point(32.5825, 0.3476, srid=4326), D(km=10))
+            ),
+            gist_index,
+            False,
+        ),
+    ]
+
+
+def explain(queryset, small):
+    from django.db import connection, transaction
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if small:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    setup_django()
+    failures = 0
+    for label, queryset, index_name, small in checks():
+        plan = explain(queryset, small)
+        ok = bool(index_name) and index_name in plan
+        if "partition only" in label:
+            # Pruned plans never mention a sibling partition
+            ok = ok and "_canada" not in plan and "_default" not in plan
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}: {index_name or 'index missing'}")
+        if args.verbose or not ok:
+            print("     " + plan.replace("\n", "\n     "))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+JSON render/parse cost: DRF's stdlib-json classes vs. the orjson ones.
+
+Payloads mimic the provider search response and the admin dashboard (nested
+lists, datetimes, Decimals, a geometry). No database is needed:
+
+    python -m benchmarks.json_rendering --providers 500 --rounds 200
+"""
+
+import argparse
+import datetime
+import io
+import time
+from decimal import Decimal
+
+from benchmarks.common import format_summary, setup_django, summarize
+
+
+def search_payload(providers):
+    return {
+        "providers": [
+            {
+                "id": i,
+                "username": f"provider{i}",
+                "bio": "Certified postpartum doula with ten years of home visits. " * 3,
+                "services": ["Doula", "Lactation consultant", "Night nurse"],
+                "specialities": ["Breastfeeding support", "Sleep training"],
+                "subscription_plan": "premium" if i % 3 else "basic",
+                "country": "Uganda" if i % 2 else "Canada",
+            }
+            for i in range(providers)
+        ]
+    }
+
+
+def dashboard_payload(providers):
+    from django.contrib.gis.geos import Point
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "pending_providers": [
+            {
+                "id": i,
+                "email": f"provider{i}@example.com",
+                "license_number": f"LIC-{i:06d}",
+                "created_at": now - datetime.timedelta(hours=i),
+                "certificates": [f"certificates/sha256/ab/{i:064x}.pdf"],
+                "amount_paid": Decimal("49.99"),
+                "location": Point(32.58 + i / 1000, 0.34 + i / 1000, srid=4326),
+            }
+            for i in range(providers)
+        ]
+    }
+
+
+def time_call(func, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--providers", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.utils.encoders import JSONEncoder
+
+    from MothersGarage.parsers import ORJSONParser
+    from MothersGarage.renderers import ORJSONRenderer, orjson
+
+    if orjson is None:
+        print("orjson is not installed; both columns would measure stdlib json.")
+        return
+
+    class GeoJSONEncoder(JSONEncoder):
+        # The stdlib path needs the same GEOS handling to render the dashboard
+        def default(self, obj):
+            from MothersGarage.renderers import default
+
+            return default(obj)
+
+    class StdlibRenderer(JSONRenderer):
+        encoder_class = GeoJSONEncoder
+
+    payloads = {
+        "search": search_payload(args.providers),
+        "dashboard": dashboard_payload(args.providers),
+    }
+    for name, payload in payloads.items():
+        body = StdlibRenderer().render(payload)
+        assert body == ORJSONRenderer().render(payload), f"{name}: outputs differ"
+        print(f"{name}: {len(body)} bytes")
+        for label, renderer in (("json", StdlibRenderer()), ("orjson", ORJSONRenderer())):
+            print(
+                format_summary(
+                    f"render {name} [{label}]",
+                    time_call(lambda: renderer.render(payload), args.rounds),
+                )
+            )
+        for label, json_parser in (("json", JSONParser()), ("orjson", ORJSONParser())):
+            print(
+                format_summary(
+                    f"parse {name} [{label}]",
+                    time_call(lambda: json_parser.parse(io.BytesIO(body)), args.rounds),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
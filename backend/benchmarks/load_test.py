@@ -0,0 +1,261 @@
+"""
+Load test for the core API flows.
+
+Seeds bench data (benchmarks.seed), starts PayPal/LibreTranslate/SMTP stubs
+and the app under gunicorn, then runs --concurrency virtual users for
+--duration seconds:
+
+  mothers    login -> bootstrap -> search
+  providers  login -> bootstrap -> workspace -> payment verify
+
+Reports p50/p95/p99 latency, throughput and SQL queries per endpoint (from the
+X-Query-Count header). --output saves the run as JSON; --baseline compares a
+run against a saved one, e.g. across commits:
+
+    python -m benchmarks.load_test --concurrency 50 --duration 60 --output before.json
+    python -m benchmarks.load_test --concurrency 50 --duration 60 --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.asgi_vs_wsgi import MODES, start_server, wait_until_up
+from benchmarks.common import BACKEND_DIR, format_summary, setup_django, summarize
+from benchmarks.seed import BENCH_PASSWORD, MOTHER_PREFIX, PROVIDER_PREFIX, seed
+from benchmarks.stubs import (
+    server_url,
+    start_paypal_stub,
+    start_smtp_stub,
+    start_translate_stub,
+)
+
+ONBOARDING = "/api/v1/onboarding"
+PAYMENTS = "/api/v1/payments"
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    async def call(self, client, name, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            self.samples[name].append(((time.perf_counter() - start) * 1000, 0, None))
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        queries = response.headers.get("X-Query-Count")
+        self.samples[name].append(
+            (elapsed, response.status_code, int(queries) if queries else None)
+        )
+        return response
+
+    def report(self):
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            queries = [q for _, _, q in samples if q is not None]
+            endpoints[name] = {
+                **summarize([ms for ms, _, _ in samples]),
+                "errors": sum(1 for _, status, _ in samples if not 200 <= status < 300),
+                "avg_queries": sum(queries) / len(queries) if queries else None,
+                "max_queries": max(queries) if queries else None,
+            }
+        return endpoints
+
+
+async def login(recorder, client, username):
+    response = await recorder.call(
+        client,
+        "login",
+        "POST",
+        "/api/v1/auth/login",
+        json={"login_key": username, "password": BENCH_PASSWORD},
+    )
+    if response is None or response.status_code != 200:
+        return False
+    client.headers["Authorization"] = f"Bearer {response.json()['access']}"
+    return True
+
+
+async def mother_flow(recorder, client, rng, mothers, services):
+    if not await login(recorder, client, f"{MOTHER_PREFIX}{rng.randrange(mothers)}"):
+        return
+    for name, path in (
+        ("check_mother_first_time", "/check_mother_first_time"),
+        ("mother_dashboard", "/mother_dashboard"),
+        ("service_type_list", "/service_types"),
+        ("interest_list", "/interests"),
+    ):
+        await recorder.call(client, name, "GET", ONBOARDING + path)
+    await recorder.call(
+        client,
+        "search_providers",
+        "GET",
+        ONBOARDING + "/search_providers",
+        params={"service": rng.choice(services)},
+    )
+
+
+async def provider_flow(recorder, client, rng, providers, verify_path):
+    if not await login(recorder, client, f"{PROVIDER_PREFIX}{rng.randrange(providers)}"):
+        return
+    await recorder.call(client, "check_first_time", "GET", PAYMENTS + "/check_first_time")
+    await recorder.call(
+        client, "subscription_status", "GET", PAYMENTS + "/subscription_status"
+    )
+    await recorder.call(
+        client,
+        "provider-workspace-dashboard",
+        "GET",
+        ONBOARDING + "/provider/workspace-select",
+    )
+    await recorder.call(
+        client,
+        "paypal_verified_payment",
+        "POST",
+        verify_path,
+        json={"order_id": f"BENCH-{rng.getrandbits(32)}", "plan": "standard"},
+    )
+
+
+async def run_load(base_url, args, verify_path, services):
+    recorder = Recorder()
+    deadline = time.monotonic() + args.duration
+    flows = 0
+
+    async def virtual_user(index):
+        nonlocal flows
+        rng = random.Random(args.seed * 1000 + index)
+        while time.monotonic() < deadline:
+            # A fresh client per flow: every flow logs in as a different user
+            async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+                if rng.random() < args.mother_share:
+                    await mother_flow(recorder, client, rng, args.mothers, services)
+                else:
+                    await provider_flow(recorder, client, rng, args.providers, verify_path)
+            flows += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return recorder.report(), elapsed, flows
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result, baseline=None):
+    for name, stats in result["endpoints"].items():
+        line = format_summary(name, stats)
+        line += f" errors={stats['errors']}"
+        if stats["avg_queries"] is not None:
+            line += f" queries avg={stats['avg_queries']:.1f} max={stats['max_queries']}"
+        print(line)
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous and previous["p95"]:
+            change = (stats["p95"] - previous["p95"]) / previous["p95"] * 100
+            delta = f"{'':<32} vs {baseline.get('revision') or 'baseline'}: p95 {change:+.1f}%"
+            if stats["avg_queries"] is not None and previous["avg_queries"] is not None:
+                delta += f", queries {stats['avg_queries'] - previous['avg_queries']:+.1f}"
+            print(delta)
+    print(
+        f"{result['requests']} requests, {result['flows']} flows in "
+        f"{result['elapsed']:.1f}s: {result['throughput']:.1f} req/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--providers", type=int, default=2000)
+    parser.add_argument("--mothers", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse existing bench data")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--mother-share", type=float, default=0.7)
+    parser.add_argument("--mode", choices=MODES, default="wsgi")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--upstream-delay", type=float, default=0.2)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with a previous --output file")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    from users.management.commands.seed_scale import CATALOG
+
+    if not args.skip_seed:
+        seed(args.providers, args.mothers, args.seed)
+
+    paypal = start_paypal_stub(
+        delay=args.upstream_delay, merchant_email=settings.PAYPAL_MERCHANT_EMAIL
+    )
+    translate = start_translate_stub(delay=args.upstream_delay)
+    smtp = start_smtp_stub(delay=args.upstream_delay)
+    extra_env = {
+        "LIBRETRANSLATE_ENDPOINT": server_url(translate) + "/translate",
+        "EMAIL_HOST": "127.0.0.1",
+        "EMAIL_PORT": str(smtp.server_address[1]),
+        "EMAIL_USE_TLS": "0",
+        "EMAIL_HOST_USER": "",
+        "EMAIL_HOST_PASSWORD": "",
+        "REQUEST_TIMING_HEADERS": "1",
+    }
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.mode, args.port, args.workers, server_url(paypal), extra_env)
+    try:
+        asyncio.run(wait_until_up(base_url))
+        endpoints, elapsed, flows = asyncio.run(
+            run_load(base_url, args, MODES[args.mode][1], list(CATALOG))
+        )
+    finally:
+        server.terminate()
+        server.wait()
+        for stub in (paypal, translate, smtp):
+            stub.shutdown()
+
+    requests = sum(stats["n"] for stats in endpoints.values())
+    result = {
+        "revision": git_revision(),
+        "config": {
+            key: getattr(args, key)
+            for key in ("providers", "mothers", "seed", "concurrency", "duration", "mode")
+        },
+        "endpoints": endpoints,
+        "requests": requests,
+        "flows": flows,
+        "elapsed": elapsed,
+        "throughput": requests / elapsed,
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    print_report(result, baseline)
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(result, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Cost of the provider search ranking stage (onboarding.ranking).
+
+Builds synthetic candidates from the seed catalog, then times feature
+extraction from profile objects (ProviderFeatures.from_profiles), from the
+precomputed search entry columns (ProviderFeatures.from_entries) and scoring
+separately. No database is needed:
+
+    python -m benchmarks.ranking --candidates 10000 --rounds 50
+
+--view times the whole GET search_providers path in-process (auth excluded)
+against a database seeded with `manage.py seed_scale`, with its query count:
+
+    python -m benchmarks.ranking --view --rounds 50 --service Breastfeeding
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from benchmarks.common import format_summary, setup_django, summarize
+
+
+class _Related(list):
+    # Stands in for a prefetched related manager
+    def all(self):
+        return self
+
+
+def candidates(count, rng):
+    from django.contrib.gis.geos import Point
+
+    from users.management.commands.seed_scale import CATALOG, CITIES
+
+    catalog = []
+    for service_id, (service, specialities) in enumerate(CATALOG.items()):
+        service_item = SimpleNamespace(pk=service_id, name=service)
+        for speciality_id, speciality in enumerate(specialities):
+            catalog.append(
+                (service_item, SimpleNamespace(pk=service_id * 100 + speciality_id, name=speciality))
+            )
+    cities = [city for country in CITIES.values() for city in country]
+
+    profiles = []
+    for _ in range(count):
+        chosen = rng.sample(catalog, rng.randint(1, 4))
+        _, lon, lat, _, spread = rng.choice(cities)
+        profiles.append(
+            SimpleNamespace(
+                service_types=_Related({service for service, _ in chosen}),
+                specialities=_Related(speciality for _, speciality in chosen),
+                preferred_language=rng.choice(["English", "French"]),
+                pinned_location=Point(
+                    lon + rng.gauss(0, spread), lat + rng.gauss(0, spread), srid=4326
+                )
+                if rng.random() < 0.9
+                else None,
+            )
+        )
+    return profiles
+
+
+def view_path(rounds, service, prefix):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from onboarding.views import SearchProvidersView
+    from users.models import MotherProfile
+
+    mother = (
+        MotherProfile.objects.filter(user__username__startswith=f"{prefix}mother_")
+        .select_related("user")
+        .order_by("pk")
+        .first()
+    )
+    if mother is None:
+        raise SystemExit(f"No {prefix}mother_* users: run manage.py seed_scale first.")
+    # Loaded with its profile, as ProfileJWTAuthentication does
+    user = mother.user
+    view = SearchProvidersView.as_view()
+    factory = APIRequestFactory()
+
+    samples, queries, results = [], 0, 0
+    for _ in range(rounds):
+        request = factory.get("/api/v1/onboarding/search_providers", {"service": service})
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = view(request)
+            response.render()
+            samples.append((time.perf_counter() - started) * 1000)
+        queries = len(captured.captured_queries)
+        results = len(response.data.get("providers", []))
+
+    print(f"search_providers service={service!r}: {results} results, {queries} queries")
+    print(format_summary("whole view", summarize(samples)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--view", action="store_true")
+    parser.add_argument("--service", default="Breastfeeding")
+    parser.add_argument("--prefix", default="seed_")
+    args = parser.parse_args()
+
+    setup_django()
+    if args.view:
+        view_path(args.rounds, args.service, args.prefix)
+        return
+
+    from django.contrib.gis.geos import Point
+
+    from onboarding import ranking
+
+    profiles = candidates(args.candidates, random.Random(42))
+    # What ProviderSearchEntry holds for the same candidates
+    entries = [
+        (
+            ranking.term_buckets(
+                [item.name for item in (*p.service_types.all(), *p.specialities.all())]
+            ),
+            ranking.language_index(p.preferred_language),
+            None if p.pinned_location is None else p.pinned_location.y,
+            None if p.pinned_location is None else p.pinned_location.x,
+        )
+        for p in profiles
+    ]
+    columns = list(zip(*entries))
+    mother = SimpleNamespace(
+        postpartum_needs="Help with breastfeeding and night feeds",
+        infant_care_preferences="Newborn sleep routines",
+    )
+    terms = ranking.mother_terms(mother, ["Breastfeeding", "Sleep", "Mental health"])
+    origin = Point(32.5825, 0.3476, srid=4326)
+
+    build, load, score = [], [], []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        ranking.ProviderFeatures.from_profiles(profiles)
+        built = time.perf_counter()
+        features = ranking.ProviderFeatures.from_entries(*columns)
+        loaded = time.perf_counter()
+        ranking.rank(features, terms, language="English", origin=origin)
+        build.append((built - started) * 1000)
+        load.append((loaded - built) * 1000)
+        score.append((time.perf_counter() - loaded) * 1000)
+
+    print(f"{args.candidates} candidates, {args.rounds} rounds")
+    print(format_summary("features from profiles", summarize(build)))
+    print(format_summary("features from entries", summarize(load)))
+    print(format_summary("scoring + sort", summarize(score)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Deterministic synthetic data for the benchmarks.
+
+A thin wrapper around ``manage.py seed_scale``: bench users are named
+bench_mother_<n> / bench_provider_<n> and share BENCH_PASSWORD, so load tests
+can log in as any of them. Reseeding replaces previous bench users.
+
+    python -m benchmarks.seed --providers 2000 --mothers 5000 --seed 42
+"""
+
+import argparse
+
+from benchmarks.common import setup_django
+
+BENCH_PASSWORD = "bench-password"
+BENCH_PREFIX = "bench_"
+MOTHER_PREFIX = BENCH_PREFIX + "mother_"
+PROVIDER_PREFIX = BENCH_PREFIX + "provider_"
+
+
+def seed(providers, mothers, seed_value=42):
+    """
+    Replaces bench users with `providers` providers and `mothers` mothers.
+    Same arguments, same rows.
+    """
+    from django.core.management import call_command
+
+    call_command(
+        "seed_scale",
+        providers=providers,
+        mothers=mothers,
+        seed=seed_value,
+        prefix=BENCH_PREFIX,
+        password=BENCH_PASSWORD,
+        clear=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--providers", type=int, default=2000)
+    parser.add_argument("--mothers", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    setup_django()
+    seed(args.providers, args.mothers, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Local stand-ins for the external services, so benchmarks never hit PayPal,
+LibreTranslate or a real SMTP server. Each stub runs in a daemon thread and
+sleeps `delay` seconds per call to model upstream latency.
+"""
+
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body or b"{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PayPalStubHandler(_StubHandler):
+    merchant_email = ""
+    amount = "50.00"
+
+    def do_POST(self):
+        time.sleep(self.delay)
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._send_json({"access_token": "stub-token", "expires_in": 3600})
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        order_id = self.path.rsplit("/", 1)[-1]
+        self._send_json(
+            {
+                "id": order_id,
+                "status": "COMPLETED",
+                "purchase_units": [
+                    {
+                        "amount": {"value": self.amount, "currency_code": "USD"},
+                        "payee": {"email_address": self.merchant_email},
+                    }
+                ],
+            }
+        )
+
+
+class TranslateStubHandler(_StubHandler):
+    def do_POST(self):
+        time.sleep(self.delay)
+        q = self._read_json().get("q", "")
+        if isinstance(q, list):
+            translated = [f"[fr] {text}" for text in q]
+        else:
+            translated = f"[fr] {q}"
+        self._send_json({"translatedText": translated})
+
+
+class _SMTPStubHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP (EHLO/MAIL/RCPT/DATA/QUIT) for Django's SMTP backend.
+    """
+
+    delay = 0.0
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self._reply("220 stub ESMTP")
+        in_data = False
+        for raw in self.rfile:
+            line = raw.decode(errors="replace").rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    time.sleep(self.delay)
+                    self._reply("250 OK queued")
+                continue
+            command = line[:4].upper()
+            if command == "EHLO":
+                self._reply("250 stub")
+            elif command == "DATA":
+                in_data = True
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _start(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def start_paypal_stub(delay=0.0, merchant_email="", amount="50.00", port=0):
+    handler = type(
+        "PayPalStub",
+        (PayPalStubHandler,),
+        {"delay": delay, "merchant_email": merchant_email, "amount": amount},
+    )
+    return _start(ThreadingHTTPServer(("127.0.0.1", port), handler))
+
+
+def start_translate_stub(delay=0.0, port=0):
+    handler = type("TranslateStub", (TranslateStubHandler,), {"delay": delay})
+    return _start(ThreadingHTTPServer(("127.0.0.1", port), handler))
+
+
+def start_smtp_stub(delay=0.0, port=0):
+    handler = type("SMTPStub", (_SMTPStubHandler,), {"delay": delay})
+    return _start(_ThreadingTCPServer(("127.0.0.1", port), handler))
+
+
+def server_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
@@ -0,0 +1,27 @@
+from django.contrib import admin
+
+from MothersGarage.paginators import EstimatedCountPaginator
+from bookings.models import AvailabilitySlot, Booking
+
+
+@admin.register(AvailabilitySlot)
+class AvailabilitySlotAdmin(admin.ModelAdmin):
+    list_display = ("provider", "start", "end")
+    search_fields = ("provider__user__username",)
+    list_select_related = ("provider__user",)
+    autocomplete_fields = ("provider",)
+    date_hierarchy = "start"
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+
+@admin.register(Booking)
+class BookingAdmin(admin.ModelAdmin):
+    list_display = ("id", "provider", "mother", "slot", "status", "created_at")
+    search_fields = ("provider__user__username", "mother__user__username")
+    list_filter = ("status",)
+    list_select_related = ("provider__user", "mother__user", "slot")
+    raw_id_fields = ("slot",)
+    autocomplete_fields = ("provider", "mother")
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
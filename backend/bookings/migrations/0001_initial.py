@@ -0,0 +1,54 @@
+# Generated by Django 5.1.3 on 2026-10-19 16:20
+
+import bookings.models
+import django.contrib.postgres.constraints
+import django.db.models.deletion
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0003_user_email_upper_idx_and_more'),
+    ]
+
+    operations = [
+        # Lets the exclusion constraint mix = (provider) with && (time range)
+        BtreeGistExtension(),
+        migrations.CreateModel(
+            name='AvailabilitySlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_slots', to='users.providerprofile')),
+            ],
+            options={
+                'ordering': ['start'],
+                'indexes': [models.Index(fields=['provider', 'start'], name='slot_provider_start_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('end__gt', models.F('start'))), name='availability_slot_end_after_start'), django.contrib.postgres.constraints.ExclusionConstraint(expressions=[('provider', '='), (bookings.models.TsTzRange('start', 'end'), '&&')], name='availability_slot_no_overlap')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Booking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], default='confirmed', max_length=10)),
+                ('notes', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('cancelled_at', models.DateTimeField(blank=True, null=True)),
+                ('mother', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='users.motherprofile')),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='users.providerprofile')),
+                ('slot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='bookings.availabilityslot')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['provider', 'status'], name='booking_provider_status_idx'), models.Index(fields=['mother', 'status'], name='booking_mother_status_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'confirmed')), fields=('slot',), name='booking_one_confirmed_per_slot')],
+            },
+        ),
+    ]
@@ -0,0 +1,116 @@
+# bookings/models.py
+
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.db import models
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import F, Func, Q
+
+from users.models import MotherProfile, ProviderProfile
+
+
+class TsTzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+class AvailabilitySlotQuerySet(models.QuerySet):
+    def free(self):
+        return self.filter(
+            ~models.Exists(
+                Booking.objects.filter(slot_id=models.OuterRef("pk"), status=Booking.STATUS_CONFIRMED)
+            )
+        )
+
+    def within(self, start, end):
+        """
+        Slots lying entirely inside [start, end). Written as
+        tstzrange(start, end) <@ window so it can use the GiST index behind
+        availability_slot_no_overlap.
+        """
+        return self.annotate(period=TsTzRange("start", "end")).filter(
+            period__contained_by=DateTimeTZRange(start, end)
+        )
+
+
+class AvailabilitySlot(models.Model):
+    """
+    A bookable window in a provider's calendar. A provider's slots never
+    overlap (exclusion constraint), so one confirmed booking per slot is
+    enough to rule out double bookings.
+    """
+
+    provider = models.ForeignKey(
+        ProviderProfile, on_delete=models.CASCADE, related_name="availability_slots"
+    )
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = AvailabilitySlotQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["start"]
+        indexes = [
+            # A provider's slots in a time window
+            models.Index(fields=["provider", "start"], name="slot_provider_start_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(end__gt=F("start")), name="availability_slot_end_after_start"
+            ),
+            ExclusionConstraint(
+                name="availability_slot_no_overlap",
+                expressions=[
+                    ("provider", RangeOperators.EQUAL),
+                    (TsTzRange("start", "end"), RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
+
+    def __str__(self):
+        return f"Slot {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M} ({self.provider_id})"
+
+
+class Booking(models.Model):
+    STATUS_CONFIRMED = "confirmed"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_CHOICES = (
+        (STATUS_CONFIRMED, "Confirmed"),
+        (STATUS_CANCELLED, "Cancelled"),
+    )
+
+    slot = models.ForeignKey(
+        AvailabilitySlot, on_delete=models.CASCADE, related_name="bookings"
+    )
+    # Denormalized from the slot for the provider's booking list
+    provider = models.ForeignKey(
+        ProviderProfile, on_delete=models.CASCADE, related_name="bookings"
+    )
+    mother = models.ForeignKey(
+        MotherProfile, on_delete=models.CASCADE, related_name="bookings"
+    )
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_CONFIRMED
+    )
+    notes = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    cancelled_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            # Last line of defence behind the slot row lock in services.reserve
+            models.UniqueConstraint(
+                fields=["slot"],
+                condition=Q(status="confirmed"),
+                name="booking_one_confirmed_per_slot",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["provider", "status"], name="booking_provider_status_idx"),
+            models.Index(fields=["mother", "status"], name="booking_mother_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"Booking {self.pk}: slot {self.slot_id} ({self.status})"
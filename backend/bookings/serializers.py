@@ -0,0 +1,60 @@
+# bookings/serializers.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import AvailabilitySlot, Booking
+
+
+class AvailabilitySlotSerializer(serializers.ModelSerializer):
+    is_booked = serializers.BooleanField(read_only=True, default=False)
+
+    class Meta:
+        model = AvailabilitySlot
+        fields = ["id", "start", "end", "is_booked"]
+
+    def validate(self, attrs):
+        start, end = attrs["start"], attrs["end"]
+        if end <= start:
+            raise serializers.ValidationError("end must be after start.")
+        if start <= timezone.now():
+            raise serializers.ValidationError("Slots must start in the future.")
+        if end - start > timedelta(hours=settings.BOOKING_MAX_SLOT_HOURS):
+            raise serializers.ValidationError(
+                f"Slots are at most {settings.BOOKING_MAX_SLOT_HOURS} hours long."
+            )
+        return attrs
+
+
+class ReserveSerializer(serializers.Serializer):
+    slot_id = serializers.IntegerField()
+    notes = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class BookingSerializer(serializers.ModelSerializer):
+    start = serializers.DateTimeField(source="slot.start", read_only=True)
+    end = serializers.DateTimeField(source="slot.end", read_only=True)
+    # Providers are identified by user id, as in search_providers
+    provider_id = serializers.IntegerField(source="provider.user_id", read_only=True)
+    provider_username = serializers.CharField(
+        source="provider.user.username", read_only=True
+    )
+    mother_username = serializers.CharField(source="mother.user.username", read_only=True)
+
+    class Meta:
+        model = Booking
+        fields = [
+            "id",
+            "start",
+            "end",
+            "provider_id",
+            "provider_username",
+            "mother_username",
+            "status",
+            "notes",
+            "created_at",
+            "cancelled_at",
+        ]
@@ -0,0 +1,179 @@
+# bookings/services.py
+"""
+Reserving and cancelling slots.
+
+Concurrent reservations of one slot queue on the slot's row lock, so exactly
+one wins and the rest see it booked; the partial unique constraint on
+Booking backs that up. Lock waits are capped by BOOKING_LOCK_TIMEOUT_MS, so
+under heavy contention a request fails fast with SlotBusy instead of piling
+up. Locks are always taken slot first, then the provider's BookingUsage row,
+which keeps the counter exact without deadlocks.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from payments.models import BookingUsage, Subscription
+
+from .models import AvailabilitySlot, Booking
+
+
+class BookingError(Exception):
+    status_code = 409
+
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class SlotUnavailable(BookingError):
+    pass
+
+
+class SlotBusy(BookingError):
+    # Someone else is booking this slot right now; retrying is fine
+    status_code = 503
+
+
+class ProviderLimitReached(BookingError):
+    pass
+
+
+class ProviderUnavailable(BookingError):
+    pass
+
+
+def parse_window(start_value, end_value, default_days=14):
+    """
+    (start, end) from two ISO 8601 strings: start defaults to now (and is
+    never in the past), end to default_days after start. None when a value
+    cannot be parsed or the window is empty.
+    """
+    now = timezone.now()
+    try:
+        start = parse_datetime(start_value or "") or now
+        end = parse_datetime(end_value or "") or start + timedelta(days=default_days)
+    except ValueError:
+        return None
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    if timezone.is_naive(end):
+        end = timezone.make_aware(end)
+    start = max(start, now)
+    if end <= start:
+        return None
+    return start, end
+
+
+def _has_active_plan(provider):
+    """
+    Same rule as the subscription_status endpoint: the plan of an active,
+    unexpired Subscription, otherwise the plan stored on the profile.
+    """
+    subscription = Subscription.objects.filter(
+        user_id=provider.user_id, is_active=True
+    ).first()
+    if subscription is not None and not subscription.has_expired():
+        return bool(subscription.plan)
+    return bool(provider.subscription_plan)
+
+
+def _set_lock_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SET LOCAL lock_timeout = %s", [f"{settings.BOOKING_LOCK_TIMEOUT_MS}ms"]
+        )
+
+
+@transaction.atomic
+def reserve(mother, slot_id, notes=""):
+    """
+    Books slot_id for mother and counts it against the provider's monthly
+    usage. Raises a BookingError subclass when that is not possible.
+    """
+    _set_lock_timeout()
+    try:
+        slot = (
+            AvailabilitySlot.objects.select_for_update(of=("self",))
+            .select_related("provider")
+            .get(pk=slot_id)
+        )
+    except AvailabilitySlot.DoesNotExist:
+        raise SlotUnavailable("No such slot.")
+    except OperationalError:  # lock_timeout
+        raise SlotBusy("This slot is being booked, please try again.")
+
+    if slot.start <= timezone.now():
+        raise SlotUnavailable("This slot has already started.")
+    if slot.bookings.filter(status=Booking.STATUS_CONFIRMED).exists():
+        raise SlotUnavailable("This slot is already booked.")
+
+    provider = slot.provider
+    try:
+        usage, _ = BookingUsage.objects.select_for_update().get_or_create(
+            user_id=provider.user_id
+        )
+    except OperationalError:
+        raise SlotBusy("This provider is busy, please try again.")
+    if usage.monthly_limit_reached():
+        raise ProviderLimitReached("This provider is fully booked this month.")
+    # Search and the free-slots listing hide these providers; a slot id
+    # posted directly must not get around that. Re-read under the usage
+    # lock, which cancel() also holds when it makes a provider searchable.
+    provider.refresh_from_db(fields=["is_searchable", "subscription_plan"])
+    if not provider.is_searchable or not _has_active_plan(provider):
+        raise ProviderUnavailable("This provider is not taking bookings.")
+
+    try:
+        with transaction.atomic():
+            booking = Booking.objects.create(
+                slot=slot, provider=provider, mother=mother, notes=notes
+            )
+    except IntegrityError:
+        raise SlotUnavailable("This slot is already booked.")
+
+    # Under the usage row lock: the read-modify-write cannot lose updates.
+    # Also hides the provider from search and notifies at the limit.
+    usage.increment_usage()
+    return booking
+
+
+@transaction.atomic
+def cancel(booking):
+    """
+    Frees the booking's slot. Bookings made in the provider's current usage
+    cycle stop counting against it, and a provider hidden at the monthly limit
+    shows up in search again once below it.
+    """
+    booking = (
+        Booking.objects.select_for_update(of=("self",))
+        .select_related("slot", "provider__user", "mother__user")
+        .get(pk=booking.pk)
+    )
+    if booking.status == Booking.STATUS_CANCELLED:
+        return booking
+    booking.status = Booking.STATUS_CANCELLED
+    booking.cancelled_at = timezone.now()
+    booking.save(update_fields=["status", "cancelled_at"])
+
+    provider = booking.provider
+    BookingUsage.objects.filter(
+        user_id=provider.user_id,
+        cycle_start__lte=booking.created_at,
+        used_this_month__gt=0,
+    ).update(used_this_month=F("used_this_month") - 1)
+
+    # Under the usage row lock reserve() cannot hide the provider meanwhile;
+    # re-read the flag an earlier reservation may have cleared
+    usage = BookingUsage.objects.select_for_update().filter(user_id=provider.user_id).first()
+    provider.refresh_from_db(fields=["is_searchable"])
+    if usage is None or provider.is_searchable or usage.monthly_limit_reached():
+        return booking
+    provider.is_searchable = True
+    provider.save(update_fields=["is_searchable"])
+    return booking
@@ -0,0 +1,332 @@
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from payments.models import BookingUsage, Subscription
+from users.models import MotherProfile, ProviderProfile, User
+
+from . import services
+from .models import AvailabilitySlot, Booking
+
+
+def _in_thread(target, *args):
+    """
+    Runs target(*args) on its own thread and database connection; returns
+    the started thread and a dict receiving "result" or "error".
+    """
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = target(*args)
+        except Exception as exc:
+            outcome["error"] = exc
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+# Eager: follow-up jobs of profile saves run inline instead of on a pool
+# thread that could outlive the test
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class BookingTestCase(TransactionTestCase):
+    """
+    Real transactions: reserve() relies on row locks and lock_timeout, which
+    TestCase's wrapping transaction would hide.
+    """
+
+    def setUp(self):
+        self.provider = self.make_provider("provider", plan="standard")
+        self.mother = self.make_mother("mother")
+        self.start = timezone.now() + timedelta(days=1)
+
+    def tearDown(self):
+        close_old_connections()
+
+    def make_provider(self, username, plan="basic"):
+        user = User.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="pw",
+            role="provider",
+        )
+        BookingUsage.objects.create(user=user)
+        return ProviderProfile.objects.create(
+            user=user, country="Uganda", subscription_plan=plan
+        )
+
+    def make_mother(self, username):
+        user = User.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="pw",
+            role="mother",
+        )
+        return MotherProfile.objects.create(user=user, country="Uganda")
+
+    def make_slot(self, offset_hours=0, provider=None):
+        start = self.start + timedelta(hours=offset_hours)
+        return AvailabilitySlot.objects.create(
+            provider=provider or self.provider, start=start, end=start + timedelta(hours=1)
+        )
+
+    def usage(self, provider=None):
+        return BookingUsage.objects.get(
+            user=(provider or self.provider).user
+        ).used_this_month
+
+    def client_for(self, profile):
+        client = APIClient()
+        client.force_authenticate(user=profile.user)
+        return client
+
+
+class ReserveCancelTests(BookingTestCase):
+    def test_reserve_then_cancel(self):
+        slot = self.make_slot()
+
+        booking = services.reserve(self.mother, slot.pk, notes="first visit")
+        self.assertEqual(booking.status, Booking.STATUS_CONFIRMED)
+        self.assertEqual(booking.provider, self.provider)
+        self.assertEqual(self.usage(), 1)
+        self.assertFalse(AvailabilitySlot.objects.filter(pk=slot.pk).free().exists())
+
+        cancelled = services.cancel(booking)
+        self.assertEqual(cancelled.status, Booking.STATUS_CANCELLED)
+        self.assertIsNotNone(cancelled.cancelled_at)
+        self.assertEqual(self.usage(), 0)
+        self.assertTrue(AvailabilitySlot.objects.filter(pk=slot.pk).free().exists())
+
+        # Cancelling twice changes nothing
+        services.cancel(booking)
+        self.assertEqual(self.usage(), 0)
+
+        # The freed slot can be booked again
+        services.reserve(self.make_mother("other"), slot.pk)
+        self.assertEqual(self.usage(), 1)
+
+    def test_reserve_booked_or_past_slot(self):
+        slot = self.make_slot()
+        services.reserve(self.mother, slot.pk)
+        with self.assertRaises(services.SlotUnavailable):
+            services.reserve(self.make_mother("other"), slot.pk)
+
+        past = AvailabilitySlot.objects.create(
+            provider=self.provider,
+            start=timezone.now() - timedelta(hours=2),
+            end=timezone.now() - timedelta(hours=1),
+        )
+        with self.assertRaises(services.SlotUnavailable):
+            services.reserve(self.mother, past.pk)
+        self.assertEqual(self.usage(), 1)
+
+    def test_reserve_hidden_or_planless_provider(self):
+        hidden = self.make_provider("hidden")
+        ProviderProfile.objects.filter(pk=hidden.pk).update(is_searchable=False)
+        planless = self.make_provider("planless", plan=None)
+
+        for provider in (hidden, planless):
+            with self.subTest(provider=provider.user.username):
+                slot = self.make_slot(provider=provider)
+                with self.assertRaises(services.ProviderUnavailable):
+                    services.reserve(self.mother, slot.pk)
+                self.assertFalse(Booking.objects.filter(slot=slot).exists())
+                self.assertEqual(self.usage(provider), 0)
+
+        # The free-slots listing 404s for them; posting the id directly fails too
+        response = self.client_for(self.mother).post(
+            reverse("reserve_slot"),
+            {"slot_id": self.make_slot(2, provider=hidden).pk},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 409)
+
+    def test_reserve_falls_back_to_profile_plan(self):
+        # An expired subscription leaves the plan stored on the profile
+        Subscription.objects.create(
+            user=self.provider.user,
+            plan="premium",
+            end_date=timezone.now() - timedelta(days=1),
+        )
+        services.reserve(self.mother, self.make_slot().pk)
+        self.assertEqual(self.usage(), 1)
+
+        planless = self.make_provider("planless", plan=None)
+        Subscription.objects.create(
+            user=planless.user,
+            plan="basic",
+            end_date=timezone.now() + timedelta(days=30),
+        )
+        services.reserve(self.mother, self.make_slot(provider=planless).pk)
+        self.assertEqual(self.usage(planless), 1)
+
+    def test_reserve_and_cancel_endpoints(self):
+        slot = self.make_slot()
+        client = self.client_for(self.mother)
+
+        response = client.post(reverse("reserve_slot"), {"slot_id": slot.pk}, format="json")
+        self.assertEqual(response.status_code, 201)
+        booking_id = response.data["id"]
+
+        response = client.post(reverse("reserve_slot"), {"slot_id": slot.pk}, format="json")
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client_for(self.provider).post(
+            reverse("cancel_booking", args=[booking_id])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], Booking.STATUS_CANCELLED)
+        self.assertEqual(self.usage(), 0)
+
+
+class ConcurrencyTests(BookingTestCase):
+    def test_concurrent_reservations_of_one_slot(self):
+        slot = self.make_slot()
+        mothers = [self.make_mother(f"racer{i}") for i in range(4)]
+        barrier = threading.Barrier(len(mothers))
+
+        def book(mother):
+            barrier.wait()
+            return services.reserve(mother, slot.pk)
+
+        runs = [_in_thread(book, mother) for mother in mothers]
+        for thread, _ in runs:
+            thread.join()
+
+        outcomes = [outcome for _, outcome in runs]
+        self.assertEqual(sum("result" in outcome for outcome in outcomes), 1)
+        for outcome in outcomes:
+            if "error" in outcome:
+                self.assertIsInstance(outcome["error"], services.SlotUnavailable)
+        self.assertEqual(
+            Booking.objects.filter(slot=slot, status=Booking.STATUS_CONFIRMED).count(), 1
+        )
+        self.assertEqual(self.usage(), 1)
+
+    def test_concurrent_reservations_count_exactly(self):
+        slots = [self.make_slot(offset_hours=2 * i) for i in range(6)]
+        mothers = [self.make_mother(f"parallel{i}") for i in range(len(slots))]
+        barrier = threading.Barrier(len(slots))
+
+        def book(mother, slot):
+            barrier.wait()
+            return services.reserve(mother, slot.pk)
+
+        runs = [_in_thread(book, mother, slot) for mother, slot in zip(mothers, slots)]
+        for thread, _ in runs:
+            thread.join()
+
+        self.assertEqual([outcome.get("error") for _, outcome in runs], [None] * len(slots))
+        self.assertEqual(self.usage(), len(slots))
+
+        for booking in Booking.objects.filter(slot__in=slots[:2]):
+            services.cancel(booking)
+        self.assertEqual(self.usage(), len(slots) - 2)
+
+    def test_monthly_limit(self):
+        basic = self.make_provider("basic", plan="basic")
+        slots = [self.make_slot(offset_hours=2 * i, provider=basic) for i in range(6)]
+        for i, slot in enumerate(slots[:5]):
+            services.reserve(self.make_mother(f"client{i}"), slot.pk)
+        self.assertEqual(self.usage(basic), 5)
+        basic.refresh_from_db()
+        self.assertFalse(basic.is_searchable)
+
+        with self.assertRaises(services.ProviderLimitReached):
+            services.reserve(self.mother, slots[5].pk)
+        self.assertEqual(self.usage(basic), 5)
+        self.assertFalse(Booking.objects.filter(slot=slots[5]).exists())
+
+    def test_cancel_below_limit_makes_provider_searchable(self):
+        basic = self.make_provider("basic", plan="basic")
+        slots = [self.make_slot(offset_hours=2 * i, provider=basic) for i in range(5)]
+        bookings = [
+            services.reserve(self.make_mother(f"client{i}"), slot.pk)
+            for i, slot in enumerate(slots)
+        ]
+        basic.refresh_from_db()
+        self.assertFalse(basic.is_searchable)
+
+        services.cancel(bookings[0])
+        self.assertEqual(self.usage(basic), 4)
+        basic.refresh_from_db()
+        self.assertTrue(basic.is_searchable)
+
+        # Booking the freed slot reaches the limit and hides it again
+        services.reserve(self.mother, slots[0].pk)
+        basic.refresh_from_db()
+        self.assertFalse(basic.is_searchable)
+
+    @override_settings(BOOKING_LOCK_TIMEOUT_MS=100)
+    def test_lock_timeout_returns_503(self):
+        slot = self.make_slot()
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_slot_lock():
+            with transaction.atomic():
+                AvailabilitySlot.objects.select_for_update().get(pk=slot.pk)
+                locked.set()
+                release.wait(timeout=10)
+
+        holder, _ = _in_thread(hold_slot_lock)
+        try:
+            self.assertTrue(locked.wait(timeout=10))
+            response = self.client_for(self.mother).post(
+                reverse("reserve_slot"), {"slot_id": slot.pk}, format="json"
+            )
+        finally:
+            release.set()
+            holder.join()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(Booking.objects.filter(slot=slot).exists())
+        self.assertFalse(BookingUsage.objects.filter(used_this_month__gt=0).exists())
+
+        # Once the lock is released the same request goes through
+        response = self.client_for(self.mother).post(
+            reverse("reserve_slot"), {"slot_id": slot.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+
+class AvailabilityTests(BookingTestCase):
+    def post_slots(self, payload):
+        return self.client_for(self.provider).post(
+            reverse("provider_availability"), payload, format="json"
+        )
+
+    def slot_payload(self, offset_minutes, minutes=60):
+        start = self.start + timedelta(minutes=offset_minutes)
+        return {
+            "start": start.isoformat(),
+            "end": (start + timedelta(minutes=minutes)).isoformat(),
+        }
+
+    def test_overlapping_slots_in_one_request(self):
+        response = self.post_slots([self.slot_payload(0), self.slot_payload(30)])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AvailabilitySlot.objects.exists())
+
+    def test_slot_overlapping_existing_availability(self):
+        self.assertEqual(self.post_slots(self.slot_payload(0)).status_code, 201)
+        response = self.post_slots(self.slot_payload(45))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(AvailabilitySlot.objects.count(), 1)
+
+        # Back-to-back slots do not overlap
+        self.assertEqual(self.post_slots(self.slot_payload(60)).status_code, 201)
+
+        # Other providers' calendars are independent
+        other = self.make_provider("other")
+        response = self.client_for(other).post(
+            reverse("provider_availability"), self.slot_payload(0), format="json"
+        )
+        self.assertEqual(response.status_code, 201)
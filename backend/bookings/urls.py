@@ -0,0 +1,29 @@
+# bookings/urls.py
+from django.urls import path
+from .views import (
+    ProviderAvailabilityView,
+    ProviderSlotDeleteView,
+    ProviderFreeSlotsView,
+    ReserveSlotView,
+    MyBookingsView,
+    CancelBookingView,
+)
+
+urlpatterns = [
+    path(
+        "availability", ProviderAvailabilityView.as_view(), name="provider_availability"
+    ),
+    path(
+        "availability/<int:pk>",
+        ProviderSlotDeleteView.as_view(),
+        name="provider_availability_delete",
+    ),
+    path(
+        "providers/<int:provider_id>/slots",
+        ProviderFreeSlotsView.as_view(),
+        name="provider_free_slots",
+    ),
+    path("reserve", ReserveSlotView.as_view(), name="reserve_slot"),
+    path("mine", MyBookingsView.as_view(), name="my_bookings"),
+    path("<int:pk>/cancel", CancelBookingView.as_view(), name="cancel_booking"),
+]
@@ -0,0 +1,190 @@
+# bookings/views.py
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+
+from users.models import ProviderProfile
+
+from . import services
+from .models import AvailabilitySlot, Booking
+from .serializers import (
+    AvailabilitySlotSerializer,
+    BookingSerializer,
+    ReserveSerializer,
+)
+
+
+def _confirmed_booking():
+    return Booking.objects.filter(
+        slot_id=OuterRef("pk"), status=Booking.STATUS_CONFIRMED
+    )
+
+
+class ProviderAvailabilityView(generics.GenericAPIView):
+    """
+    GET  /api/v1/bookings/availability   the provider's upcoming slots
+    POST /api/v1/bookings/availability   {start, end} or a list of them
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = AvailabilitySlotSerializer
+
+    def get_provider(self, request):
+        if request.user.role != "provider":
+            return None
+        return getattr(request.user, "provider_profile", None)
+
+    def get(self, request, *args, **kwargs):
+        provider = self.get_provider(request)
+        if provider is None:
+            return Response({"detail": "Not a provider account."}, status=403)
+        slots = provider.availability_slots.filter(end__gt=timezone.now()).annotate(
+            is_booked=Exists(_confirmed_booking())
+        )
+        return Response({"slots": self.get_serializer(slots, many=True).data})
+
+    def post(self, request, *args, **kwargs):
+        provider = self.get_provider(request)
+        if provider is None:
+            return Response({"detail": "Not a provider account."}, status=403)
+
+        many = isinstance(request.data, list)
+        serializer = self.get_serializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                serializer.save(provider=provider)
+        except IntegrityError:
+            return Response(
+                {"detail": "Slots overlap each other or existing availability."},
+                status=400,
+            )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ProviderSlotDeleteView(generics.GenericAPIView):
+    """
+    DELETE /api/v1/bookings/availability/<id>
+    Only slots without a confirmed booking can be removed.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def delete(self, request, pk, *args, **kwargs):
+        deleted, _ = (
+            AvailabilitySlot.objects.filter(pk=pk, provider__user=request.user)
+            .free()
+            .delete()
+        )
+        if not deleted:
+            return Response(
+                {"detail": "No such unbooked slot in your calendar."}, status=404
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProviderFreeSlotsView(generics.GenericAPIView):
+    """
+    GET /api/v1/bookings/providers/<provider user id>/slots?from=&to=
+    A provider's free slots in a time window (default: the next 14 days).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = AvailabilitySlotSerializer
+    # Listing only; reserve() re-checks against the primary
+    read_replica = True
+
+    def get(self, request, provider_id, *args, **kwargs):
+        window = services.parse_window(
+            request.query_params.get("from"), request.query_params.get("to")
+        )
+        if window is None:
+            return Response({"detail": "Invalid 'from' or 'to'."}, status=400)
+        start, end = window
+
+        provider = ProviderProfile.objects.filter(
+            user_id=provider_id, is_searchable=True
+        ).first()
+        if provider is None:
+            return Response({"detail": "No such provider."}, status=404)
+
+        slots = provider.availability_slots.free().within(start, end)
+        return Response({"slots": self.get_serializer(slots, many=True).data})
+
+
+class ReserveSlotView(generics.GenericAPIView):
+    """
+    POST /api/v1/bookings/reserve   {slot_id, notes?}
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReserveSerializer
+
+    def post(self, request, *args, **kwargs):
+        if request.user.role != "mother":
+            return Response({"detail": "Only mothers can book providers."}, status=403)
+        mother = getattr(request.user, "mother_profile", None)
+        if mother is None:
+            return Response({"detail": "No mother profile found."}, status=404)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            booking = services.reserve(
+                mother,
+                serializer.validated_data["slot_id"],
+                notes=serializer.validated_data["notes"],
+            )
+        except services.BookingError as exc:
+            return Response({"detail": exc.detail}, status=exc.status_code)
+        return Response(BookingSerializer(booking).data, status=status.HTTP_201_CREATED)
+
+
+def _bookings_for(user):
+    bookings = Booking.objects.select_related(
+        "slot", "provider__user", "mother__user"
+    )
+    if user.role == "mother":
+        return bookings.filter(mother__user=user)
+    if user.role == "provider":
+        return bookings.filter(provider__user=user)
+    return bookings.none()
+
+
+class MyBookingsView(generics.GenericAPIView):
+    """
+    GET /api/v1/bookings/mine?status=confirmed
+    The mother's or the provider's bookings, newest first.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BookingSerializer
+
+    def get(self, request, *args, **kwargs):
+        bookings = _bookings_for(request.user)
+        status_filter = request.query_params.get("status")
+        if status_filter:
+            bookings = bookings.filter(status=status_filter)
+        return Response(
+            {"bookings": self.get_serializer(bookings[:200], many=True).data}
+        )
+
+
+class CancelBookingView(generics.GenericAPIView):
+    """
+    POST /api/v1/bookings/<id>/cancel
+    Either side of the booking can cancel it.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BookingSerializer
+
+    def post(self, request, pk, *args, **kwargs):
+        booking = _bookings_for(request.user).filter(pk=pk).first()
+        if booking is None:
+            return Response({"detail": "No such booking."}, status=404)
+        booking = services.cancel(booking)
+        return Response(self.get_serializer(booking).data)
@@ -1,20 +1,82 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
 from django.db import transaction
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.core.mail import send_mail
 from django.contrib.gis.geos import Point
 from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
 
 from onboarding.models import PendingProviderRegistration
+from MothersGarage.events import applicant_channel, publish_on_commit
+from onboarding.certificate_storage import acquire_certificates
+from onboarding.provider_csv import COLUMNS, import_providers
 from users.models import ProviderProfile, ServiceType, Speciality  # ✅ Updated
 
 User = get_user_model()
 
 
+class ProviderImportForm(forms.Form):
+    file = forms.FileField(label="CSV file")
+    skip_invalid = forms.BooleanField(
+        required=False,
+        help_text="Import the valid rows even if some rows have problems.",
+    )
+
+
 @admin.register(PendingProviderRegistration)
 class PendingProviderRegistrationAdmin(admin.ModelAdmin):
     list_display = ("username", "email", "phone_number", "created_at")
     actions = ["approve_provider"]
 
+    def get_urls(self):
+        return [
+            path(
+                "import-csv/",
+                self.admin_site.admin_view(self.import_csv_view),
+                name="onboarding_pendingproviderregistration_import_csv",
+            ),
+        ] + super().get_urls()
+
+    def import_csv_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        errors = []
+        created = 0
+        form = ProviderImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            result = import_providers(
+                form.cleaned_data["file"].file,
+                skip_invalid=form.cleaned_data["skip_invalid"],
+            )
+            errors, created = result.errors, result.created
+            if created:
+                self.message_user(
+                    request,
+                    f"Imported {created} pending provider registrations.",
+                    messages.SUCCESS,
+                )
+            if not errors:
+                return redirect("admin:onboarding_pendingproviderregistration_changelist")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import providers from CSV",
+            "form": form,
+            "columns": COLUMNS,
+            "errors": errors,
+            "created": created,
+        }
+        return TemplateResponse(
+            request,
+            "admin/onboarding/pendingproviderregistration/import_csv.html",
+            context,
+        )
+
     @transaction.atomic
     def approve_provider(self, request, queryset):
         for pending in queryset:
@@ -35,7 +97,9 @@ class PendingProviderRegistrationAdmin(admin.ModelAdmin):
                 is_verified_by_admin=True,
                 country=pending.country,
                 preferred_language=pending.preferred_language,
+                certificates=pending.certificates or [],
             )
+            acquire_certificates(profile.certificates)
 
             if (
                 pending.pinned_location_lat is not None
@@ -60,6 +124,12 @@ class PendingProviderRegistrationAdmin(admin.ModelAdmin):
 
             profile.save()
 
+            publish_on_commit(
+                applicant_channel(pending.pk),
+                "provider.approved",
+                {"username": user.username, "email": user.email},
+            )
+
             send_mail(
                 subject="Your Provider Account is Approved",
                 message=(
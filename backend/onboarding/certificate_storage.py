@@ -0,0 +1,183 @@
+# onboarding/certificate_storage.py
+import hashlib
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.db import transaction
+from django.db.models import F
+
+from .models import StoredCertificate
+from .previews import preview_paths
+
+CERTIFICATE_FIELD = "certificates"
+
+# Leading bytes -> content type. Checked against the file itself, never the
+# client-supplied Content-Type.
+_SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+_SNIFF_BYTES = 16
+
+
+def sniff_content_type(head):
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+def _read_head(file_obj):
+    file_obj.seek(0)
+    head = file_obj.read(_SNIFF_BYTES)
+    file_obj.seek(0)
+    return head
+
+
+def certificate_path(digest, content_type):
+    ext = settings.CERTIFICATE_ALLOWED_TYPES[content_type]
+    return f"certificates/sha256/{digest[:2]}/{digest}{ext}"
+
+
+class CertificateUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams certificate uploads straight to a temporary file while hashing them.
+    Oversized or unsupported files are dropped as soon as the offending chunk
+    arrives, so a bad upload is never held in full (in memory or on disk).
+    Problems are collected on request.certificate_upload_errors.
+    """
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.checking = field_name == CERTIFICATE_FIELD
+        self.hasher = hashlib.sha256()
+        self.head = b""
+        self.received = 0
+
+    def _record_error(self, message):
+        errors = getattr(self.request, "certificate_upload_errors", None)
+        if errors is None:
+            errors = self.request.certificate_upload_errors = []
+        errors.append(f"{self.file_name}: {message}")
+        self.file.close()
+
+    def _reject(self, message):
+        self._record_error(message)
+        raise SkipFile()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.checking:
+            self.received += len(raw_data)
+            if self.received > settings.CERTIFICATE_MAX_UPLOAD_SIZE:
+                self._reject(
+                    f"exceeds the {settings.CERTIFICATE_MAX_UPLOAD_SIZE} byte limit."
+                )
+            if len(self.head) < _SNIFF_BYTES:
+                self.head += raw_data[: _SNIFF_BYTES - len(self.head)]
+                if len(self.head) >= _SNIFF_BYTES and not self._allowed_head():
+                    self._reject("unsupported file type.")
+            self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def _allowed_head(self):
+        return sniff_content_type(self.head) in settings.CERTIFICATE_ALLOWED_TYPES
+
+    def file_complete(self, file_size):
+        if self.checking and not self._allowed_head():
+            # Too short to have been sniffed mid-stream; returning None drops it
+            self._record_error("unsupported file type.")
+            return None
+        file_obj = super().file_complete(file_size)
+        if self.checking:
+            file_obj.sha256 = self.hasher.hexdigest()
+            file_obj.sniffed_content_type = sniff_content_type(self.head)
+        return file_obj
+
+
+def validate_certificate_file(file_obj):
+    """
+    Returns an error message for an unacceptable certificate, else None.
+    Covers uploads that did not go through CertificateUploadHandler.
+    """
+    if file_obj.size > settings.CERTIFICATE_MAX_UPLOAD_SIZE:
+        return f"{file_obj.name}: exceeds the {settings.CERTIFICATE_MAX_UPLOAD_SIZE} byte limit."
+    content_type = getattr(file_obj, "sniffed_content_type", None) or sniff_content_type(
+        _read_head(file_obj)
+    )
+    if content_type not in settings.CERTIFICATE_ALLOWED_TYPES:
+        return f"{file_obj.name}: unsupported file type."
+    return None
+
+
+def store_certificate(file_obj):
+    """
+    Saves an uploaded certificate under its content hash and takes a reference
+    on it. Re-uploading an identical file reuses the stored copy.
+    Returns the storage path to keep on the registration.
+    """
+    digest = getattr(file_obj, "sha256", None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in file_obj.chunks():
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+        file_obj.seek(0)
+    content_type = getattr(file_obj, "sniffed_content_type", None) or sniff_content_type(
+        _read_head(file_obj)
+    )
+
+    with transaction.atomic():
+        stored, _ = StoredCertificate.objects.select_for_update().get_or_create(
+            sha256=digest,
+            defaults={
+                "path": certificate_path(digest, content_type),
+                "size": file_obj.size,
+                "content_type": content_type,
+            },
+        )
+        if not default_storage.exists(stored.path):
+            # Temporary uploads are moved into place rather than copied
+            default_storage.save(stored.path, file_obj)
+        StoredCertificate.objects.filter(pk=stored.pk).update(
+            ref_count=F("ref_count") + 1
+        )
+    return stored.path
+
+
+def acquire_certificates(paths):
+    """
+    Adds a reference to already stored certificates (e.g. when a pending
+    registration's files are carried over to the approved ProviderProfile).
+    """
+    if paths:
+        StoredCertificate.objects.filter(path__in=paths).update(
+            ref_count=F("ref_count") + 1
+        )
+
+
+def release_certificates(paths):
+    """
+    Drops a reference to each path; files nobody references any more are
+    deleted once the transaction commits. Paths stored before content
+    addressing have no StoredCertificate row and are left alone.
+    """
+    if not paths:
+        return
+    with transaction.atomic():
+        StoredCertificate.objects.filter(path__in=paths, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1
+        )
+        orphans = StoredCertificate.objects.select_for_update().filter(
+            path__in=paths, ref_count=0
+        )
+        orphan_paths = list(orphans.values_list("path", flat=True))
+        orphans.delete()
+
+    def delete_files():
+        for path in orphan_paths:
+            for stored_path in (path, *preview_paths(path)):
+                default_storage.delete(stored_path)
+
+    transaction.on_commit(delete_files)
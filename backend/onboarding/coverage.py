@@ -0,0 +1,165 @@
+# onboarding/coverage.py
+"""
+Demand vs supply grid for the admin coverage map.
+
+Pinned mothers (demand) and pinned searchable providers (supply) are snapped
+to a square grid with ST_SnapToGrid at every zoom in COVERAGE_ZOOM_LEVELS and
+counted per cell, per service type and in total, into CoverageTile. The map
+endpoint only reads those rows; raw points are never aggregated per request.
+
+Mothers carry no service type, so a service's tiles pair all mothers of the
+cell with the providers offering that service.
+
+Tiles are rebuilt:
+- per changed cell, in the background, when a profile's location, a
+  provider's searchability or services change (onboarding.signals)
+- per zoom level with `manage.py rebuild_coverage_tiles`
+Both hold one transaction-level advisory lock so rebuilds never interleave.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from users.models import MotherProfile, ProviderProfile, ServiceType
+
+from .models import CoverageTile
+
+# pg_advisory_xact_lock key shared by every tile rebuild
+COVERAGE_LOCK_KEY = 7_204_301
+
+
+def cell_size(zoom):
+    return 360.0 / 2**zoom
+
+
+def cell_of(lng, lat, zoom):
+    size = cell_size(zoom)
+    return round(lng / size), round(lat / size)
+
+
+def nearest_zoom(zoom):
+    return min(settings.COVERAGE_ZOOM_LEVELS, key=lambda level: abs(level - zoom))
+
+
+def _located(table, extra_where, area):
+    """
+    The located rows of table with their (cell_x, cell_y) at the zoom's size.
+    """
+    return f"""
+        SELECT t.id,
+               round(ST_X(s.g) / %(size)s)::int AS cell_x,
+               round(ST_Y(s.g) / %(size)s)::int AS cell_y
+        FROM {table} t
+        CROSS JOIN LATERAL (
+            SELECT ST_SnapToGrid(t.pinned_location::geometry, %(size)s) AS g
+        ) s
+        WHERE t.pinned_location IS NOT NULL {extra_where} {area}
+    """
+
+
+def _statements(cells):
+    """
+    (DELETE, INSERT) for one zoom: every cell, or only `cells` when given.
+    """
+    through = ProviderProfile.service_types.through._meta
+    if cells:
+        # Envelopes padded by half a cell let the pinned_location GiST indexes
+        # narrow the scan; the exact cell test below decides membership
+        area = "AND (" + " OR ".join(
+            f"t.pinned_location && ST_MakeEnvelope("
+            f"%(west{i})s, %(south{i})s, %(east{i})s, %(north{i})s, 4326)::geography"
+            for i in range(len(cells))
+        ) + ")"
+        only_cells = (
+            "AND (cell_x, cell_y) IN "
+            "(SELECT * FROM unnest(%(xs)s::int[], %(ys)s::int[]))"
+        )
+    else:
+        area = only_cells = ""
+
+    delete = (
+        f"DELETE FROM {CoverageTile._meta.db_table} WHERE zoom = %(zoom)s {only_cells}"
+    )
+    insert = f"""
+        WITH mother_cells AS (
+            SELECT cell_x, cell_y, count(*) AS n
+            FROM ({_located(MotherProfile._meta.db_table, "", area)}) located
+            WHERE TRUE {only_cells}
+            GROUP BY cell_x, cell_y
+        ),
+        provider_cells AS (
+            SELECT st.servicetype_id AS service_type_id, cell_x, cell_y,
+                   count(DISTINCT located.id) AS n,
+                   GROUPING(st.servicetype_id) AS is_total
+            FROM ({_located(
+                ProviderProfile._meta.db_table, "AND t.is_searchable", area
+            )}) located
+            LEFT JOIN {through.db_table} st ON st.providerprofile_id = located.id
+            WHERE TRUE {only_cells}
+            GROUP BY GROUPING SETS ((st.servicetype_id, cell_x, cell_y), (cell_x, cell_y))
+        ),
+        services AS (
+            SELECT id FROM {ServiceType._meta.db_table} UNION ALL SELECT NULL
+        )
+        INSERT INTO {CoverageTile._meta.db_table}
+            (zoom, service_type_id, cell_x, cell_y, mothers, providers, updated_at)
+        SELECT %(zoom)s, service_type_id, cell_x, cell_y, sum(mothers), sum(providers), now()
+        FROM (
+            SELECT s.id AS service_type_id, m.cell_x, m.cell_y, m.n AS mothers, 0 AS providers
+            FROM services s CROSS JOIN mother_cells m
+            UNION ALL
+            SELECT CASE WHEN is_total = 1 THEN NULL ELSE service_type_id END,
+                   cell_x, cell_y, 0, n
+            FROM provider_cells
+            -- drops the (no service) group of providers without services
+            WHERE is_total = 1 OR service_type_id IS NOT NULL
+        ) counted
+        GROUP BY service_type_id, cell_x, cell_y
+    """
+    return delete, insert
+
+
+def _params(zoom, cells):
+    size = cell_size(zoom)
+    params = {"zoom": zoom, "size": size}
+    if cells:
+        params["xs"] = [x for x, _ in cells]
+        params["ys"] = [y for _, y in cells]
+        for i, (x, y) in enumerate(cells):
+            params.update(
+                {
+                    f"west{i}": max(-180.0, (x - 1) * size),
+                    f"south{i}": max(-90.0, (y - 1) * size),
+                    f"east{i}": min(180.0, (x + 1) * size),
+                    f"north{i}": min(90.0, (y + 1) * size),
+                }
+            )
+    return params
+
+
+def _rebuild(zoom, cells=None):
+    cells = sorted(cells) if cells else None
+    delete, insert = _statements(cells)
+    params = _params(zoom, cells)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [COVERAGE_LOCK_KEY])
+        cursor.execute(delete, params)
+        cursor.execute(insert, params)
+
+
+def rebuild_coverage(zooms=None):
+    """
+    Recomputes every tile of the given zoom levels (default: all), one
+    transaction per level so readers keep the previous tiles until it commits.
+    """
+    for zoom in zooms or settings.COVERAGE_ZOOM_LEVELS:
+        _rebuild(zoom)
+
+
+def refresh_coverage(points):
+    """
+    Recomputes the cells containing points [(lng, lat), ...] at every zoom.
+    Pass both the old and the new location of a moved profile.
+    """
+    for zoom in settings.COVERAGE_ZOOM_LEVELS:
+        _rebuild(zoom, {cell_of(lng, lat, zoom) for lng, lat in points})
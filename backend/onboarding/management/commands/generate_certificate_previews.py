@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from onboarding.models import PendingProviderRegistration
+from onboarding.previews import generate_certificate_previews
+
+
+class Command(BaseCommand):
+    help = "Renders missing previews/thumbnails for pending provider certificates."
+
+    def handle(self, *args, **options):
+        paths = set()
+        for certificates in PendingProviderRegistration.objects.values_list(
+            "certificates", flat=True
+        ):
+            paths.update(certificates or [])
+        generate_certificate_previews(sorted(paths))
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(paths)} certificates."))
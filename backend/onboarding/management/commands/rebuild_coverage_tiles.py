@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from onboarding.coverage import rebuild_coverage
+
+
+class Command(BaseCommand):
+    help = "Recomputes the admin coverage map tiles from all pinned profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--zoom",
+            type=int,
+            action="append",
+            choices=settings.COVERAGE_ZOOM_LEVELS,
+            help="Only this zoom level (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        zooms = options["zoom"] or settings.COVERAGE_ZOOM_LEVELS
+        rebuild_coverage(zooms)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt coverage tiles for zoom levels {list(zooms)}.")
+        )
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from onboarding.recommendations import refresh_recommendations
+from users.models import MotherProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds precomputed provider recommendations: every mother, or only "
+        "those never computed or older than --stale-hours."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-hours",
+            type=float,
+            help="Only mothers whose recommendations are older than this.",
+        )
+        parser.add_argument("--country", help="Only mothers of this country.")
+
+    def handle(self, *args, **options):
+        mothers = MotherProfile.objects.all()
+        if options["country"]:
+            mothers = mothers.filter(country__iexact=options["country"])
+        if options["stale_hours"] is not None:
+            cutoff = timezone.now() - timedelta(hours=options["stale_hours"])
+            mothers = mothers.annotate(
+                computed_at=Min("provider_recommendations__computed_at")
+            ).filter(Q(computed_at__isnull=True) | Q(computed_at__lt=cutoff))
+
+        mother_ids = list(mothers.order_by("pk").values_list("pk", flat=True))
+        refresh_recommendations(mother_ids)
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed recommendations for {len(mother_ids)} mothers.")
+        )
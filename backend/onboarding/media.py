@@ -0,0 +1,172 @@
+# onboarding/media.py
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import reverse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+
+_signer = signing.TimestampSigner(salt="onboarding.media")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def sign_media_path(path):
+    """
+    Returns "<timestamp>:<signature>" for path; the path itself is not repeated.
+    """
+    return _signer.sign(path)[len(path) + 1 :]
+
+
+def media_url(request, path):
+    """
+    Absolute, signed URL for a file under MEDIA_ROOT. The signature lets an
+    admin open the file in a new tab, where no Authorization header is sent.
+    """
+    url = reverse("protected_media", kwargs={"path": path})
+    url = f"{url}?sig={quote(sign_media_path(path))}"
+    return request.build_absolute_uri(url) if request else url
+
+
+def has_valid_signature(path, token):
+    if not token:
+        return False
+    try:
+        _signer.unsign(f"{path}:{token}", max_age=settings.MEDIA_SIGNED_URL_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+class _FileRange:
+    """
+    A byte window over an open file. It keeps fileno()/tell() so a WSGI
+    server's file_wrapper (gunicorn) can still sendfile() just the window,
+    while plain iteration (runserver, ASGI) stops at the range end.
+    """
+
+    def __init__(self, file_obj, start, length):
+        file_obj.seek(start)
+        self._file = file_obj
+        self._remaining = length
+        self.name = file_obj.name
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+def _parse_range(header, size):
+    """
+    Returns (start, end) inclusive for a single satisfiable byte range,
+    None when the header should be ignored, or False when unsatisfiable.
+    Multi-range requests are answered with the full file.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:  # suffix range: last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def _accel_response(path, full_path):
+    content_type, encoding = mimetypes.guess_type(full_path)
+    response = HttpResponse(content_type=content_type or "application/octet-stream")
+    if encoding:
+        response["Content-Encoding"] = encoding
+    if settings.MEDIA_SERVE_MODE == "nginx":
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+    else:
+        response["X-Sendfile"] = full_path
+    return response
+
+
+def serve_media(request, path):
+    """
+    Sends a file from MEDIA_ROOT. With MEDIA_SERVE_MODE "nginx"/"sendfile" the
+    front web server does the transfer; otherwise FileResponse is used with
+    ETag, Last-Modified and single Range support.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found.")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found.")
+
+    if settings.MEDIA_SERVE_MODE in ("nginx", "sendfile"):
+        return _accel_response(path, full_path)
+
+    stat = os.stat(full_path)
+    size = stat.st_size
+    etag = f'"{int(stat.st_mtime):x}-{size:x}"'
+    last_modified = http_date(stat.st_mtime)
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        response = HttpResponse(status=304)
+        response["ETag"] = etag
+        return response
+    if_modified_since = parse_http_date_safe(
+        request.headers.get("If-Modified-Since", "")
+    )
+    if not if_none_match and if_modified_since and int(stat.st_mtime) <= if_modified_since:
+        response = HttpResponse(status=304)
+        response["ETag"] = etag
+        return response
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (not if_range or if_range in (etag, last_modified)):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    file_obj = open(full_path, "rb")
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(_FileRange(file_obj, start, length), status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(length)
+    else:
+        response = FileResponse(file_obj)
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Cache-Control"] = "private, max-age=3600"
+    return response
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('onboarding', '0004_storedcertificate'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='pendingmotherregistration',
+            index=models.Index(fields=['otp_created_at'], name='pending_mother_otp_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-19 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0005_pending_mother_otp_idx'),
+        ('users', '0003_user_email_upper_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+                ('mother', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='provider_recommendations', to='users.motherprofile')),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_to', to='users.providerprofile')),
+            ],
+            options={
+                'ordering': ['mother', 'rank'],
+                'indexes': [models.Index(fields=['computed_at'], name='recommendation_computed_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mother', 'rank'), name='recommendation_mother_rank_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-19 18:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0006_providerrecommendation'),
+        ('users', '0003_user_email_upper_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoverageTile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zoom', models.PositiveSmallIntegerField()),
+                ('cell_x', models.IntegerField()),
+                ('cell_y', models.IntegerField()),
+                ('mothers', models.PositiveIntegerField(default=0)),
+                ('providers', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField()),
+                ('service_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='coverage_tiles', to='users.servicetype')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('zoom', 'service_type', 'cell_x', 'cell_y'), name='coverage_tile_cell_uniq', nulls_distinct=False)],
+            },
+        ),
+    ]
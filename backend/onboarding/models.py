@@ -52,6 +52,12 @@ class PendingMotherRegistration(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Sweeps of stale/expired OTPs
+            models.Index(fields=["otp_created_at"], name="pending_mother_otp_idx"),
+        ]
+
     def __str__(self):
         return f"PendingMotherRegistration: {self.email}"
 
@@ -95,3 +101,111 @@ class PendingProviderRegistration(models.Model):
 
     def __str__(self):
         return f"PendingProviderRegistration: {self.email}"
+
+
+class TranslationCache(models.Model):
+    """
+    Persistent tier of the translation cache used by onboarding.translation.
+    key is the SHA-256 of (source, target, text) so long texts still hit a
+    fixed-width unique index.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    source_lang = models.CharField(max_length=10)
+    target_lang = models.CharField(max_length=10)
+    translated_text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"TranslationCache: {self.source_lang}->{self.target_lang} {self.key[:12]}"
+
+
+class StoredCertificate(models.Model):
+    """
+    One row per distinct certificate file, addressed by its SHA-256.
+    ref_count tracks how many registrations/profiles point at the file so
+    identical uploads are kept once and removed when nobody references them.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    path = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"StoredCertificate: {self.path} (refs={self.ref_count})"
+
+
+class ProviderRecommendation(models.Model):
+    """
+    A mother's precomputed top providers (onboarding.recommendations), one row
+    per rank. Rebuilt per mother when her profile, her bookings or a nearby
+    provider change, so the dashboard reads them with a single index scan.
+    """
+
+    mother = models.ForeignKey(
+        "users.MotherProfile",
+        on_delete=models.CASCADE,
+        related_name="provider_recommendations",
+    )
+    provider = models.ForeignKey(
+        "users.ProviderProfile",
+        on_delete=models.CASCADE,
+        related_name="recommended_to",
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["mother", "rank"]
+        constraints = [
+            # Also the dashboard's index: mother_id = ? ORDER BY rank
+            models.UniqueConstraint(
+                fields=["mother", "rank"], name="recommendation_mother_rank_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["computed_at"], name="recommendation_computed_idx"),
+        ]
+
+    def __str__(self):
+        return f"ProviderRecommendation: {self.mother_id} #{self.rank} -> {self.provider_id}"
+
+
+class CoverageTile(models.Model):
+    """
+    Pre-aggregated demand/supply for one grid cell of the admin coverage map
+    (onboarding.coverage). Cells are ST_SnapToGrid squares of
+    360 / 2**zoom degrees; cell (x, y) is centred on (x * size, y * size).
+    service_type NULL holds the totals over all services.
+    """
+
+    zoom = models.PositiveSmallIntegerField()
+    service_type = models.ForeignKey(
+        "users.ServiceType",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="coverage_tiles",
+    )
+    cell_x = models.IntegerField()
+    cell_y = models.IntegerField()
+    mothers = models.PositiveIntegerField(default=0)
+    providers = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            # Also serves the map read: zoom = ? AND service_type = ? AND cell_x BETWEEN ...
+            models.UniqueConstraint(
+                fields=["zoom", "service_type", "cell_x", "cell_y"],
+                name="coverage_tile_cell_uniq",
+                nulls_distinct=False,
+            ),
+        ]
+
+    def __str__(self):
+        return f"CoverageTile: z{self.zoom} ({self.cell_x}, {self.cell_y})"
@@ -0,0 +1,129 @@
+# onboarding/previews.py
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+try:
+    from PIL import Image
+except ImportError:  # previews are skipped without Pillow
+    Image = None
+
+try:
+    import fitz  # PyMuPDF, preferred PDF renderer when installed
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_SUFFIX = ".preview.jpg"
+THUMBNAIL_SUFFIX = ".thumb.jpg"
+
+
+def preview_paths(path):
+    """
+    (preview, thumbnail) storage paths kept next to the original certificate.
+    """
+    base, _ = os.path.splitext(path)
+    return base + PREVIEW_SUFFIX, base + THUMBNAIL_SUFFIX
+
+
+def _render_pdf_first_page(path):
+    """
+    Returns the first page of a PDF as a PIL image, or None if no renderer
+    (PyMuPDF or poppler's pdftoppm) is available.
+    """
+    dpi = settings.CERTIFICATE_PREVIEW_DPI
+    if fitz is not None:
+        with default_storage.open(path, "rb") as fh, fitz.open(
+            stream=fh.read(), filetype="pdf"
+        ) as doc:
+            if doc.page_count == 0:
+                return None
+            pixmap = doc[0].get_pixmap(dpi=dpi)
+            return Image.open(io.BytesIO(pixmap.tobytes("png")))
+
+    pdftoppm = shutil.which("pdftoppm")
+    if pdftoppm is None:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        out_prefix = os.path.join(tmp, "page")
+        subprocess.run(
+            [
+                pdftoppm,
+                "-f",
+                "1",
+                "-l",
+                "1",
+                "-r",
+                str(dpi),
+                "-jpeg",
+                "-singlefile",
+                default_storage.path(path),
+                out_prefix,
+            ],
+            check=True,
+            capture_output=True,
+            timeout=30,
+        )
+        image = Image.open(out_prefix + ".jpg")
+        image.load()
+        return image
+
+
+def _render_first_page(path):
+    if path.lower().endswith(".pdf"):
+        return _render_pdf_first_page(path)
+    with default_storage.open(path, "rb") as fh:
+        image = Image.open(fh)
+        image.load()
+        return image
+
+
+def _save_jpeg(image, max_side, target):
+    copy = image.copy()
+    copy.thumbnail((max_side, max_side))
+    buffer = io.BytesIO()
+    copy.save(buffer, format="JPEG", quality=80, optimize=True)
+    if default_storage.exists(target):
+        default_storage.delete(target)
+    default_storage.save(target, ContentFile(buffer.getvalue()))
+
+
+def generate_certificate_previews(paths):
+    """
+    Renders a first-page preview and a thumbnail for each certificate.
+    Runs as a background job after signup; files that already have previews
+    (identical re-uploads share a content-addressed path) are skipped.
+    """
+    if Image is None:
+        logger.warning("Pillow is not installed; skipping certificate previews.")
+        return
+    for path in paths:
+        preview_path, thumbnail_path = preview_paths(path)
+        if default_storage.exists(thumbnail_path):
+            continue
+        try:
+            image = _render_first_page(path)
+        except Exception:
+            logger.exception("Could not render preview for %s", path)
+            continue
+        if image is None:
+            logger.info("No PDF renderer available for %s", path)
+            continue
+        image = image.convert("RGB")
+        _save_jpeg(image, settings.CERTIFICATE_PREVIEW_SIZE, preview_path)
+        _save_jpeg(image, settings.CERTIFICATE_THUMBNAIL_SIZE, thumbnail_path)
+
+
+def existing_previews(path):
+    """
+    (preview, thumbnail) paths that have been generated, None for missing ones.
+    """
+    return tuple(p if default_storage.exists(p) else None for p in preview_paths(path))
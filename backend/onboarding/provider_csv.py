@@ -0,0 +1,382 @@
+# onboarding/provider_csv.py
+"""
+Provider rosters as CSV, both ways.
+
+Import turns a partner clinic's roster into PendingProviderRegistration rows
+(still approved one by one in the admin): the file is read as a stream,
+validated IMPORT_BATCH_SIZE rows at a time and each valid batch is loaded
+with COPY. Export streams ProviderProfile rows through a server-side cursor
+in the same column layout, so an exported file can be edited and re-imported.
+
+Services and specialities are ';'-separated names, matched case-insensitively.
+"""
+
+import csv
+import io
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.postgres.aggregates import StringAgg
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Upper
+
+from MothersGarage.pg_copy import CopyWriter
+from users.models import (
+    COUNTRY_CHOICES,
+    LANGUAGE_CHOICES,
+    ProviderProfile,
+    ServiceType,
+    Speciality,
+)
+from .models import PendingProviderRegistration
+
+User = get_user_model()
+
+COLUMNS = (
+    "username",
+    "email",
+    "phone_number",
+    "first_name",
+    "last_name",
+    "license_number",
+    "associated_clinic",
+    "country",
+    "preferred_language",
+    "services",
+    "specialities",
+    "latitude",
+    "longitude",
+    "bio",
+)
+REQUIRED_COLUMNS = ("username", "email")
+# Unique case-insensitively across users, pending registrations and the file
+UNIQUE_COLUMNS = ("email", "username")
+LIST_SEPARATOR = ";"
+
+_MAX_LENGTHS = {
+    "username": 150,
+    "email": 254,
+    "phone_number": 30,
+    "first_name": 150,
+    "last_name": 150,
+    "license_number": 100,
+    "associated_clinic": 150,
+}
+_COUNTRIES = {value.lower(): value for value, _ in COUNTRY_CHOICES}
+_LANGUAGES = {value.lower(): value for value, _ in LANGUAGE_CHOICES}
+
+
+class CatalogLookup:
+    """
+    Service and speciality names -> ids, loaded with two queries on first use
+    and reused for every row of the import.
+    """
+
+    def __init__(self):
+        self._services = None
+        self._specialities = None
+
+    def _load(self):
+        self._services = {
+            name.lower(): pk
+            for pk, name in ServiceType.objects.values_list("pk", "name")
+        }
+        self._specialities = {}
+        for pk, name, service_type_id in Speciality.objects.values_list(
+            "pk", "name", "service_type_id"
+        ):
+            self._specialities.setdefault(name.lower(), []).append((pk, service_type_id))
+
+    def service(self, name):
+        if self._services is None:
+            self._load()
+        return self._services.get(name.lower())
+
+    def speciality(self, name, service_type_ids):
+        """
+        (speciality id, its service type id), or None when unknown or the
+        name exists under several services and none of them is listed.
+        """
+        if self._specialities is None:
+            self._load()
+        matches = self._specialities.get(name.lower(), [])
+        if len(matches) > 1:
+            matches = [match for match in matches if match[1] in service_type_ids]
+        return matches[0] if len(matches) == 1 else None
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # (line number, message)
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+
+def _split(value):
+    return [item.strip() for item in (value or "").split(LIST_SEPARATOR) if item.strip()]
+
+
+def _coordinate(value, limit, label):
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValidationError(f"{label} is not a number")
+    if not -limit <= number <= limit:
+        raise ValidationError(f"{label} out of range")
+    return number
+
+
+def clean_row(raw, catalog):
+    """
+    Validates one CSV row and returns the PendingProviderRegistration
+    attributes for it; raises ValidationError with every problem found.
+    Uniqueness against the database is checked per batch, not here.
+    """
+    row = {column: (raw.get(column) or "").strip() for column in COLUMNS}
+    problems = []
+
+    for column in REQUIRED_COLUMNS:
+        if not row[column]:
+            problems.append(f"{column} is required")
+    for column, max_length in _MAX_LENGTHS.items():
+        if len(row[column]) > max_length:
+            problems.append(f"{column} is longer than {max_length} characters")
+    if row["email"]:
+        try:
+            validate_email(row["email"])
+        except ValidationError:
+            problems.append(f"invalid email {row['email']!r}")
+
+    country = None
+    if row["country"]:
+        country = _COUNTRIES.get(row["country"].lower())
+        if country is None:
+            problems.append(f"unknown country {row['country']!r}")
+    language = "English"
+    if row["preferred_language"]:
+        language = _LANGUAGES.get(row["preferred_language"].lower())
+        if language is None:
+            problems.append(f"unknown language {row['preferred_language']!r}")
+
+    service_type_ids = []
+    for name in _split(row["services"]):
+        pk = catalog.service(name)
+        if pk is None:
+            problems.append(f"unknown service {name!r}")
+        elif pk not in service_type_ids:
+            service_type_ids.append(pk)
+    listed_service_ids = set(service_type_ids)
+    speciality_ids = []
+    for name in _split(row["specialities"]):
+        match = catalog.speciality(name, listed_service_ids)
+        if match is None:
+            problems.append(f"unknown or ambiguous speciality {name!r}")
+            continue
+        speciality_id, service_type_id = match
+        if speciality_id not in speciality_ids:
+            speciality_ids.append(speciality_id)
+        # A speciality implies its service, as in the registration form
+        if service_type_id not in service_type_ids:
+            service_type_ids.append(service_type_id)
+
+    lat = lng = None
+    if row["latitude"] or row["longitude"]:
+        try:
+            lat = _coordinate(row["latitude"], 90, "latitude")
+            lng = _coordinate(row["longitude"], 180, "longitude")
+        except ValidationError as exc:
+            problems.extend(exc.messages)
+
+    if problems:
+        raise ValidationError(problems)
+
+    return {
+        "username": row["username"],
+        "email": row["email"],
+        "phone_number": row["phone_number"] or None,
+        "first_name": row["first_name"],
+        "last_name": row["last_name"],
+        "license_number": row["license_number"] or None,
+        "associated_clinic": row["associated_clinic"] or None,
+        "bio": row["bio"] or None,
+        "country": country,
+        "preferred_language": language,
+        "service_type_ids": service_type_ids,
+        "speciality_ids": speciality_ids,
+        "pinned_location_lat": lat,
+        "pinned_location_lng": lng,
+        # No password in a roster: approved providers set one through the
+        # forgot-password flow
+        "password": make_password(None),
+        "certificates": [],
+    }
+
+
+def _taken(column, values):
+    """
+    The given (upper-cased) values of column already used by a user or a
+    pending registration; one query per table, by UPPER(column).
+    """
+    taken = set()
+    for model in (User, PendingProviderRegistration):
+        taken.update(
+            model.objects.annotate(value_upper=Upper(column))
+            .filter(value_upper__in=values)
+            .values_list("value_upper", flat=True)
+        )
+    return taken
+
+
+def _load_batch(writer, batch, catalog, seen, result):
+    """
+    Validates a batch of (line, raw row) and COPYs its valid rows. seen holds
+    the upper-cased UNIQUE_COLUMNS values of the rows loaded so far.
+    """
+    cleaned = []
+    for line, raw in batch:
+        try:
+            cleaned.append((line, clean_row(raw, catalog)))
+        except ValidationError as exc:
+            for message in exc.messages:
+                result.error(line, message)
+
+    taken = {
+        column: _taken(column, [row[column].upper() for _, row in cleaned])
+        for column in UNIQUE_COLUMNS
+    }
+    rows = []
+    for line, row in cleaned:
+        problems = []
+        for column in UNIQUE_COLUMNS:
+            value = row[column].upper()
+            if value in taken[column]:
+                problems.append(f"{column} {row[column]} is already registered")
+            elif value in seen[column]:
+                problems.append(
+                    f"{column} {row[column]} appears more than once in the file"
+                )
+        if problems:
+            for message in problems:
+                result.error(line, message)
+            continue
+        for column in UNIQUE_COLUMNS:
+            seen[column].add(row[column].upper())
+        rows.append(row)
+
+    if rows:
+        writer.write(rows)
+        result.created += len(rows)
+
+
+def import_providers(stream, skip_invalid=False, batch_size=None):
+    """
+    Loads a provider roster (a binary file object holding UTF-8 CSV with a
+    header row) into PendingProviderRegistration.
+
+    All or nothing by default: any invalid row rolls the whole import back.
+    With skip_invalid, valid rows are kept and invalid ones only reported.
+    """
+    batch_size = batch_size or settings.PROVIDER_IMPORT_BATCH_SIZE
+    result = ImportResult()
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        result.error(1, f"missing column(s): {', '.join(missing)}")
+        return result
+
+    catalog = CatalogLookup()
+    seen = {column: set() for column in UNIQUE_COLUMNS}
+    with transaction.atomic(), connection.cursor() as cursor:
+        writer = CopyWriter(cursor, PendingProviderRegistration)
+        batch = []
+        for raw in reader:
+            batch.append((reader.line_num, raw))
+            if len(batch) >= batch_size:
+                _load_batch(writer, batch, catalog, seen, result)
+                batch = []
+        if batch:
+            _load_batch(writer, batch, catalog, seen, result)
+
+        if result.errors and not skip_invalid:
+            transaction.set_rollback(True)
+            result.created = 0
+    return result
+
+
+def _names(through, owner_column, related):
+    """
+    Correlated subquery: the ';'-joined names of one provider's related rows.
+    Keeps the export a plain, ungrouped scan that can stream from the cursor.
+    """
+    return Subquery(
+        through.objects.filter(**{owner_column: OuterRef("pk")})
+        .values(owner_column)
+        .annotate(names=StringAgg(f"{related}__name", LIST_SEPARATOR, ordering=f"{related}__name"))
+        .values("names")
+    )
+
+
+def export_rows(queryset=None):
+    """
+    Yields the header, then one CSV row (a list) per provider. Rows come
+    through a server-side cursor, so memory use does not grow with the table.
+    """
+    queryset = ProviderProfile.objects.all() if queryset is None else queryset
+    rows = (
+        queryset.order_by("pk")
+        .annotate(
+            service_names=_names(
+                ProviderProfile.service_types.through, "providerprofile_id", "servicetype"
+            ),
+            speciality_names=_names(
+                ProviderProfile.specialities.through, "providerprofile_id", "speciality"
+            ),
+        )
+        .values_list(
+            "user__username",
+            "user__email",
+            "user__phone_number",
+            "user__first_name",
+            "user__last_name",
+            "license_number",
+            "associated_clinic",
+            "country",
+            "preferred_language",
+            "service_names",
+            "speciality_names",
+            "pinned_location",
+            "bio",
+        )
+        .iterator(chunk_size=settings.PROVIDER_EXPORT_CHUNK_SIZE)
+    )
+    yield list(COLUMNS)
+    for (*head, services, specialities, location, bio) in rows:
+        lat, lng = (location.y, location.x) if location else ("", "")
+        yield [
+            *("" if value is None else value for value in head),
+            services or "",
+            specialities or "",
+            lat,
+            lng,
+            bio or "",
+        ]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """
+    Encodes rows one line at a time, for a StreamingHttpResponse.
+    """
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,250 @@
+# onboarding/ranking.py
+"""
+Match scoring for provider search, run after the candidates are fetched.
+
+Each candidate becomes one row of a compact feature set:
+- terms: the provider's service and speciality names, tokenized and hashed
+  into RANKING_TERM_BUCKETS float32 columns, L2-normalized
+- language: index into LANGUAGE_CHOICES
+- lat / lng in radians (NaN when the provider has no pinned location)
+
+The per-provider inputs (term buckets, language index) are precomputed on
+ProviderSearchEntry when the entry is synced, so searches and recommendation
+refreshes build the arrays straight from one partition's rows
+(`load_features`) instead of tokenizing catalog names of ORM instances.
+
+A mother is described the same way (interests plus the free-text postpartum
+needs and infant care preferences, and for precomputed recommendations what
+she booked before), and every candidate is scored in a few array operations:
+
+    score = w_interests * cosine(terms) + w_language * same_language
+            + w_distance * 1 / (1 + km / RANKING_DISTANCE_SCALE_KM)
+
+Weights come from settings.PROVIDER_RANKING_WEIGHTS.
+"""
+
+import re
+import zlib
+from itertools import chain
+
+import numpy as np
+from django.conf import settings
+from django.db.models import FloatField, Func
+
+from users.models import LANGUAGE_CHOICES
+
+RANKING_TERM_BUCKETS = 256
+RANKING_DISTANCE_SCALE_KM = 10.0
+EARTH_RADIUS_KM = 6371.0
+# Free text counts less than explicitly chosen interests
+FREE_TEXT_WEIGHT = 0.5
+HISTORY_WEIGHT = 0.5
+
+_LANGUAGES = {value: index for index, (value, _) in enumerate(LANGUAGE_CHOICES)}
+_TOKEN_RE = re.compile(r"[a-zà-ÿ]{3,}")
+_STOPWORDS = {"and", "for", "the", "with", "care", "support", "des", "les", "pour"}
+
+
+def tokens(text):
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def _bucket(token):
+    # crc32 rather than hash(): stable across processes (PYTHONHASHSEED)
+    return zlib.crc32(token.encode()) % RANKING_TERM_BUCKETS
+
+
+def term_buckets(names):
+    """
+    Sorted distinct hash buckets of the tokens of catalog names; stored on
+    ProviderSearchEntry.term_buckets.
+    """
+    return sorted({_bucket(token) for name in names for token in tokens(name)})
+
+
+def language_index(preferred_language):
+    return _LANGUAGES.get(preferred_language, -1)
+
+
+def term_vector(weighted_texts):
+    """
+    L2-normalized hashed bag of words for [(text, weight), ...].
+    """
+    vector = np.zeros(RANKING_TERM_BUCKETS, dtype=np.float32)
+    for text, weight in weighted_texts:
+        for token in tokens(text):
+            bucket = _bucket(token)
+            vector[bucket] = max(vector[bucket], weight)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _radians(point):
+    if point is None:
+        return np.nan, np.nan
+    return np.radians(point.y), np.radians(point.x)
+
+
+class ProviderFeatures:
+    """
+    Feature arrays for a list of candidates, row i describing candidates[i].
+    """
+
+    def __init__(self, terms, languages, lat, lng):
+        self.terms = terms
+        self.languages = languages
+        self.lat = lat
+        self.lng = lng
+
+    def __len__(self):
+        return len(self.languages)
+
+    def take(self, rows):
+        """
+        The features of the given rows, in that order.
+        """
+        return ProviderFeatures(
+            self.terms[rows], self.languages[rows], self.lat[rows], self.lng[rows]
+        )
+
+    @classmethod
+    def from_profiles(cls, profiles):
+        """
+        profiles: ProviderProfile objects with service_types and specialities
+        prefetched. Each distinct catalog name is tokenized once.
+        """
+        catalog = {}
+        terms = np.zeros((len(profiles), RANKING_TERM_BUCKETS), dtype=np.float32)
+        languages = np.empty(len(profiles), dtype=np.int8)
+        lat = np.empty(len(profiles))
+        lng = np.empty(len(profiles))
+        for row, profile in enumerate(profiles):
+            for item in (*profile.service_types.all(), *profile.specialities.all()):
+                key = (item.__class__, item.pk)
+                if key not in catalog:
+                    catalog[key] = [_bucket(token) for token in tokens(item.name)]
+                terms[row, catalog[key]] = 1.0
+            languages[row] = language_index(profile.preferred_language)
+            lat[row], lng[row] = _radians(profile.pinned_location)
+
+        norms = np.linalg.norm(terms, axis=1, keepdims=True)
+        np.divide(terms, norms, out=terms, where=norms > 0)
+        return cls(terms, languages, lat, lng)
+
+    @classmethod
+    def from_entries(cls, buckets, languages, lat, lng):
+        """
+        Parallel sequences of precomputed entry columns: term bucket lists,
+        language indices and lat / lng in degrees (None when unpinned).
+        """
+        count = len(buckets)
+        lengths = np.fromiter(map(len, buckets), dtype=np.intp, count=count)
+        rows = np.repeat(np.arange(count), lengths)
+        columns = np.fromiter(chain.from_iterable(buckets), dtype=np.intp, count=rows.size)
+        terms = np.zeros((count, RANKING_TERM_BUCKETS), dtype=np.float32)
+        # Buckets are distinct 1.0 entries, so each row's norm is sqrt(length)
+        terms[rows, columns] = 1.0 / np.sqrt(lengths[rows], dtype=np.float32)
+        return cls(
+            terms,
+            np.asarray(languages, dtype=np.int8),
+            np.radians(np.asarray(lat, dtype=float)),
+            np.radians(np.asarray(lng, dtype=float)),
+        )
+
+
+class _Coordinate(Func):
+    template = "%(function)s(%(expressions)s::geometry)"
+    output_field = FloatField()
+
+
+def load_features(entries):
+    """
+    (provider ids in ascending order, their ProviderFeatures) for a
+    ProviderSearchEntry queryset. One query over the precomputed columns; no
+    profile or catalog rows are read.
+    """
+    rows = list(
+        entries.annotate(
+            lat=_Coordinate("pinned_location", function="ST_Y"),
+            lng=_Coordinate("pinned_location", function="ST_X"),
+        )
+        .order_by("provider_id")
+        .values_list("provider_id", "term_buckets", "language", "lat", "lng")
+    )
+    if not rows:
+        return np.empty(0, dtype=np.int64), ProviderFeatures.from_entries([], [], [], [])
+    ids, buckets, languages, lat, lng = zip(*rows)
+    return np.array(ids, dtype=np.int64), ProviderFeatures.from_entries(
+        buckets, languages, lat, lng
+    )
+
+
+def mother_terms(mother_profile, interest_names, history_names=()):
+    """
+    history_names: services/specialities of providers she booked before.
+    """
+    return term_vector(
+        [(name, 1.0) for name in interest_names]
+        + [
+            (mother_profile.postpartum_needs, FREE_TEXT_WEIGHT),
+            (mother_profile.infant_care_preferences, FREE_TEXT_WEIGHT),
+        ]
+        + [(name, HISTORY_WEIGHT) for name in history_names]
+    )
+
+
+def distances_km(features, origin):
+    """
+    Great-circle distance from origin to every candidate (NaN if unpinned).
+    """
+    lat0, lng0 = _radians(origin)
+    # Haversine over all candidates at once
+    a = (
+        np.sin((features.lat - lat0) / 2) ** 2
+        + np.cos(lat0) * np.cos(features.lat) * np.sin((features.lng - lng0) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def scores(features, terms, language=None, origin=None, weights=None):
+    """
+    Match score per candidate, in [0, sum of weights]. origin is the point
+    distances are measured from; without one the distance term is 0 for all.
+    """
+    weights = weights or settings.PROVIDER_RANKING_WEIGHTS
+    result = weights.get("interests", 0.0) * (features.terms @ terms)
+
+    if language is not None and weights.get("language"):
+        result += weights["language"] * (features.languages == _LANGUAGES.get(language, -2))
+
+    if origin is not None and weights.get("distance"):
+        closeness = 1.0 / (1.0 + distances_km(features, origin) / RANKING_DISTANCE_SCALE_KM)
+        # Unpinned providers get no distance credit
+        result += weights["distance"] * np.nan_to_num(closeness, nan=0.0)
+
+    return result
+
+
+def rank(features, terms, language=None, origin=None, weights=None):
+    """
+    (candidate indices best first, their scores). Ties keep retrieval order.
+    """
+    candidate_scores = scores(features, terms, language, origin, weights)
+    order = np.argsort(-candidate_scores, kind="stable")
+    return order, candidate_scores[order]
+
+
+def features_for(profiles, ids, features):
+    """
+    The rows of (ids, features) from load_features for profiles, in their
+    order. A profile without a row (its entry was synced after the features
+    were read) makes it fall back to ProviderFeatures.from_profiles, which
+    needs service_types and specialities prefetched.
+    """
+    wanted = np.fromiter((profile.pk for profile in profiles), dtype=np.int64)
+    rows = np.searchsorted(ids, wanted)
+    if wanted.size and (
+        not ids.size or not np.array_equal(ids[np.minimum(rows, ids.size - 1)], wanted)
+    ):
+        return ProviderFeatures.from_profiles(profiles)
+    return features.take(rows)
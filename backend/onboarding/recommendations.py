@@ -0,0 +1,216 @@
+# onboarding/recommendations.py
+"""
+Precomputed "recommended for you" providers for the mother dashboard.
+
+Each mother keeps her top RECOMMENDATIONS_PER_MOTHER searchable providers in
+ProviderRecommendation, scored with onboarding.ranking against her interests,
+free-text needs and the services/specialities she booked before. Candidates
+are the providers of her country; when she has pinned her location only those
+within RECOMMENDATION_RADIUS_KM are kept (unless none are).
+
+Nothing is recomputed on read. Rows are rebuilt in the background for:
+- one mother, when her profile, interests or bookings change
+- the mothers affected by a provider change: those currently shown that
+  provider, plus pinned mothers of the same country within the radius
+- everyone, or everyone stale, via `manage.py refresh_recommendations`
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.contrib.gis.measure import D
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from bookings.models import Booking
+from users.country_partitions import country_key
+from users.models import (
+    Interest,
+    MotherProfile,
+    MotherSearchEntry,
+    ProviderProfile,
+    ProviderSearchEntry,
+)
+
+from . import ranking
+from .models import ProviderRecommendation
+
+
+def _chunks(ids, size):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def _booked_names(mother_ids):
+    """
+    mother id -> names of the services and specialities she booked.
+    """
+    names = defaultdict(set)
+    confirmed = Booking.objects.filter(
+        mother_id__in=mother_ids, status=Booking.STATUS_CONFIRMED
+    )
+    for field in ("provider__service_types__name", "provider__specialities__name"):
+        for mother_id, name in confirmed.values_list("mother_id", field).distinct():
+            if name:
+                names[mother_id].add(name)
+    return names
+
+
+def _candidates(country):
+    # Precomputed ranking inputs of one partition: no profile rows are loaded
+    return ranking.load_features(
+        ProviderSearchEntry.objects.filter(
+            country=country_key(country), provider__is_searchable=True
+        )
+    )
+
+
+def _top(mother, features, terms):
+    """
+    (candidate indices best first, their scores), at most
+    RECOMMENDATIONS_PER_MOTHER.
+    """
+    candidate_scores = ranking.scores(
+        features,
+        terms,
+        language=mother.preferred_language,
+        origin=mother.pinned_location,
+    )
+    if mother.pinned_location is not None:
+        nearby = ranking.distances_km(features, mother.pinned_location) <= (
+            settings.RECOMMENDATION_RADIUS_KM
+        )
+        if nearby.any():
+            candidate_scores = np.where(nearby, candidate_scores, -np.inf)
+
+    count = min(
+        settings.RECOMMENDATIONS_PER_MOTHER,
+        int(np.isfinite(candidate_scores).sum()),
+    )
+    if not count:
+        return np.empty(0, dtype=np.intp), candidate_scores[:0]
+    # Partial selection, then sort only the few winners
+    best = np.argpartition(-candidate_scores, count - 1)[:count]
+    best = best[np.argsort(-candidate_scores[best], kind="stable")]
+    return best, candidate_scores[best]
+
+
+def _refresh_batch(mother_ids, provider_ids, features, computed_at):
+    """
+    Rewrites the rows of mother_ids, scored against candidates read at
+    computed_at. Everything happens under the mothers' row locks, so
+    overlapping refreshes of one mother run one after the other: each reads
+    her profile as the previous one left it, and one holding older
+    candidates than the rows already written skips her.
+    """
+    with transaction.atomic():
+        # Mothers deleted meanwhile drop out here
+        locked = list(
+            MotherProfile.objects.select_for_update()
+            .filter(pk__in=mother_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        newer = set(
+            ProviderRecommendation.objects.filter(
+                mother_id__in=locked, computed_at__gt=computed_at
+            ).values_list("mother_id", flat=True)
+        )
+        current = [pk for pk in locked if pk not in newer]
+        if not current:
+            return
+
+        mothers = (
+            MotherProfile.objects.filter(pk__in=current)
+            .only(
+                "id",
+                "preferred_language",
+                "pinned_location",
+                "postpartum_needs",
+                "infant_care_preferences",
+            )
+            .prefetch_related(
+                Prefetch("interests", queryset=Interest.objects.only("id", "name"))
+            )
+        )
+        booked = _booked_names(current)
+        rows = []
+        for mother in mothers:
+            terms = ranking.mother_terms(
+                mother,
+                [interest.name for interest in mother.interests.all()],
+                booked.get(mother.pk, ()),
+            )
+            best, best_scores = _top(mother, features, terms)
+            rows.extend(
+                ProviderRecommendation(
+                    mother_id=mother.pk,
+                    provider_id=int(provider_ids[index]),
+                    rank=rank,
+                    score=round(float(score), 4),
+                    computed_at=computed_at,
+                )
+                for rank, (index, score) in enumerate(zip(best, best_scores), start=1)
+            )
+
+        ProviderRecommendation.objects.filter(mother_id__in=current).delete()
+        ProviderRecommendation.objects.bulk_create(rows)
+
+
+def refresh_recommendations(mother_ids):
+    """
+    Rebuilds the recommendations of the given mothers. Candidate features are
+    built once per country, mothers are scored and written in batches of
+    RECOMMENDATION_BATCH_SIZE.
+    """
+    batch_size = settings.RECOMMENDATION_BATCH_SIZE
+    by_country = defaultdict(list)
+    for batch in _chunks(set(mother_ids), batch_size):
+        for mother_id, country in MotherProfile.objects.filter(pk__in=batch).values_list(
+            "pk", "country"
+        ):
+            by_country[country_key(country)].append(mother_id)
+
+    for country, country_mother_ids in by_country.items():
+        # Taken before the read: rows computed from later candidates win
+        computed_at = timezone.now()
+        provider_ids, features = _candidates(country)
+        for batch in _chunks(sorted(country_mother_ids), batch_size):
+            _refresh_batch(batch, provider_ids, features, computed_at)
+
+
+def mothers_affected_by(provider):
+    """
+    Mothers whose top list a change to `provider` can alter: those shown it
+    now, and pinned mothers of its country within the recommendation radius.
+    Unpinned mothers are caught by the periodic refresh instead.
+    """
+    affected = set(
+        ProviderRecommendation.objects.filter(provider=provider).values_list(
+            "mother_id", flat=True
+        )
+    )
+    if provider.is_searchable and provider.pinned_location is not None:
+        affected.update(
+            MotherSearchEntry.objects.filter(
+                country=country_key(provider.country),
+                pinned_location__dwithin=(
+                    provider.pinned_location,
+                    D(km=settings.RECOMMENDATION_RADIUS_KM),
+                ),
+            ).values_list("mother_id", flat=True)
+        )
+    return affected
+
+
+def refresh_for_provider(provider_id):
+    provider = (
+        ProviderProfile.objects.filter(pk=provider_id)
+        .only("id", "country", "is_searchable", "pinned_location")
+        .first()
+    )
+    if provider is not None:
+        refresh_recommendations(mothers_affected_by(provider))
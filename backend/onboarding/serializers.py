@@ -9,6 +9,10 @@ from django.db import IntegrityError
 from django.contrib.auth.hashers import make_password
 
 from onboarding.models import PendingMotherRegistration, PendingProviderRegistration
+from onboarding.certificate_storage import store_certificate, validate_certificate_file
+from onboarding.media import media_url
+from onboarding.previews import existing_previews, generate_certificate_previews
+from MothersGarage.tasks import run_in_background
 from users.models import (
     MotherProfile,
     ProviderProfile,
@@ -210,14 +214,29 @@ class PendingProviderSignUpSerializer(serializers.Serializer):
         child=serializers.IntegerField(), required=False
     )
 
+    def validate_certificates(self, files):
+        if len(files) > settings.CERTIFICATE_MAX_FILES:
+            raise ValidationError(
+                f"At most {settings.CERTIFICATE_MAX_FILES} certificates can be uploaded."
+            )
+        errors = [validate_certificate_file(f) for f in files]
+        errors = [e for e in errors if e]
+        if errors:
+            raise ValidationError(errors)
+        return files
+
     def validate(self, attrs):
         if attrs.get("password") != attrs.get("password2"):
             raise ValidationError({"detail": "Passwords do not match."})
+        # Files rejected mid-stream by CertificateUploadHandler never reach
+        # validate_certificates, so surface those errors here.
+        request = self.context.get("request")
+        upload_errors = getattr(request, "certificate_upload_errors", None)
+        if upload_errors:
+            raise ValidationError({"certificates": upload_errors})
         return attrs
 
     def create(self, validated_data):
-        from django.core.files.storage import default_storage
-
         pinned = validated_data.pop("pinned_location", None)
         uploaded_certs = validated_data.pop("certificates", [])
         raw_password = validated_data.pop("password")
@@ -249,19 +268,40 @@ class PendingProviderSignUpSerializer(serializers.Serializer):
 
         saved_paths = []
         for file_obj in uploaded_certs:
-            filename = default_storage.save(f"certificates/{file_obj.name}", file_obj)
-            saved_paths.append(filename)
+            saved_paths.append(store_certificate(file_obj))
 
         pending.certificates = saved_paths
         pending.service_type_ids = validated_data.get("service_type_ids", [])
         pending.speciality_ids = validated_data.get("speciality_ids", [])
         pending.save()
 
+        if saved_paths:
+            run_in_background(generate_certificate_previews, saved_paths)
+
         return pending
 
 
+def certificate_preview_links(request, paths):
+    """
+    Per certificate: signed links to the original, its first-page preview and
+    thumbnail (None until the background job has produced them).
+    """
+    links = []
+    for path in paths or []:
+        preview, thumbnail = existing_previews(path)
+        links.append(
+            {
+                "url": media_url(request, path),
+                "preview_url": media_url(request, preview) if preview else None,
+                "thumbnail_url": media_url(request, thumbnail) if thumbnail else None,
+            }
+        )
+    return links
+
+
 class PendingProviderReviewSerializer(serializers.ModelSerializer):
     certificate_urls = serializers.SerializerMethodField()
+    certificate_previews = serializers.SerializerMethodField()
 
     class Meta:
         model = PendingProviderRegistration
@@ -277,6 +317,7 @@ class PendingProviderReviewSerializer(serializers.ModelSerializer):
             "provider_type_ids",
             "certificates",
             "certificate_urls",
+            "certificate_previews",
             "created_at",
             # Removed 'profession' from fields, see note below
             # "profession" was removed from the entire model
@@ -284,11 +325,10 @@ class PendingProviderReviewSerializer(serializers.ModelSerializer):
 
     def get_certificate_urls(self, obj):
         request = self.context.get("request")
-        base_url = request.build_absolute_uri("/") if request else ""
-        return [
-            base_url.rstrip("/") + settings.MEDIA_URL + path
-            for path in obj.certificates
-        ]
+        return [media_url(request, path) for path in obj.certificates or []]
+
+    def get_certificate_previews(self, obj):
+        return certificate_preview_links(self.context.get("request"), obj.certificates)
 
 
 class AdminUserCreateSerializer(serializers.Serializer):
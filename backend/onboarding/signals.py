@@ -0,0 +1,133 @@
+# onboarding/signals.py
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from MothersGarage.tasks import run_in_background
+from users.models import MotherProfile, ProviderProfile
+
+from .certificate_storage import release_certificates
+from .coverage import refresh_coverage
+from .models import PendingProviderRegistration, ProviderRecommendation
+from .recommendations import refresh_for_provider, refresh_recommendations
+
+M2M_CHANGES = ("post_add", "post_remove", "post_clear")
+
+
+def _touches(update_fields, *fields):
+    return update_fields is None or any(f in update_fields for f in fields)
+
+
+@receiver(post_delete, sender=PendingProviderRegistration)
+@receiver(post_delete, sender=ProviderProfile)
+def release_certificate_files(sender, instance, **kwargs):
+    release_certificates(instance.certificates or [])
+
+
+@receiver(post_save, sender=MotherProfile)
+def queue_mother_recommendations(sender, instance, update_fields=None, **kwargs):
+    if _touches(
+        update_fields,
+        "country",
+        "pinned_location",
+        "preferred_language",
+        "postpartum_needs",
+        "infant_care_preferences",
+    ):
+        run_in_background(refresh_recommendations, [instance.pk])
+
+
+@receiver(m2m_changed, sender=MotherProfile.interests.through)
+def queue_interest_recommendations(sender, instance, action, reverse, **kwargs):
+    # Reverse changes (editing an Interest's mothers) are left to the periodic refresh
+    if action in M2M_CHANGES and not reverse:
+        run_in_background(refresh_recommendations, [instance.pk])
+
+
+@receiver(post_save, sender=Booking)
+def queue_booking_recommendations(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, "status"):
+        run_in_background(refresh_recommendations, [instance.mother_id])
+
+
+@receiver(post_save, sender=ProviderProfile)
+def queue_provider_recommendations(sender, instance, update_fields=None, **kwargs):
+    if _touches(
+        update_fields, "is_searchable", "country", "pinned_location", "preferred_language"
+    ):
+        run_in_background(refresh_for_provider, instance.pk)
+
+
+@receiver(m2m_changed, sender=ProviderProfile.service_types.through)
+@receiver(m2m_changed, sender=ProviderProfile.specialities.through)
+def queue_catalog_recommendations(sender, instance, action, reverse, **kwargs):
+    if action in M2M_CHANGES and not reverse:
+        run_in_background(refresh_for_provider, instance.pk)
+
+
+@receiver(pre_delete, sender=ProviderProfile)
+def queue_orphaned_recommendations(sender, instance, **kwargs):
+    # The cascade removes their rows; refill those lists once it commits
+    mother_ids = list(
+        ProviderRecommendation.objects.filter(provider=instance).values_list(
+            "mother_id", flat=True
+        )
+    )
+    if mother_ids:
+        run_in_background(refresh_recommendations, mother_ids)
+
+
+def _lng_lat(point):
+    return None if point is None else (point.x, point.y)
+
+
+@receiver(pre_save, sender=MotherProfile)
+@receiver(pre_save, sender=ProviderProfile)
+def remember_coverage_state(sender, instance, update_fields=None, **kwargs):
+    # The cell a profile leaves needs a recount too, so note where it was
+    if instance._state.adding or not _touches(
+        update_fields, "pinned_location", "is_searchable"
+    ):
+        return
+    fields = ["pinned_location"]
+    if sender is ProviderProfile:
+        fields.append("is_searchable")
+    instance._coverage_before = (
+        sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    )
+
+
+@receiver(post_save, sender=MotherProfile)
+@receiver(post_save, sender=ProviderProfile)
+def queue_coverage_refresh(sender, instance, created, **kwargs):
+    now = (instance.pinned_location,)
+    if sender is ProviderProfile:
+        now += (instance.is_searchable,)
+    before = getattr(instance, "_coverage_before", None)
+    instance._coverage_before = None
+    if created:
+        before = (None,) * len(now)
+    elif before is None or before == now:
+        return
+    points = [_lng_lat(point) for point in (before[0], now[0]) if point is not None]
+    if points:
+        run_in_background(refresh_coverage, points)
+
+
+@receiver(m2m_changed, sender=ProviderProfile.service_types.through)
+def queue_service_coverage_refresh(sender, instance, action, reverse, **kwargs):
+    if action in M2M_CHANGES and not reverse and instance.pinned_location is not None:
+        run_in_background(refresh_coverage, [_lng_lat(instance.pinned_location)])
+
+
+@receiver(post_delete, sender=MotherProfile)
+@receiver(post_delete, sender=ProviderProfile)
+def queue_removed_coverage_refresh(sender, instance, **kwargs):
+    if instance.pinned_location is not None:
+        run_in_background(refresh_coverage, [_lng_lat(instance.pinned_location)])
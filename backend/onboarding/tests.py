@@ -1,3 +1,185 @@
+import csv
+import io
+from unittest import mock
+
+import requests
 from django.test import TestCase
 
-# Create your tests here.
+from users.models import User
+
+from . import translation
+from .models import PendingProviderRegistration, TranslationCache
+from .provider_csv import import_providers
+
+
+def _response(translated, status_code=200):
+    response = mock.Mock(status_code=status_code)
+    response.json.return_value = {"translatedText": translated}
+    return response
+
+
+class TranslateManyTests(TestCase):
+    """
+    translate_many's tiers: in-process LRU, TranslationCache rows, then one
+    batched LibreTranslate request (a mocked session here) for the rest.
+    """
+
+    def setUp(self):
+        translation._memory_cache.clear()
+        self.addCleanup(translation._memory_cache.clear)
+        patcher = mock.patch.object(translation, "_get_session")
+        self.session = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.session.post.side_effect = lambda url, json, timeout: _response(
+            [f"[{json['target']}] {text}" for text in json["q"]]
+        )
+
+    def sent_texts(self):
+        return [call.kwargs["json"]["q"] for call in self.session.post.call_args_list]
+
+    def test_misses_are_translated_in_one_request(self):
+        texts = ["Hello", "", "Night nurse", "Hello", None]
+        self.assertEqual(
+            translation.translate_many(texts),
+            ["[fr] Hello", "", "[fr] Night nurse", "[fr] Hello", None],
+        )
+        # Duplicates and empty values are not sent
+        self.assertEqual(self.sent_texts(), [["Hello", "Night nurse"]])
+        self.assertEqual(
+            self.session.post.call_args.kwargs["timeout"],
+            translation.LIBRETRANSLATE_TIMEOUT,
+        )
+        self.assertEqual(
+            set(TranslationCache.objects.values_list("translated_text", flat=True)),
+            {"[fr] Hello", "[fr] Night nurse"},
+        )
+
+    def test_memory_hits_skip_database_and_upstream(self):
+        translation.translate_many(["Hello", "Sleep"], target_lang="sw")
+        self.session.post.reset_mock()
+
+        with self.assertNumQueries(0):
+            result = translation.translate_many(["Sleep", "Hello"], target_lang="sw")
+        self.assertEqual(result, ["[sw] Sleep", "[sw] Hello"])
+        self.session.post.assert_not_called()
+
+    def test_database_hits_skip_upstream_and_fill_memory(self):
+        TranslationCache.objects.create(
+            key=translation.cache_key("Hello", "en", "fr"),
+            source_lang="en",
+            target_lang="fr",
+            translated_text="Bonjour",
+        )
+
+        self.assertEqual(
+            translation.translate_many(["Hello", "Sleep"]), ["Bonjour", "[fr] Sleep"]
+        )
+        # Only the text missing from both tiers goes upstream
+        self.assertEqual(self.sent_texts(), [["Sleep"]])
+
+        self.session.post.reset_mock()
+        with self.assertNumQueries(0):
+            self.assertEqual(translation.translate_many(["Hello"]), ["Bonjour"])
+        self.session.post.assert_not_called()
+
+    def test_unavailable_translator(self):
+        for failure in (
+            {"side_effect": requests.Timeout("read timed out")},
+            {"side_effect": None, "return_value": _response(None, status_code=502)},
+        ):
+            self.session.post.configure_mock(**failure)
+            with self.subTest(failure=failure):
+                self.assertEqual(
+                    translation.translate_many(["Hello", ""], fallback=False), [None, ""]
+                )
+                self.assertEqual(translation.translate_many(["Hello"]), ["Hello"])
+                # Nothing cached, so a later call retries upstream
+                self.assertFalse(TranslationCache.objects.exists())
+                self.assertIsNone(
+                    translation._memory_cache.get(
+                        translation.cache_key("Hello", "en", "fr")
+                    )
+                )
+
+    def test_same_language_is_returned_unchanged(self):
+        self.assertEqual(
+            translation.translate_many(["Hello"], target_lang="en"), ["Hello"]
+        )
+        self.session.post.assert_not_called()
+
+
+def _roster(*rows):
+    stream = io.StringIO()
+    writer = csv.writer(stream)
+    writer.writerow(["username", "email"])
+    writer.writerows(rows)
+    return io.BytesIO(stream.getvalue().encode("utf-8"))
+
+
+class ProviderImportTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username="NurseJoy", email="joy@example.com", password="pw", role="provider"
+        )
+        PendingProviderRegistration.objects.create(
+            username="Doula.Ann", email="ann@example.com", password="!"
+        )
+
+    def test_taken_usernames_are_row_errors(self):
+        result = import_providers(
+            _roster(
+                ("nursejoy", "joy2@example.com"),
+                ("doula.ann", "ann2@example.com"),
+                ("midwife", "JOY@example.com"),
+                ("fresh", "fresh@example.com"),
+            ),
+            skip_invalid=True,
+        )
+        self.assertEqual(
+            result.errors,
+            [
+                (2, "username nursejoy is already registered"),
+                (3, "username doula.ann is already registered"),
+                (4, "email JOY@example.com is already registered"),
+            ],
+        )
+        self.assertEqual(result.created, 1)
+        self.assertQuerySetEqual(
+            PendingProviderRegistration.objects.order_by("pk").values_list(
+                "username", flat=True
+            ),
+            ["Doula.Ann", "fresh"],
+        )
+
+    def test_usernames_repeated_in_the_file(self):
+        rows = [
+            ("Midwife", "one@example.com"),
+            ("midwife", "two@example.com"),
+            ("other", "ONE@example.com"),
+        ]
+        result = import_providers(_roster(*rows), skip_invalid=True)
+        self.assertEqual(
+            result.errors,
+            [
+                (3, "username midwife appears more than once in the file"),
+                (4, "email ONE@example.com appears more than once in the file"),
+            ],
+        )
+        self.assertEqual(result.created, 1)
+
+        # Rows of earlier batches are already loaded, so repeats across
+        # batches show up as registered
+        PendingProviderRegistration.objects.filter(username="Midwife").delete()
+        result = import_providers(_roster(*rows), skip_invalid=True, batch_size=1)
+        self.assertEqual([line for line, _ in result.errors], [3, 4])
+        self.assertEqual(result.created, 1)
+
+    def test_any_error_rolls_the_import_back(self):
+        result = import_providers(
+            _roster(("fresh", "fresh@example.com"), ("NURSEJOY", "x@example.com"))
+        )
+        self.assertEqual(result.created, 0)
+        self.assertEqual(len(result.errors), 1)
+        self.assertFalse(
+            PendingProviderRegistration.objects.filter(username="fresh").exists()
+        )
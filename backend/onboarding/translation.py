@@ -1,28 +1,285 @@
 # onboarding/translation.py
-import requests
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from MothersGarage.metrics import count_upstream_error, track_upstream
 
 LIBRETRANSLATE_ENDPOINT = os.environ.get(
     "LIBRETRANSLATE_ENDPOINT", "https://libretranslate/api/translate"
 )
 LIBRETRANSLATE_API_KEY = os.environ.get("LIBRETRANSLATE_API_KEY", "")
 
+# (connect, read) timeouts in seconds, so a slow translator never pins a worker
+LIBRETRANSLATE_TIMEOUT = (
+    float(os.environ.get("LIBRETRANSLATE_CONNECT_TIMEOUT", "2")),
+    float(os.environ.get("LIBRETRANSLATE_READ_TIMEOUT", "5")),
+)
+TRANSLATION_LRU_SIZE = int(os.environ.get("TRANSLATION_LRU_SIZE", "4096"))
 
-def translate_text(text, source_lang="en", target_lang="fr"):
-    if not text:
-        return text
-    payload = {
-        "q": text,
+
+class _LRUCache:
+    """
+    Small thread-safe LRU used as the in-process tier of the translation cache.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_memory_cache = _LRUCache(TRANSLATION_LRU_SIZE)
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """
+    Returns a process-wide requests.Session so keep-alive connections to
+    LibreTranslate are reused instead of re-opened for every string.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if LIBRETRANSLATE_API_KEY:
+                    session.headers["Authorization"] = (
+                        f"Bearer {LIBRETRANSLATE_API_KEY}"
+                    )
+                _session = session
+    return _session
+
+
+def cache_key(text, source_lang, target_lang):
+    raw = f"{source_lang}\x00{target_lang}\x00{text}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _payload(texts, source_lang, target_lang):
+    return {
+        "q": texts,
         "source": source_lang,
         "target": target_lang,
         "format": "text",
     }
-    headers = {}
-    if LIBRETRANSLATE_API_KEY:
-        headers["Authorization"] = f"Bearer {LIBRETRANSLATE_API_KEY}"
-
-    resp = requests.post(LIBRETRANSLATE_ENDPOINT, json=payload, headers=headers)
-    if resp.status_code == 200:
-        data = resp.json()
-        return data.get("translatedText", text)
-    return text
+
+
+def _parse_translations(resp, expected):
+    if resp.status_code != 200:
+        return None
+    try:
+        translated = resp.json().get("translatedText")
+    except ValueError:
+        return None
+    if isinstance(translated, str):
+        translated = [translated]
+    if not isinstance(translated, list) or len(translated) != expected:
+        return None
+    return translated
+
+
+def _request_translations(texts, source_lang, target_lang):
+    """
+    Sends every text in one LibreTranslate request (``q`` accepts a list).
+    Returns None when the translator is unreachable or answers with an error.
+    """
+    try:
+        with track_upstream("libretranslate", "translate"):
+            resp = _get_session().post(
+                LIBRETRANSLATE_ENDPOINT,
+                json=_payload(texts, source_lang, target_lang),
+                timeout=LIBRETRANSLATE_TIMEOUT,
+            )
+    except requests.RequestException:
+        return None
+    translated = _parse_translations(resp, len(texts))
+    if translated is None:
+        count_upstream_error("libretranslate", "translate")
+    return translated
+
+
+def _split_cached(texts, source_lang, target_lang):
+    """
+    Returns ({key: translation} found in memory, {key: text} still missing).
+    """
+    resolved = {}
+    pending = {}
+    for text in texts:
+        if not text:
+            continue
+        key = cache_key(text, source_lang, target_lang)
+        if key in resolved or key in pending:
+            continue
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            resolved[key] = cached
+        else:
+            pending[key] = text
+    return resolved, pending
+
+
+def _cache_rows(keys, translated, source_lang, target_lang, resolved):
+    """
+    Fills both in-memory tiers and returns the TranslationCache rows to insert.
+    """
+    from .models import TranslationCache
+
+    rows = []
+    for key, value in zip(keys, translated):
+        _memory_cache.set(key, value)
+        resolved[key] = value
+        rows.append(
+            TranslationCache(
+                key=key,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                translated_text=value,
+            )
+        )
+    return rows
+
+
+def _assemble(texts, resolved, source_lang, target_lang, fallback):
+    return [
+        resolved.get(cache_key(text, source_lang, target_lang), text if fallback else None)
+        if text
+        else text
+        for text in texts
+    ]
+
+
+def translate_many(texts, source_lang="en", target_lang="fr", fallback=True):
+    """
+    Translates a list of strings, preserving order.
+    Lookups go memory LRU -> TranslationCache table -> one batched HTTP call
+    for whatever is still missing. Entries that could not be translated (e.g.
+    LibreTranslate is down) come back unchanged, or as None with
+    fallback=False so callers that store translations can retry them later.
+    """
+    from .models import TranslationCache
+
+    results = list(texts)
+    if source_lang == target_lang:
+        return results
+
+    resolved, pending = _split_cached(results, source_lang, target_lang)
+
+    if pending:
+        stored = TranslationCache.objects.filter(key__in=list(pending)).values_list(
+            "key", "translated_text"
+        )
+        for key, translated_text in stored:
+            _memory_cache.set(key, translated_text)
+            resolved[key] = translated_text
+            del pending[key]
+
+    if pending:
+        keys = list(pending)
+        translated = _request_translations(
+            [pending[key] for key in keys], source_lang, target_lang
+        )
+        if translated is not None:
+            TranslationCache.objects.bulk_create(
+                _cache_rows(keys, translated, source_lang, target_lang, resolved),
+                ignore_conflicts=True,
+            )
+
+    return _assemble(results, resolved, source_lang, target_lang, fallback)
+
+
+def translate_text(text, source_lang="en", target_lang="fr"):
+    if not text:
+        return text
+    return translate_many([text], source_lang, target_lang)[0]
+
+
+# Async variants for ASGI views: same tiers, async ORM and httpx.
+_async_client = None
+
+
+def _get_async_client():
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        headers = {}
+        if LIBRETRANSLATE_API_KEY:
+            headers["Authorization"] = f"Bearer {LIBRETRANSLATE_API_KEY}"
+        connect_timeout, read_timeout = LIBRETRANSLATE_TIMEOUT
+        _async_client = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+    return _async_client
+
+
+async def atranslate_many(texts, source_lang="en", target_lang="fr", fallback=True):
+    from .models import TranslationCache
+
+    results = list(texts)
+    if source_lang == target_lang:
+        return results
+
+    resolved, pending = _split_cached(results, source_lang, target_lang)
+
+    if pending:
+        stored = TranslationCache.objects.filter(key__in=list(pending)).values_list(
+            "key", "translated_text"
+        )
+        async for key, translated_text in stored:
+            _memory_cache.set(key, translated_text)
+            resolved[key] = translated_text
+            del pending[key]
+
+    if pending:
+        keys = list(pending)
+        try:
+            with track_upstream("libretranslate", "translate"):
+                resp = await _get_async_client().post(
+                    LIBRETRANSLATE_ENDPOINT,
+                    json=_payload([pending[key] for key in keys], source_lang, target_lang),
+                )
+            translated = _parse_translations(resp, len(keys))
+            if translated is None:
+                count_upstream_error("libretranslate", "translate")
+        except httpx.HTTPError:
+            translated = None
+        if translated is not None:
+            await TranslationCache.objects.abulk_create(
+                _cache_rows(keys, translated, source_lang, target_lang, resolved),
+                ignore_conflicts=True,
+            )
+
+    return _assemble(results, resolved, source_lang, target_lang, fallback)
+
+
+async def atranslate_text(text, source_lang="en", target_lang="fr"):
+    if not text:
+        return text
+    return (await atranslate_many([text], source_lang, target_lang))[0]
@@ -17,7 +17,9 @@ from .views import (
     InterestListView,
     ServiceTypeListView,
     PendingMotherSignUpView,
+    AsyncPendingMotherSignUpView,
     AdminDashboardView,
+    AdminCoverageView,
     SuperAdminDashboardView,
     SuperAdminCreateAdminView,
     PendingProviderSignUpView,
@@ -39,6 +41,11 @@ urlpatterns = [
     path("select_user_type", UserTypeSelectionView.as_view(), name="select_user_type"),
     # path("mother_signup", MotherSignUpView.as_view(), name="mother_signup"),
     path("mother_signup", PendingMotherSignUpView.as_view(), name="mother_signup"),
+    path(
+        "mother_signup_async",
+        AsyncPendingMotherSignUpView.as_view(),
+        name="mother_signup_async",
+    ),
     path("request_email_otp", RequestEmailOTPView.as_view(), name="request_email_otp"),
     path("provider_signup", ProviderSignUpView.as_view(), name="provider_signup"),
     # path("request_email_otp", RequestEmailOTPView.as_view(), name="request_email_otp"),
@@ -69,6 +76,7 @@ urlpatterns = [
         name="provider-workspace-dashboard",
     ),
     path("admin_dashboard", AdminDashboardView.as_view(), name="admin_dashboard"),
+    path("admin_coverage", AdminCoverageView.as_view(), name="admin_coverage"),
     path(
         "check_mother_first_time",
         CheckMotherFirstTimeView.as_view(),
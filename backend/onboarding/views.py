@@ -1,6 +1,9 @@
 # onboarding/views.py
+import logging
 import random
+from asgiref.sync import sync_to_async
 from django.core.mail import send_mail
+from django.http import JsonResponse
 from users.models import Interest, ServiceType
 from rest_framework.permissions import AllowAny
 from rest_framework import status, generics, permissions
@@ -12,15 +15,32 @@ from onboarding.serializers import (
     PendingMotherSignUpSerializer,
     PendingProviderSignUpSerializer,
     PendingProviderReviewSerializer,
+    certificate_preview_links,
 )
 from onboarding.models import PendingMotherRegistration, PendingProviderRegistration
-from users.models import MotherProfile, Interest, ProviderProfile
-from .models import EmailOTP
+from onboarding.certificate_storage import CertificateUploadHandler, acquire_certificates
+from onboarding.media import has_valid_signature, serve_media
+from onboarding import ranking
+from onboarding.coverage import cell_of, cell_size, nearest_zoom
+from users.models import MotherProfile, Interest, ProviderProfile, ProviderSearchEntry
+from users.country_partitions import country_key
+from users.localization import language_code, localized, request_language
+from .models import CoverageTile, EmailOTP, ProviderRecommendation
+from django.conf import settings
 from django.db import transaction
+from django.contrib.gis.db.models.functions import Distance
 from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import Exists, OuterRef, Subquery
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from MothersGarage.async_views import AsyncAPIView
+from MothersGarage.events import applicant_channel, channel_token, publish_on_commit
+from MothersGarage.logging_utils import debug_sampled
 from payments.models import BookingUsage
+from bookings.models import AvailabilitySlot
+from bookings.services import parse_window
 from django.utils import timezone
 from .serializers import (
     MainLandingSerializer,
@@ -37,6 +57,7 @@ from .serializers import (
 )
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class MainLandingView(generics.GenericAPIView):
@@ -345,6 +366,7 @@ class MotherDashboardView(generics.GenericAPIView):
     Returns a simple structure for the mother’s dashboard:
       - welcome message
       - module cards: teletherapy, home care, e-learning, social networking, AI for mothers
+      - recommended providers, precomputed by onboarding.recommendations
       - settings link
     """
 
@@ -353,6 +375,16 @@ class MotherDashboardView(generics.GenericAPIView):
     def get(self, request, *args, **kwargs):
         if request.user.role != "mother":
             return Response({"detail": "Not a mother account."}, status=403)
+        # One query on the (mother, rank) unique index; nothing is scored here
+        recommendations = list(
+            ProviderRecommendation.objects.filter(mother__user=request.user)
+            .select_related("mother", "provider__user")
+            .order_by("rank")
+        )
+        lang = language_code(
+            request.query_params.get("lang")
+            or (recommendations[0].mother.preferred_language if recommendations else None)
+        )
         data = {
             "welcome_message": f"Welcome {request.user.first_name}!",
             "modules": [
@@ -362,6 +394,16 @@ class MotherDashboardView(generics.GenericAPIView):
                 "Social Networking",
                 "AI for Mothers",
             ],
+            "recommended_providers": [
+                {
+                    "id": r.provider.user.id,
+                    "username": r.provider.user.username,
+                    "bio": localized(r.provider, "bio", lang),
+                    "country": r.provider.country,
+                    "match_score": r.score,
+                }
+                for r in recommendations
+            ],
             "settings_link": "/api/v1/onboarding/mother_settings",
         }
         return Response(data, status=200)
@@ -392,23 +434,18 @@ class ProviderWorkspaceOverviewView(APIView):
         subscription = getattr(user, "subscription", None)
         if subscription:
             subscription.auto_renew_if_needed()
-        print(f"[DEBUG] Authenticated user: {user} (ID: {user.id}, Role: {user.role})")
 
         if user.role != "provider":
-            print("[DEBUG] User is not a provider")
+            logger.debug("Workspace overview: user %s is not a provider", user.id)
             return Response({"detail": "Not a provider account."}, status=403)
 
         profile = getattr(user, "provider_profile", None)
         if not profile:
-            print("[DEBUG] Provider profile NOT FOUND.")
+            logger.debug("Workspace overview: no provider profile for user %s", user.id)
             return Response({"detail": "No provider profile found."}, status=404)
 
-        print("[DEBUG] Provider profile found.")
-        print(f"[DEBUG] Provider subscription_plan: {profile.subscription_plan}")
-        print(
-            f"[DEBUG] Provider specialities: {[s.name for s in profile.specialities.all()]}"
-        )
-        print(f"[DEBUG] Provider subscription_end: {profile.subscription_end}")
+        # One query for both the services list and the debug log below
+        specialities = list(profile.specialities.select_related("service_type"))
 
         plan = profile.subscription_plan or "none"
         booking_limit = 5 if plan == "basic" else 50 if plan == "standard" else None
@@ -422,9 +459,6 @@ class ProviderWorkspaceOverviewView(APIView):
                 (profile.subscription_end - timezone.now()).days, 0
             )
 
-        print(
-            f"[DEBUG] Usage: used={used}, booking_limit={booking_limit}, days_remaining={plan_days_remaining}"
-        )
         should_warn = False
         if plan in ["standard", "premium"] and plan_days_remaining <= 5:
             should_warn = True
@@ -433,7 +467,7 @@ class ProviderWorkspaceOverviewView(APIView):
         # if plan == "basic" and plan_days_remaining <= 5:
         #     should_warn = True
 
-        services = list(set(s.service_type.name for s in profile.specialities.all()))
+        services = list(set(s.service_type.name for s in specialities))
 
         response_data = {
             "subscription": {
@@ -453,8 +487,13 @@ class ProviderWorkspaceOverviewView(APIView):
             "settings_link": "/api/v1/onboarding/provider_settings",
         }
 
-        print("[DEBUG] Final response:", response_data)
-        print("[DEBUG] Returning services:", services)
+        if debug_sampled(logger):
+            logger.debug(
+                "Workspace overview for user %s: specialities=%s response=%s",
+                user.id,
+                [s.name for s in specialities],
+                response_data,
+            )
 
         return Response(response_data)
 
@@ -659,14 +698,16 @@ class InterestListView(generics.ListAPIView):
     """
 
     permission_classes = [AllowAny]
+    read_replica = True  # read-only, see MothersGarage.db_routers
     queryset = Interest.objects.all()
 
     def list(self, request, *args, **kwargs):
         # Return as JSON
+        lang = request_language(request)
         interests = self.get_queryset()
         data = []
         for i in interests:
-            data.append({"id": i.id, "name": i.name})
+            data.append({"id": i.id, "name": localized(i, "name", lang)})
         return Response(data, status=200)
 
 
@@ -677,13 +718,15 @@ class ServiceTypeListView(generics.ListAPIView):
     """
 
     permission_classes = [AllowAny]
+    read_replica = True
     queryset = ServiceType.objects.all()
 
     def list(self, request, *args, **kwargs):
+        lang = request_language(request)
         service_types = self.get_queryset()
         data = []
         for st in service_types:
-            data.append({"id": st.id, "name": st.name})
+            data.append({"id": st.id, "name": localized(st, "name", lang)})
         return Response(data, status=200)
 
 
@@ -719,6 +762,39 @@ class PendingMotherSignUpView(generics.CreateAPIView):
         )
 
 
+class AsyncPendingMotherSignUpView(AsyncAPIView):
+    """
+    POST /api/v1/onboarding/mother_signup_async
+    Async variant of PendingMotherSignUpView for ASGI deployments. The OTP
+    email still goes through the (blocking) SMTP backend, on a thread of
+    asgiref's executor rather than the shared thread-sensitive one: that
+    thread is held while SMTP responds, but the event loop and the other
+    requests' ORM calls are not.
+    """
+
+    require_authentication = False
+
+    async def post(self, request, *args, **kwargs):
+        serializer = PendingMotherSignUpSerializer(data=request.data)
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=400)
+        pending = await sync_to_async(serializer.save)()
+
+        await sync_to_async(send_mail, thread_sensitive=False)(
+            "Mother's Garage - Your OTP Code",
+            f"Your One-Time Code is: {pending.otp}\nPlease enter this code in the app to verify your email.",
+            "noreply@mothersgarage.com",
+            [pending.email],
+            fail_silently=True,
+        )
+        return JsonResponse(
+            {
+                "detail": "Pending registration created. An OTP has been sent to your email."
+            },
+            status=201,
+        )
+
+
 class PendingProviderSignUpView(generics.CreateAPIView):
     """
     Saves the provider sign-up data in a PendingProviderRegistration record.
@@ -729,6 +805,9 @@ class PendingProviderSignUpView(generics.CreateAPIView):
     permission_classes = [AllowAny]  # or more restricted if you prefer
 
     def create(self, request, *args, **kwargs):
+        # Must be set before request.data is parsed: certificates are streamed
+        # to disk and hashed chunk by chunk instead of buffered in memory.
+        request._request.upload_handlers = [CertificateUploadHandler(request._request)]
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         pending = serializer.save()
@@ -754,7 +833,9 @@ class PendingProviderSignUpView(generics.CreateAPIView):
                 "detail": (
                     "Pending provider registration created. "
                     "Please wait for admin approval."
-                )
+                ),
+                # Opens /api/v1/events/stream to hear about the approval
+                "events_token": channel_token(applicant_channel(pending.pk)),
             },
             status=status.HTTP_201_CREATED,
         )
@@ -800,7 +881,10 @@ class AdminApproveProviderView(generics.GenericAPIView):
             country=pending.country,
             preferred_language=pending.preferred_language,
             subscription_plan=None,
+            certificates=pending.certificates or [],
         )
+        # The profile now shares the pending registration's stored files
+        acquire_certificates(provider_profile.certificates)
 
         # Assign pinned location if present
         if pending.pinned_location_lat and pending.pinned_location_lng:
@@ -823,6 +907,12 @@ class AdminApproveProviderView(generics.GenericAPIView):
             specialities = Speciality.objects.filter(id__in=pending.speciality_ids)
             provider_profile.specialities.set(specialities)
 
+        publish_on_commit(
+            applicant_channel(pending.pk),
+            "provider.approved",
+            {"username": user.username, "email": user.email},
+        )
+
         # Remove the pending record
         pending.delete()
 
@@ -849,6 +939,7 @@ class AdminDashboardView(generics.GenericAPIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]  # or a custom permission
+    read_replica = True
 
     def get(self, request, *args, **kwargs):
         # Option 1: If you rely on role="admin" to check admin privileges:
@@ -865,7 +956,10 @@ class AdminDashboardView(generics.GenericAPIView):
                     "pending_id": p.id,
                     "username": p.username,
                     "email": p.email,
-                    "profession": p.profession,
+                    # 'profession' was removed from PendingProviderRegistration
+                    "license_number": p.license_number,
+                    # Thumbnails/previews let admins triage without the full files
+                    "certificates": certificate_preview_links(request, p.certificates),
                     "created_at": p.created_at.isoformat(),
                 }
             )
@@ -879,6 +973,77 @@ class AdminDashboardView(generics.GenericAPIView):
         )
 
 
+class AdminCoverageView(generics.GenericAPIView):
+    """
+    GET /api/v1/onboarding/admin_coverage?zoom=8&service=Home%20Care&bbox=w,s,e,n
+    Demand (pinned mothers) vs supply (searchable providers) per grid cell,
+    read from the precomputed CoverageTile rows (onboarding.coverage).
+    zoom snaps to the nearest precomputed level; service is a ServiceType
+    name and defaults to all services; bbox limits the cells returned.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+
+    def get(self, request, *args, **kwargs):
+        if request.user.role not in ["admin", "super_admin"]:
+            return Response({"detail": "Not an admin account."}, status=403)
+
+        params = request.query_params
+        try:
+            zoom = nearest_zoom(int(params.get("zoom", settings.COVERAGE_ZOOM_LEVELS[0])))
+            bbox = [float(v) for v in params["bbox"].split(",")] if params.get("bbox") else None
+        except ValueError:
+            return Response({"detail": "Invalid 'zoom' or 'bbox'."}, status=400)
+        if bbox is not None and len(bbox) != 4:
+            return Response({"detail": "'bbox' must be west,south,east,north."}, status=400)
+
+        tiles = CoverageTile.objects.filter(zoom=zoom)
+        service_type = None
+        if params.get("service"):
+            service_type = ServiceType.objects.filter(
+                name__iexact=params["service"].strip()
+            ).first()
+            if service_type is None:
+                return Response({"detail": "Unknown service."}, status=404)
+            tiles = tiles.filter(service_type=service_type)
+        else:
+            tiles = tiles.filter(service_type__isnull=True)
+        if bbox is not None:
+            west, south, east, north = bbox
+            min_x, min_y = cell_of(west, south, zoom)
+            max_x, max_y = cell_of(east, north, zoom)
+            tiles = tiles.filter(
+                cell_x__range=(min_x, max_x), cell_y__range=(min_y, max_y)
+            )
+
+        limit = settings.COVERAGE_MAX_TILES
+        rows = list(
+            tiles.values_list("cell_x", "cell_y", "mothers", "providers")[: limit + 1]
+        )
+        size = cell_size(zoom)
+        data = [
+            {
+                "lng": round(x * size, 6),
+                "lat": round(y * size, 6),
+                "mothers": mothers,
+                "providers": providers,
+                "mothers_per_provider": round(mothers / providers, 2) if providers else None,
+            }
+            for x, y, mothers, providers in rows[:limit]
+        ]
+        return Response(
+            {
+                "zoom": zoom,
+                "cell_size_deg": size,
+                "service": service_type.name if service_type else None,
+                "truncated": len(rows) > limit,
+                "tiles": data,
+            },
+            status=200,
+        )
+
+
 class SuperAdminDashboardView(generics.GenericAPIView):
     """
     GET /api/v1/onboarding/super_admin_dashboard
@@ -886,6 +1051,7 @@ class SuperAdminDashboardView(generics.GenericAPIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
 
     def get(self, request, *args, **kwargs):
         # Here we check role or is_superuser
@@ -972,16 +1138,52 @@ class SuperAdminCreateAdminView(generics.GenericAPIView):
         return Response({"detail": f"Admin user {user.username} created."}, status=201)
 
 
+class ProtectedMediaView(APIView):
+    """
+    GET /media/<path>
+    Serves uploaded files (provider certificates) to admins only. Access is
+    granted by an admin JWT or by the signed ?sig= link produced for the
+    review screen; the bytes are then handed to onboarding.media.serve_media.
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request, path, *args, **kwargs):
+        user = request.user
+        is_admin = user.is_authenticated and user.role in ["admin", "super_admin"]
+        if not is_admin and not has_valid_signature(path, request.query_params.get("sig")):
+            return Response({"detail": "Not allowed to view this file."}, status=403)
+        return serve_media(request._request, path)
+
+
 # We'll get to thumbnails later, but for now, let's assume you have a simple list of providers.
 # This is a naive implementation, assuming you have a ProviderProfile model with a user FK.
+MAX_SEARCH_RADIUS_KM = 200
+
+
 class SearchProvidersView(generics.ListAPIView):
     """
     GET /api/onboarding/search_providers?service=Teletherapy
     Returns providers that match the requested service
     and (optionally) the mother's country.
+
+    Optional filters, combined into the same query:
+    - available_from / available_to (ISO 8601): only providers with a free
+      slot inside the window; adds next_available
+    - radius_km (+ lat / lng, default: the mother's pinned location): only
+      providers within that distance; adds distance_km
+
+    Results are ordered by match_score (onboarding.ranking): the mother's
+    interests and needs against the provider's services and specialities,
+    shared language and distance. The providers' ranking inputs are read
+    precomputed from their search entries.
+
+    Service, country and radius are matched on the mother's country partition
+    of ProviderSearchEntry (users.country_partitions).
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
 
     def get(self, request, *args, **kwargs):
         user = request.user
@@ -1003,30 +1205,111 @@ class SearchProvidersView(generics.ListAPIView):
             return Response({"detail": "No mother profile found."}, status=404)
 
         mother_country = mother_profile.country.strip().lower()
+        lang = request.query_params.get("lang") or mother_profile.preferred_language
+        lang = language_code(lang)
+
+        # Candidates come from the country-partitioned search entries: the
+        # country equality prunes the scan to one partition's GIN/GiST indexes
+        entries = ProviderSearchEntry.objects.filter(
+            country=country_key(mother_country),
+            service_type_ids__overlap=ArraySubquery(
+                ServiceType.objects.filter(name__iexact=normalized_service).values("pk")
+            ),
+        )
 
-        # Fetch providers with matching service and country
-        providers = ProviderProfile.objects.filter(
-            is_searchable=True,
-            service_types__name__iexact=normalized_service,
-            country__iexact=mother_country,
-        ).distinct()
+        params = request.query_params
+        near = None
+        if params.get("radius_km"):
+            try:
+                radius_km = float(params["radius_km"])
+                if params.get("lat") and params.get("lng"):
+                    near = Point(float(params["lng"]), float(params["lat"]), srid=4326)
+            except ValueError:
+                return Response({"detail": "Invalid 'radius_km', 'lat' or 'lng'."}, status=400)
+            if not 0 < radius_km <= MAX_SEARCH_RADIUS_KM:
+                return Response(
+                    {"detail": f"'radius_km' must be between 0 and {MAX_SEARCH_RADIUS_KM}."},
+                    status=400,
+                )
+            near = near or mother_profile.pinned_location
+            if near is None:
+                return Response(
+                    {"detail": "Pin your location or pass 'lat' and 'lng'."}, status=400
+                )
+            # Partition-local GiST index on the entries' pinned_location
+            entries = entries.filter(pinned_location__dwithin=(near, D(km=radius_km)))
+
+        providers = (
+            ProviderProfile.objects.filter(
+                pk__in=entries.values("provider_id"),
+                # Entries are synced on save; this keeps a hidden provider out even so
+                is_searchable=True,
+            )
+            .select_related("user")
+            .prefetch_related("service_types", "specialities")
+        )
+        if near is not None:
+            providers = providers.annotate(distance=Distance("pinned_location", near))
 
-        print(
-            f"[DEBUG] Searching for service: '{normalized_service}' in country: '{mother_country}'"
+        window = None
+        if params.get("available_from") or params.get("available_to"):
+            window = parse_window(
+                params.get("available_from"), params.get("available_to"), default_days=1
+            )
+            if window is None:
+                return Response(
+                    {"detail": "Invalid 'available_from' / 'available_to'."}, status=400
+                )
+            # Correlated on the provider: each check is one probe of the
+            # (provider, time range) GiST index, no per-provider calendars
+            free_slots = (
+                AvailabilitySlot.objects.free()
+                .within(*window)
+                .filter(provider=OuterRef("pk"))
+                .order_by("start")
+            )
+            providers = providers.filter(Exists(free_slots)).annotate(
+                next_available=Subquery(free_slots.values("start")[:1])
+            )
+
+        providers = list(providers)
+        # Precomputed ranking inputs of the same partition rows (one query)
+        features = ranking.features_for(providers, *ranking.load_features(entries))
+        order, match_scores = ranking.rank(
+            features,
+            ranking.mother_terms(
+                mother_profile, mother_profile.interests.values_list("name", flat=True)
+            ),
+            language=mother_profile.preferred_language,
+            origin=near or mother_profile.pinned_location,
         )
-        print(f"[DEBUG] Matching providers found: {providers.count()}")
 
-        data = [
-            {
+        data = []
+        for index, score in zip(order, match_scores):
+            p = providers[index]
+            item = {
                 "id": p.user.id,
                 "username": p.user.username,
-                "services": [s.name for s in p.service_types.all()],
-                "specialities": [s.name for s in p.specialities.all()],
+                "bio": localized(p, "bio", lang),
+                "services": [localized(s, "name", lang) for s in p.service_types.all()],
+                "specialities": [
+                    localized(s, "name", lang) for s in p.specialities.all()
+                ],
                 "subscription_plan": p.subscription_plan,
                 "country": p.country,
+                "match_score": round(float(score), 4),
             }
-            for p in providers
-        ]
+            if window is not None:
+                item["next_available"] = p.next_available
+            if near is not None:
+                item["distance_km"] = round(p.distance.km, 2)
+            data.append(item)
+        logger.debug(
+            "Provider search service=%r country=%r: %d matches",
+            normalized_service,
+            mother_country,
+            len(data),
+        )
 
         return Response({"providers": data}, status=200)
 
@@ -1072,8 +1355,10 @@ class CompleteMotherTutorialView(generics.GenericAPIView):
 
 class SpecialitiesByServiceView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
+    read_replica = True
 
     def get(self, request, *args, **kwargs):
+        lang = request_language(request)
         # Fetch all ServiceTypes with pre-fetched specialities
         service_types = ServiceType.objects.all().prefetch_related("specialities")
         data = []
@@ -1081,9 +1366,9 @@ class SpecialitiesByServiceView(generics.GenericAPIView):
             data.append(
                 {
                     "id": st.id,
-                    "name": st.name,
+                    "name": localized(st, "name", lang),
                     "specialities": [
-                        {"id": spec.id, "name": spec.name}
+                        {"id": spec.id, "name": localized(spec, "name", lang)}
                         for spec in st.specialities.all()
                     ],
                 }
@@ -1,4 +1,6 @@
 from django.contrib import admin
+
+from MothersGarage.paginators import EstimatedCountPaginator
 from payments.models import Subscription, BookingUsage
 
 
@@ -7,6 +9,10 @@ class SubscriptionAdmin(admin.ModelAdmin):
     list_display = ("user", "plan", "start_date", "end_date", "is_active", "expired")
     search_fields = ("user__username", "user__email")
     list_filter = ("plan", "is_active")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
     def expired(self, obj):
         # Calls the model's has_expired() method to show expiration status
@@ -21,6 +27,10 @@ class BookingUsageAdmin(admin.ModelAdmin):
     list_display = ("user", "used_this_month", "cycle_start")
     search_fields = ("user__username", "user__email")
     list_filter = ("used_this_month",)
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     actions = ["reset_booking_usage_cycle"]
 
     def reset_booking_usage_cycle(self, request, queryset):
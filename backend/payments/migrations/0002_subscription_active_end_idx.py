@@ -0,0 +1,20 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='subscription',
+            index=models.Index(fields=['is_active', 'end_date'], name='subscription_active_end_idx'),
+        ),
+    ]
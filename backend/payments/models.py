@@ -5,6 +5,8 @@ from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 
+from MothersGarage.events import publish_on_commit, user_channel
+
 SUBSCRIPTION_PLAN_CHOICES = (
     ("basic", "Basic"),
     ("standard", "Standard"),
@@ -28,6 +30,12 @@ class Subscription(models.Model):
     end_date = models.DateTimeField(blank=True, null=True)  # e.g. 30 days from start
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Active subscriptions ending before a date (expiry, renewal warnings)
+            models.Index(fields=["is_active", "end_date"], name="subscription_active_end_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} subscription: {self.plan}"
 
@@ -96,10 +104,10 @@ class BookingUsage(models.Model):
         self.cycle_start = timezone.now()
         self.save()
 
-    def monthly_limit_reached(self):
+    def monthly_limit(self):
         """
-        Returns True if the user has reached the monthly booking limit
-        (5 for basic, 50 for standard, unlimited for premium).
+        Monthly booking limit for the user's plan: 5 for basic, 50 for
+        standard, None (unlimited) for premium, 0 for an unknown plan.
         """
         plan = "basic"
         subscription = getattr(self.user, "subscription", None)
@@ -110,12 +118,19 @@ class BookingUsage(models.Model):
             plan = self.user.provider_profile.subscription_plan or "basic"
 
         if plan == "basic":
-            return self.used_this_month >= 5
+            return 5
         elif plan == "standard":
-            return self.used_this_month >= 50
+            return 50
         elif plan == "premium":
-            return False  # unlimited
-        return True
+            return None  # unlimited
+        return 0
+
+    def monthly_limit_reached(self):
+        """
+        Returns True if the user has reached the monthly booking limit.
+        """
+        limit = self.monthly_limit()
+        return limit is not None and self.used_this_month >= limit
 
     def increment_usage(self):
         """
@@ -124,6 +139,15 @@ class BookingUsage(models.Model):
         self.used_this_month += 1
         self.save()
 
+        limit = self.monthly_limit()
+        if limit is not None and self.used_this_month == limit:
+            # Only the booking that crosses the limit notifies
+            publish_on_commit(
+                user_channel(self.user_id),
+                "usage.limit_reached",
+                {"used_this_month": self.used_this_month, "limit": limit},
+            )
+
         if self.monthly_limit_reached():
             # Hide from mother searches
             provider_profile = getattr(self.user, "provider_profile", None)
@@ -1,22 +1,67 @@
+import httpx
 import requests
 from django.conf import settings
 
+from MothersGarage.metrics import track_upstream
+
 
 def get_paypal_access_token():
-    response = requests.post(
-        f"{settings.PAYPAL_API_BASE}/v1/oauth2/token",
-        auth=(settings.PAYPAL_CLIENT_ID, settings.PAYPAL_SECRET),
-        data={"grant_type": "client_credentials"},
-    )
-    response.raise_for_status()
+    with track_upstream("paypal", "oauth_token"):
+        response = requests.post(
+            f"{settings.PAYPAL_API_BASE}/v1/oauth2/token",
+            auth=(settings.PAYPAL_CLIENT_ID, settings.PAYPAL_SECRET),
+            data={"grant_type": "client_credentials"},
+            timeout=settings.PAYPAL_TIMEOUT,
+        )
+        response.raise_for_status()
     return response.json()["access_token"]
 
 
 def get_order_details(order_id, access_token):
     headers = {"Authorization": f"Bearer {access_token}"}
-    response = requests.get(
-        f"{settings.PAYPAL_API_BASE}/v2/checkout/orders/{order_id}",
-        headers=headers,
-    )
-    response.raise_for_status()
+    with track_upstream("paypal", "get_order"):
+        response = requests.get(
+            f"{settings.PAYPAL_API_BASE}/v2/checkout/orders/{order_id}",
+            headers=headers,
+            timeout=settings.PAYPAL_TIMEOUT,
+        )
+        response.raise_for_status()
+    return response.json()
+
+
+# Async variants for the ASGI views. One AsyncClient per worker process keeps
+# connections to PayPal alive across requests; it is created lazily because it
+# must belong to the server's running event loop.
+_async_client = None
+
+
+def _get_async_client():
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            base_url=settings.PAYPAL_API_BASE,
+            timeout=settings.PAYPAL_TIMEOUT,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        )
+    return _async_client
+
+
+async def aget_paypal_access_token():
+    with track_upstream("paypal", "oauth_token"):
+        response = await _get_async_client().post(
+            "/v1/oauth2/token",
+            auth=(settings.PAYPAL_CLIENT_ID, settings.PAYPAL_SECRET),
+            data={"grant_type": "client_credentials"},
+        )
+        response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def aget_order_details(order_id, access_token):
+    with track_upstream("paypal", "get_order"):
+        response = await _get_async_client().get(
+            f"/v2/checkout/orders/{order_id}",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        response.raise_for_status()
     return response.json()
@@ -0,0 +1,21 @@
+# payments/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from MothersGarage.events import publish_on_commit, user_channel
+
+from .models import Subscription
+
+
+@receiver(post_save, sender=Subscription)
+def publish_subscription_change(sender, instance, **kwargs):
+    # Every plan change, activation, renewal and expiry goes through save()
+    publish_on_commit(
+        user_channel(instance.user_id),
+        "subscription.updated",
+        {
+            "plan": instance.plan,
+            "is_active": instance.is_active,
+            "end_date": instance.end_date.isoformat() if instance.end_date else None,
+        },
+    )
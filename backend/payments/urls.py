@@ -8,6 +8,7 @@ from .views import (
     SubscriptionStatusView,
     FreePlanActivationView,
     PayPalVerifiedPaymentView,
+    AsyncPayPalVerifiedPaymentView,
 )
 
 urlpatterns = [
@@ -40,4 +41,9 @@ urlpatterns = [
         PayPalVerifiedPaymentView.as_view(),
         name="paypal_verified_payment",
     ),
+    path(
+        "paypal-verify-async",
+        AsyncPayPalVerifiedPaymentView.as_view(),
+        name="paypal_verified_payment_async",
+    ),
 ]
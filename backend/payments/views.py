@@ -1,5 +1,6 @@
 # payments/views.py
 
+from asgiref.sync import sync_to_async
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django.utils import timezone
@@ -10,8 +11,15 @@ from django.contrib.auth import get_user_model
 from .models import Subscription, BookingUsage
 from rest_framework.views import APIView
 from users.models import ProviderProfile
-from .paypal_utils import get_paypal_access_token, get_order_details
+from .paypal_utils import (
+    get_paypal_access_token,
+    get_order_details,
+    aget_paypal_access_token,
+    aget_order_details,
+)
 from django.conf import settings
+from django.http import JsonResponse
+from MothersGarage.async_views import AsyncAPIView
 
 User = get_user_model()
 
@@ -66,7 +74,7 @@ class BookingUsageIncrementView(generics.GenericAPIView):
     """
     POST /api/booking-increment
     This is a placeholder to simulate a new booking for the provider.
-    In real usage, you might call this when a mother actually books a provider.
+    Real bookings (bookings.services.reserve) count usage themselves.
     """
 
     permission_classes = [permissions.IsAuthenticated]
@@ -219,6 +227,50 @@ PLAN_PRICING = {
 }
 
 
+def validate_paypal_order(order, plan):
+    """
+    Returns an error message if the PayPal order does not pay for `plan`,
+    or None when it checks out.
+    """
+    if order["status"] != "COMPLETED":
+        return "Order not completed."
+
+    unit = order["purchase_units"][0]
+    amount_paid = unit["amount"]["value"]
+    currency_paid = unit["amount"]["currency_code"]
+    payee_email = unit["payee"]["email_address"]
+
+    expected = PLAN_PRICING[plan]
+    if amount_paid != expected["amount"] or currency_paid != expected["currency"]:
+        return "Payment amount or currency mismatch."
+
+    if (
+        settings.PAYPAL_MERCHANT_EMAIL
+        and payee_email != settings.PAYPAL_MERCHANT_EMAIL
+    ):
+        return "Payment did not go to the correct merchant."
+    return None
+
+
+@transaction.atomic
+def activate_paid_plan(user, plan):
+    # Activate subscription
+    sub, _ = Subscription.objects.get_or_create(user=user)
+    sub.plan = plan
+    sub.start_date = timezone.now()
+    sub.end_date = sub.start_date + timedelta(days=30)
+    sub.is_active = True
+    sub.save()
+
+    # Reflect in profile
+    profile = ProviderProfile.objects.filter(user=user).first()
+    if profile:
+        profile.subscription_plan = plan
+        profile.subscription_end = sub.end_date
+        profile.is_searchable = True
+        profile.save()
+
+
 class PayPalVerifiedPaymentView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -244,42 +296,51 @@ class PayPalVerifiedPaymentView(APIView):
             )
 
         # Validate order
-        if order["status"] != "COMPLETED":
-            return Response({"detail": "Order not completed."}, status=400)
+        error = validate_paypal_order(order, plan)
+        if error:
+            return Response({"detail": error}, status=400)
 
-        unit = order["purchase_units"][0]
-        amount_paid = unit["amount"]["value"]
-        currency_paid = unit["amount"]["currency_code"]
-        payee_email = unit["payee"]["email_address"]
+        activate_paid_plan(user, plan)
 
-        expected = PLAN_PRICING[plan]
-        if amount_paid != expected["amount"] or currency_paid != expected["currency"]:
-            return Response(
-                {"detail": "Payment amount or currency mismatch."}, status=400
+        return Response({"detail": f"Verified and activated {plan} plan."}, status=200)
+
+
+class AsyncPayPalVerifiedPaymentView(AsyncAPIView):
+    """
+    POST /api/v1/payments/paypal-verify-async
+    Same contract as PayPalVerifiedPaymentView, but the two PayPal round trips
+    are awaited instead of blocking a worker thread (run under ASGI).
+    """
+
+    async def post(self, request, *args, **kwargs):
+        user = request.user
+        if user.role != "provider":
+            return JsonResponse({"detail": "Not a provider account."}, status=403)
+
+        order_id = request.data.get("order_id")
+        plan = request.data.get("plan")
+
+        if not order_id or not plan:
+            return JsonResponse(
+                {"detail": "order_id and plan are required."}, status=400
             )
+        if plan not in PLAN_PRICING:
+            return JsonResponse({"detail": "Invalid plan type."}, status=400)
 
-        if (
-            settings.PAYPAL_MERCHANT_EMAIL
-            and payee_email != settings.PAYPAL_MERCHANT_EMAIL
-        ):
-            return Response(
-                {"detail": "Payment did not go to the correct merchant."}, status=400
+        try:
+            access_token = await aget_paypal_access_token()
+            order = await aget_order_details(order_id, access_token)
+        except Exception as e:
+            return JsonResponse(
+                {"detail": f"Failed to verify payment: {str(e)}"}, status=400
             )
 
-        # Activate subscription
-        sub, _ = Subscription.objects.get_or_create(user=user)
-        sub.plan = plan
-        sub.start_date = timezone.now()
-        sub.end_date = sub.start_date + timedelta(days=30)
-        sub.is_active = True
-        sub.save()
+        error = validate_paypal_order(order, plan)
+        if error:
+            return JsonResponse({"detail": error}, status=400)
 
-        # Reflect in profile
-        profile = getattr(user, "provider_profile", None)
-        if profile:
-            profile.subscription_plan = plan
-            profile.subscription_end = sub.end_date
-            profile.is_searchable = True
-            profile.save()
+        await sync_to_async(activate_paid_plan)(user, plan)
 
-        return Response({"detail": f"Verified and activated {plan} plan."}, status=200)
+        return JsonResponse(
+            {"detail": f"Verified and activated {plan} plan."}, status=200
+        )
@@ -1,4 +1,10 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import StreamingHttpResponse
+from django.urls import path
+
+from MothersGarage.paginators import EstimatedCountPaginator
+from onboarding.provider_csv import export_rows, stream_csv
 from .models import (
     User,
     Interest,
@@ -22,6 +28,9 @@ class UserAdmin(admin.ModelAdmin):
     search_fields = ("username", "email")
     list_filter = ("role", "is_staff", "is_superuser", "is_email_verified")
     list_editable = ("role",)
+    # Large table: no second full COUNT(*), estimated page totals
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 @admin.register(Interest)
@@ -40,8 +49,11 @@ class MotherProfileAdmin(admin.ModelAdmin):
         "has_agreed_to_terms",
     )
     search_fields = ("user__username", "country", "preferred_language")
-    filter_horizontal = ("interests",)
+    list_select_related = ("user",)
+    autocomplete_fields = ("user", "interests")
     exclude = ("pinned_location",)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 @admin.register(ServiceType)
@@ -55,6 +67,12 @@ class SpecialityAdmin(admin.ModelAdmin):
     list_display = ("name", "service_type")
     search_fields = ("name", "service_type__name")
     list_filter = ("service_type",)
+    autocomplete_fields = ("service_type",)
+
+    def get_queryset(self, request):
+        # __str__ shows the service type: covers the changelist and the
+        # autocomplete results used by ProviderProfileAdmin
+        return super().get_queryset(request).select_related("service_type")
 
 
 @admin.register(ProviderProfile)
@@ -74,7 +92,33 @@ class ProviderProfileAdmin(admin.ModelAdmin):
         "country",
         "preferred_language",
     )
-    filter_horizontal = ("specialities",)
+    list_select_related = ("user",)
+    autocomplete_fields = ("user", "service_types", "specialities")
     exclude = ("pinned_location",)  # still optional
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def get_urls(self):
+        return [
+            path(
+                "export-csv/",
+                self.admin_site.admin_view(self.export_csv_view),
+                name="users_providerprofile_export_csv",
+            ),
+        ] + super().get_urls()
+
+    def export_csv_view(self, request):
+        """
+        Streams the providers matching the changelist's current filters and
+        search as CSV (same layout as the pending provider import).
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        queryset = self.get_changelist_instance(request).get_queryset(request)
+        response = StreamingHttpResponse(
+            stream_csv(export_rows(queryset)), content_type="text/csv"
+        )
+        response["Content-Disposition"] = 'attachment; filename="providers.csv"'
+        return response
 
     # 🔥 REMOVED services_display, specialities_display, and certificates_display
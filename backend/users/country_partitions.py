@@ -0,0 +1,172 @@
+# users/country_partitions.py
+"""
+Country-scoped copies of the profile columns that searches filter on.
+
+users_providersearchentry and users_mothersearchentry are PostgreSQL tables
+PARTITION BY LIST (country), one partition per COUNTRY_CHOICES value plus a
+DEFAULT partition. Each partition has its own GiST/GIN/btree indexes, so:
+- a query filtering on country = country_key(...) is pruned to one partition
+  at plan time and only walks that market's indexes
+- VACUUM / ANALYZE / REINDEX run per country (manage.py search_partitions)
+
+The profile tables themselves stay unpartitioned: a partitioned table's
+primary key must include the partition key, and every foreign key to a
+profile (bookings, subscriptions, recommendations, m2m tables) targets the
+plain id.
+
+Provider entries also carry the ranking inputs of onboarding.ranking (hashed
+catalog terms, language index), computed here on sync so searches never
+tokenize per request.
+
+Rows are kept in sync from users.signals, in the saving transaction:
+providers are present only while searchable. Writes that bypass signals
+(COPY imports, queryset.update()) are caught up by
+`manage.py search_partitions --rebuild`.
+
+Adding a country: add it to COUNTRY_CHOICES and, in a migration, move its
+rows out of the DEFAULT partition and CREATE TABLE ... PARTITION OF ... FOR
+VALUES IN ('<KEY>').
+"""
+
+from collections import defaultdict
+
+from django.db import connection, transaction
+
+from onboarding.ranking import language_index, term_buckets
+
+from .models import (
+    COUNTRY_CHOICES,
+    MotherProfile,
+    MotherSearchEntry,
+    ProviderProfile,
+    ProviderSearchEntry,
+)
+
+SYNC_BATCH_SIZE = 5000
+
+
+def country_key(country):
+    """
+    Partition key of a profile country: "uganda " -> "UGANDA".
+    """
+    return (country or "").strip().upper()
+
+
+COUNTRY_KEYS = tuple(country_key(value) for value, _ in COUNTRY_CHOICES)
+
+
+def partition_table(model, country):
+    """
+    The partition holding `country` rows of a search entry model.
+    """
+    key = country_key(country)
+    suffix = key.lower() if key in COUNTRY_KEYS else "default"
+    return f"{model._meta.db_table}_{suffix}"
+
+
+def partition_tables(model):
+    return [partition_table(model, key) for key in COUNTRY_KEYS] + [
+        f"{model._meta.db_table}_default"
+    ]
+
+
+def _provider_sql():
+    through = ProviderProfile.service_types.through._meta.db_table
+    entries = ProviderSearchEntry._meta.db_table
+    return (
+        f"DELETE FROM {entries} WHERE provider_id = ANY(%(ids)s)",
+        f"""
+        INSERT INTO {entries}
+            (provider_id, country, service_type_ids, term_buckets, language, pinned_location, updated_at)
+        SELECT p.id, upper(trim(p.country)),
+               coalesce(array_agg(st.servicetype_id) FILTER (WHERE st.id IS NOT NULL), '{{}}'),
+               f.term_buckets::smallint[], f.language, p.pinned_location, now()
+        FROM {ProviderProfile._meta.db_table} p
+        JOIN unnest(%(ids)s::bigint[], %(term_buckets)s::text[], %(languages)s::smallint[])
+            AS f (id, term_buckets, language) ON f.id = p.id
+        LEFT JOIN {through} st ON st.providerprofile_id = p.id
+        WHERE p.is_searchable
+        GROUP BY p.id, f.term_buckets, f.language
+        ON CONFLICT (country, provider_id) DO UPDATE SET
+            service_type_ids = EXCLUDED.service_type_ids,
+            term_buckets = EXCLUDED.term_buckets,
+            language = EXCLUDED.language,
+            pinned_location = EXCLUDED.pinned_location,
+            updated_at = EXCLUDED.updated_at
+        """,
+    )
+
+
+def _mother_sql():
+    entries = MotherSearchEntry._meta.db_table
+    return (
+        f"DELETE FROM {entries} WHERE mother_id = ANY(%(ids)s)",
+        f"""
+        INSERT INTO {entries} (mother_id, country, pinned_location, updated_at)
+        SELECT m.id, upper(trim(m.country)), m.pinned_location, now()
+        FROM {MotherProfile._meta.db_table} m
+        WHERE m.id = ANY(%(ids)s)
+        ON CONFLICT (country, mother_id) DO UPDATE SET
+            pinned_location = EXCLUDED.pinned_location,
+            updated_at = EXCLUDED.updated_at
+        """,
+    )
+
+
+def _provider_features(ids):
+    """
+    Ranking inputs of the given providers as unnest() parameters: term
+    buckets as array literals and language indices, aligned with "ids".
+    """
+    profiles = ProviderProfile.objects.filter(pk__in=ids)
+    names = defaultdict(list)
+    for field in ("service_types__name", "specialities__name"):
+        for pk, name in profiles.filter(**{f"{field}__isnull": False}).values_list(
+            "pk", field
+        ):
+            names[pk].append(name)
+    languages = dict(profiles.values_list("pk", "preferred_language"))
+    return {
+        "term_buckets": [
+            "{" + ",".join(map(str, term_buckets(names[pk]))) + "}" for pk in ids
+        ],
+        "languages": [language_index(languages.get(pk)) for pk in ids],
+    }
+
+
+def _sync(statements, ids, features=None):
+    ids = list(ids)
+    if not ids:
+        return
+    # Delete first: a changed country moves the row to another partition
+    with transaction.atomic(), connection.cursor() as cursor:
+        params = {"ids": ids, **(features(ids) if features else {})}
+        for statement in statements:
+            cursor.execute(statement, params)
+
+
+def sync_provider_entries(provider_ids):
+    _sync(_provider_sql(), provider_ids, _provider_features)
+
+
+def sync_mother_entries(mother_ids):
+    _sync(_mother_sql(), mother_ids)
+
+
+def rebuild_entries(model, batch_size=SYNC_BATCH_SIZE):
+    """
+    Re-syncs every profile of `model` (MotherProfile or ProviderProfile),
+    one short transaction per batch so no lock is held for long.
+    Returns the number of profiles visited.
+    """
+    sync = sync_provider_entries if model is ProviderProfile else sync_mother_entries
+    ids = model.objects.order_by("pk").values_list("pk", flat=True)
+    total = 0
+    last = 0
+    while True:
+        batch = list(ids.filter(pk__gt=last)[:batch_size])
+        if not batch:
+            return total
+        sync(batch)
+        total += len(batch)
+        last = batch[-1]
@@ -0,0 +1,44 @@
+# users/localization.py
+from .models import LANGUAGE_CODES
+
+DEFAULT_LANGUAGE_CODE = "en"
+SUPPORTED_LANGUAGE_CODES = set(LANGUAGE_CODES.values())
+
+
+def language_code(preferred_language):
+    """
+    "French" -> "fr", "fr" -> "fr", anything unknown -> "en".
+    """
+    if preferred_language in SUPPORTED_LANGUAGE_CODES:
+        return preferred_language
+    return LANGUAGE_CODES.get(preferred_language or "", DEFAULT_LANGUAGE_CODE)
+
+
+def request_language(request):
+    """
+    Language for a read endpoint: explicit ?lang= wins, then the caller's
+    profile preferred_language, then English.
+
+    Costs no query: ProfileJWTAuthentication loads the profile together with
+    request.user.
+    """
+    requested = request.query_params.get("lang")
+    if requested:
+        return language_code(requested)
+
+    user = request.user
+    if not user.is_authenticated:
+        return DEFAULT_LANGUAGE_CODE
+    profile_attr = {"mother": "mother_profile", "provider": "provider_profile"}.get(
+        user.role
+    )
+    profile = getattr(user, profile_attr, None) if profile_attr else None
+    return language_code(getattr(profile, "preferred_language", None))
+
+
+def localized(obj, field, lang):
+    """
+    Returns the precomputed <field>_<lang> variant, falling back to the
+    original value while the background translation has not run yet.
+    """
+    return getattr(obj, f"{field}_{lang}", None) or getattr(obj, field)
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from users.country_partitions import (
+    COUNTRY_KEYS,
+    SYNC_BATCH_SIZE,
+    country_key,
+    partition_table,
+    partition_tables,
+    rebuild_entries,
+)
+from users.models import (
+    MotherProfile,
+    MotherSearchEntry,
+    ProviderProfile,
+    ProviderSearchEntry,
+)
+
+ENTRY_MODELS = ((ProviderSearchEntry, ProviderProfile), (MotherSearchEntry, MotherProfile))
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintains the country-partitioned search entries: re-sync them from "
+        "the profiles, and VACUUM / REINDEX one country's partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Re-sync every entry from the profiles, in short batches.",
+        )
+        parser.add_argument(
+            "--country",
+            help="Limit --vacuum/--reindex to this country ('default' for the rest).",
+        )
+        parser.add_argument("--vacuum", action="store_true", help="VACUUM (ANALYZE).")
+        parser.add_argument(
+            "--reindex", action="store_true", help="REINDEX TABLE CONCURRENTLY."
+        )
+        parser.add_argument("--batch-size", type=int, default=SYNC_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if not (options["rebuild"] or options["vacuum"] or options["reindex"]):
+            raise CommandError("Pass --rebuild, --vacuum and/or --reindex.")
+
+        if options["rebuild"]:
+            for _, profile_model in ENTRY_MODELS:
+                count = rebuild_entries(profile_model, options["batch_size"])
+                self.stdout.write(
+                    f"Synced {count} {profile_model._meta.verbose_name_plural}."
+                )
+
+        if options["vacuum"] or options["reindex"]:
+            self.maintain(options["country"], options["vacuum"], options["reindex"])
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def maintain(self, country, vacuum, reindex):
+        if country and country.lower() != "default" and country_key(country) not in COUNTRY_KEYS:
+            raise CommandError(f"Unknown country {country!r}; its rows live in 'default'.")
+        tables = []
+        for entry_model, _ in ENTRY_MODELS:
+            if country:
+                tables.append(partition_table(entry_model, country))
+            else:
+                tables.extend(partition_tables(entry_model))
+
+        # Neither statement may run inside a transaction block
+        with connection.cursor() as cursor:
+            for table in tables:
+                if vacuum:
+                    cursor.execute(f"VACUUM (ANALYZE) {table}")
+                if reindex:
+                    cursor.execute(f"REINDEX TABLE CONCURRENTLY {table}")
+                self.stdout.write(f"Maintained {table}.")
@@ -0,0 +1,362 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from bookings.models import AvailabilitySlot, Booking
+from MothersGarage.pg_copy import CopyWriter
+from onboarding.models import ProviderRecommendation
+from payments.models import BookingUsage, Subscription
+from users.country_partitions import rebuild_entries
+from users.models import (
+    Interest,
+    MotherProfile,
+    MotherSearchEntry,
+    ProviderProfile,
+    ProviderSearchEntry,
+    ServiceType,
+    Speciality,
+)
+
+User = get_user_model()
+
+CATALOG = {
+    "Doula": ["Birth support", "Postpartum support", "Sibling preparation"],
+    "Lactation consultant": ["Breastfeeding support", "Pumping plans", "Weaning"],
+    "Night nurse": ["Sleep training", "Newborn care", "Twins"],
+    "Midwife": ["Home visits", "Postnatal checks", "Family planning"],
+    "Postnatal physiotherapy": ["Pelvic floor", "Diastasis recti"],
+    "Mental health counsellor": ["Postpartum depression", "Anxiety", "Grief"],
+}
+INTERESTS = ["Breastfeeding", "Sleep", "Nutrition", "Exercise", "Mental health"]
+
+# (city, lon, lat, weight within its country, spread in degrees)
+CITIES = {
+    "Uganda": (
+        ("Kampala", 32.5825, 0.3476, 40, 0.12),
+        ("Mukono", 32.7553, 0.3533, 8, 0.05),
+        ("Entebbe", 32.4795, 0.0512, 6, 0.04),
+        ("Jinja", 33.2041, 0.4244, 8, 0.05),
+        ("Gulu", 32.2999, 2.7724, 8, 0.06),
+        ("Lira", 32.8998, 2.2499, 6, 0.05),
+        ("Mbale", 34.1750, 1.0821, 7, 0.05),
+        ("Mbarara", 30.6545, -0.6072, 9, 0.06),
+        ("Fort Portal", 30.2750, 0.6710, 4, 0.04),
+        ("Arua", 30.9110, 3.0201, 4, 0.04),
+    ),
+    "Canada": (
+        ("Toronto", -79.3832, 43.6532, 30, 0.25),
+        ("Montreal", -73.5673, 45.5017, 20, 0.2),
+        ("Vancouver", -123.1207, 49.2827, 13, 0.15),
+        ("Calgary", -114.0719, 51.0447, 8, 0.12),
+        ("Edmonton", -113.4938, 53.5461, 7, 0.12),
+        ("Ottawa", -75.6972, 45.4215, 7, 0.1),
+        ("Winnipeg", -97.1384, 49.8951, 5, 0.08),
+        ("Quebec City", -71.2082, 46.8139, 5, 0.08),
+        ("Halifax", -63.5752, 44.6488, 3, 0.06),
+    ),
+}
+# Share of providers on each plan; None = no subscription
+PLAN_WEIGHTS = ((None, 20), ("basic", 40), ("standard", 25), ("premium", 15))
+
+
+def ensure_catalog():
+    """
+    Creates the service/speciality/interest catalog if missing and returns
+    (specialities, interest ids).
+    """
+    for name in INTERESTS:
+        Interest.objects.get_or_create(name=name)
+    for service_name, speciality_names in CATALOG.items():
+        service, _ = ServiceType.objects.get_or_create(name=service_name)
+        for speciality_name in speciality_names:
+            Speciality.objects.get_or_create(name=speciality_name, service_type=service)
+    return (
+        list(Speciality.objects.order_by("pk")),
+        list(Interest.objects.order_by("pk").values_list("pk", flat=True)),
+    )
+
+
+def reserve_ids(cursor, model, count):
+    """
+    Takes count ids from model's id sequence and returns the first one, so
+    rows referencing each other can be written in the same COPY run.
+    """
+    cursor.execute(
+        "SELECT pg_get_serial_sequence(%s, %s)",
+        [model._meta.db_table, model._meta.pk.column],
+    )
+    sequence = cursor.fetchone()[0]
+    cursor.execute("SELECT nextval(%s)", [sequence])
+    first = cursor.fetchone()[0]
+    cursor.execute("SELECT setval(%s, %s)", [sequence, first + count - 1])
+    return first
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates large, deterministic synthetic data: users, mother and "
+        "provider profiles clustered around Ugandan and Canadian cities, "
+        "service/speciality/interest assignments, subscriptions and booking "
+        "usage. Rows are loaded with COPY; the same --seed gives the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--providers", type=int, default=100_000)
+        parser.add_argument("--mothers", type=int, default=1_000_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--prefix",
+            default="seed_",
+            help="Username prefix; generated users are <prefix>mother_<n> / <prefix>provider_<n>.",
+        )
+        parser.add_argument("--password", default="seed-password")
+        parser.add_argument(
+            "--uganda-share",
+            type=float,
+            default=0.6,
+            help="Share of profiles located in Uganda, the rest in Canada.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=50_000)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete users previously generated with the same prefix first.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("seed_scale needs PostgreSQL (it loads rows with COPY).")
+
+        self.rng = random.Random(options["seed"])
+        self.prefix = options["prefix"]
+        self.uganda_share = options["uganda_share"]
+        self.chunk_size = options["chunk_size"]
+        self.now = timezone.now()
+        # Hash once: every generated user shares the password
+        self.password = make_password(options["password"])
+        self.specialities, self.interest_ids = ensure_catalog()
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            if options["clear"]:
+                self.clear(cursor)
+            self.seed_providers(cursor, options["providers"])
+            self.seed_mothers(cursor, options["mothers"])
+        # COPY skips the signals that keep the country partitions in sync
+        rebuild_entries(ProviderProfile)
+        rebuild_entries(MotherProfile)
+
+        with connection.cursor() as cursor:
+            for model in (
+                User,
+                ProviderProfile,
+                MotherProfile,
+                Subscription,
+                BookingUsage,
+                ProviderSearchEntry,
+                MotherSearchEntry,
+            ):
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {options['providers']} providers and {options['mothers']} mothers."
+            )
+        )
+
+    def clear(self, cursor):
+        users = User._meta.db_table
+        user_ids = (
+            f"SELECT id FROM {connection.ops.quote_name(users)} WHERE username LIKE %s"
+        )
+        pattern = self.prefix.replace("_", r"\_") + "%"
+
+        def profile_ids(model):
+            return (
+                f"SELECT id FROM {connection.ops.quote_name(model._meta.db_table)} "
+                f"WHERE user_id IN ({user_ids})"
+            )
+
+        # Rows created on top of seeded profiles (recommendations, calendars,
+        # bookings) reference them by foreign key and must go first
+        mothers, providers = profile_ids(MotherProfile), profile_ids(ProviderProfile)
+        either = f"mother_id IN ({mothers}) OR provider_id IN ({providers})"
+        for model, where, params in (
+            (ProviderRecommendation, either, [pattern, pattern]),
+            (Booking, either, [pattern, pattern]),
+            (AvailabilitySlot, f"provider_id IN ({providers})", [pattern]),
+        ):
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)} "
+                f"WHERE {where}",
+                params,
+            )
+        # Bulk-delete the tables this command fills, then let the ORM handle
+        # anything else that references the users (tokens, OTPs...)
+        for through, owner in (
+            (ProviderProfile.service_types.through, ProviderProfile),
+            (ProviderProfile.specialities.through, ProviderProfile),
+            (MotherProfile.interests.through, MotherProfile),
+        ):
+            owner_column = f"{owner._meta.model_name}_id"
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(through._meta.db_table)} "
+                f"WHERE {owner_column} IN (SELECT id FROM "
+                f"{connection.ops.quote_name(owner._meta.db_table)} "
+                f"WHERE user_id IN ({user_ids}))",
+                [pattern],
+            )
+        for model in (ProviderProfile, MotherProfile, Subscription, BookingUsage):
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)} "
+                f"WHERE user_id IN ({user_ids})",
+                [pattern],
+            )
+        User.objects.filter(username__startswith=self.prefix).delete()
+
+    def _location(self):
+        country = "Uganda" if self.rng.random() < self.uganda_share else "Canada"
+        cities = CITIES[country]
+        _, lon, lat, _, spread = self.rng.choices(
+            cities, weights=[city[3] for city in cities]
+        )[0]
+        lon += self.rng.gauss(0, spread)
+        lat += self.rng.gauss(0, spread)
+        return country, f"SRID=4326;POINT({lon:.6f} {lat:.6f})"
+
+    def _user(self, pk, role, index):
+        username = f"{self.prefix}{role}_{index}"
+        return {
+            "id": pk,
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": self.password,
+            "role": role,
+            "is_email_verified": True,
+            "is_active": True,
+            "date_joined": self.now - timedelta(days=self.rng.randint(0, 720)),
+        }
+
+    def _chunks(self, total):
+        for start in range(0, total, self.chunk_size):
+            yield start, min(start + self.chunk_size, total)
+
+    def seed_providers(self, cursor, count):
+        if not count:
+            return
+        user_base = reserve_ids(cursor, User, count)
+        profile_base = reserve_ids(cursor, ProviderProfile, count)
+        users = CopyWriter(cursor, User, include_pk=True)
+        profiles = CopyWriter(cursor, ProviderProfile, include_pk=True)
+        service_links = CopyWriter(cursor, ProviderProfile.service_types.through)
+        speciality_links = CopyWriter(cursor, ProviderProfile.specialities.through)
+        subscriptions = CopyWriter(cursor, Subscription)
+        usage = CopyWriter(cursor, BookingUsage)
+        plans, plan_weights = zip(*PLAN_WEIGHTS)
+
+        for start, end in self._chunks(count):
+            user_rows, profile_rows, service_rows, speciality_rows = [], [], [], []
+            subscription_rows, usage_rows = [], []
+            for i in range(start, end):
+                user_id, profile_id = user_base + i, profile_base + i
+                user_rows.append(self._user(user_id, "provider", i))
+                country, location = self._location()
+                plan = self.rng.choices(plans, weights=plan_weights)[0]
+                plan_start = self.now - timedelta(days=self.rng.randint(0, 29))
+                plan_end = plan_start + timedelta(days=30) if plan else None
+                profile_rows.append(
+                    {
+                        "id": profile_id,
+                        "user_id": user_id,
+                        "country": country,
+                        "pinned_location": location,
+                        "preferred_language": "French"
+                        if country == "Canada" and self.rng.random() < 0.3
+                        else "English",
+                        "bio": f"Experienced provider serving {country}.",
+                        "bio_en": f"Experienced provider serving {country}.",
+                        "license_number": f"LIC-{i:08d}",
+                        "is_verified_by_admin": True,
+                        "is_searchable": self.rng.random() < 0.95,
+                        "subscription_plan": plan,
+                        "subscription_start": plan_start if plan else None,
+                        "subscription_end": plan_end,
+                        "has_completed_tutorial": True,
+                    }
+                )
+                chosen = self.rng.sample(self.specialities, self.rng.randint(1, 4))
+                for service_type_id in sorted({s.service_type_id for s in chosen}):
+                    service_rows.append(
+                        {"providerprofile_id": profile_id, "servicetype_id": service_type_id}
+                    )
+                for speciality in chosen:
+                    speciality_rows.append(
+                        {"providerprofile_id": profile_id, "speciality_id": speciality.pk}
+                    )
+                if plan:
+                    subscription_rows.append(
+                        {
+                            "user_id": user_id,
+                            "plan": plan,
+                            "start_date": plan_start,
+                            "end_date": plan_end,
+                            "is_active": True,
+                        }
+                    )
+                    usage_rows.append(
+                        {
+                            "user_id": user_id,
+                            "used_this_month": self.rng.randint(0, 12),
+                            "cycle_start": plan_start,
+                        }
+                    )
+            users.write(user_rows)
+            profiles.write(profile_rows)
+            service_links.write(service_rows)
+            speciality_links.write(speciality_rows)
+            subscriptions.write(subscription_rows)
+            usage.write(usage_rows)
+            self.stdout.write(f"providers: {end}/{count}")
+
+    def seed_mothers(self, cursor, count):
+        if not count:
+            return
+        user_base = reserve_ids(cursor, User, count)
+        profile_base = reserve_ids(cursor, MotherProfile, count)
+        users = CopyWriter(cursor, User, include_pk=True)
+        profiles = CopyWriter(cursor, MotherProfile, include_pk=True)
+        interest_links = CopyWriter(cursor, MotherProfile.interests.through)
+
+        for start, end in self._chunks(count):
+            user_rows, profile_rows, interest_rows = [], [], []
+            for i in range(start, end):
+                user_id, profile_id = user_base + i, profile_base + i
+                user_rows.append(self._user(user_id, "mother", i))
+                country, location = self._location()
+                profile_rows.append(
+                    {
+                        "id": profile_id,
+                        "user_id": user_id,
+                        "country": country,
+                        "pinned_location": location,
+                        "preferred_language": "French"
+                        if country == "Canada" and self.rng.random() < 0.3
+                        else "English",
+                        "age": str(self.rng.randint(18, 45)),
+                        "has_agreed_to_terms": True,
+                        "has_completed_tutorial": self.rng.random() < 0.8,
+                    }
+                )
+                for interest_id in self.rng.sample(
+                    self.interest_ids, self.rng.randint(0, min(3, len(self.interest_ids)))
+                ):
+                    interest_rows.append(
+                        {"motherprofile_id": profile_id, "interest_id": interest_id}
+                    )
+            users.write(user_rows)
+            profiles.write(profile_rows)
+            interest_links.write(interest_rows)
+            self.stdout.write(f"mothers: {end}/{count}")
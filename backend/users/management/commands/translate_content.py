@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from users.models import ProviderProfile
+from users.tasks import (
+    CATALOG_MODELS,
+    translate_catalog_entries,
+    translate_provider_bios,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfills the precomputed French catalog names and English/French "
+        "provider bios. New edits are handled automatically by users.signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-translate rows that already have a variant.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        for label in CATALOG_MODELS:
+            qs = apps.get_model(label).objects.all()
+            if not options["all"]:
+                qs = qs.filter(name_fr="")
+            pks = list(qs.values_list("pk", flat=True))
+            for start in range(0, len(pks), batch_size):
+                translate_catalog_entries(label, pks[start : start + batch_size])
+            self.stdout.write(f"{label}: {len(pks)} entries processed")
+
+        qs = ProviderProfile.objects.exclude(bio__isnull=True).exclude(bio="")
+        if not options["all"]:
+            qs = qs.filter(bio_en="") | qs.filter(bio_fr="")
+        ids = list(qs.values_list("id", flat=True))
+        for start in range(0, len(ids), batch_size):
+            translate_provider_bios(ids[start : start + batch_size])
+        self.stdout.write(self.style.SUCCESS(f"Provider bios: {len(ids)} processed"))
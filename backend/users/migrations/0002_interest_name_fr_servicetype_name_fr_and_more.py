@@ -0,0 +1,38 @@
+# Generated by Django 5.1.3 on 2026-10-19 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interest',
+            name='name_fr',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='servicetype',
+            name='name_fr',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='speciality',
+            name='name_fr',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='providerprofile',
+            name='bio_en',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='providerprofile',
+            name='bio_fr',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
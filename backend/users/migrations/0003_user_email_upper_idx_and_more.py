@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-19 14:05
+
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY: no write lock on large tables, no transaction
+    atomic = False
+
+    dependencies = [
+        ('users', '0002_interest_name_fr_servicetype_name_fr_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='users_user_email_upper_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='servicetype',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='servicetype_name_upper_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='providerprofile',
+            index=models.Index(django.db.models.functions.text.Upper('country'), condition=models.Q(('is_searchable', True)), name='provider_search_country_idx'),
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 5.1.3 on 2026-10-19 19:10
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Partition per COUNTRY_CHOICES value at the time of this migration
+COUNTRIES = ('UGANDA', 'CANADA')
+BACKFILL_BATCH_SIZE = 5000
+
+CREATE_TABLES = [
+    # New, empty tables: creating them and their indexes only takes brief
+    # locks; the foreign keys need no validation scan
+    """
+    CREATE TABLE users_providersearchentry (
+        provider_id bigint NOT NULL
+            REFERENCES users_providerprofile (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        country varchar(100) NOT NULL,
+        service_type_ids bigint[] NOT NULL DEFAULT '{}',
+        pinned_location geography(Point, 4326),
+        updated_at timestamp with time zone NOT NULL,
+        PRIMARY KEY (country, provider_id)
+    ) PARTITION BY LIST (country)
+    """,
+    """
+    CREATE TABLE users_mothersearchentry (
+        mother_id bigint NOT NULL
+            REFERENCES users_motherprofile (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        country varchar(100) NOT NULL,
+        pinned_location geography(Point, 4326),
+        updated_at timestamp with time zone NOT NULL,
+        PRIMARY KEY (country, mother_id)
+    ) PARTITION BY LIST (country)
+    """,
+    *(
+        f"CREATE TABLE {table}_{country.lower()} PARTITION OF {table} FOR VALUES IN ('{country}')"
+        for table in ('users_providersearchentry', 'users_mothersearchentry')
+        for country in COUNTRIES
+    ),
+    'CREATE TABLE users_providersearchentry_default PARTITION OF users_providersearchentry DEFAULT',
+    'CREATE TABLE users_mothersearchentry_default PARTITION OF users_mothersearchentry DEFAULT',
+    # Created on each partition; sync deletes and cascades look rows up by id
+    'CREATE INDEX provider_search_entry_provider_idx ON users_providersearchentry (provider_id)',
+    'CREATE INDEX provider_search_entry_services_idx ON users_providersearchentry USING gin (service_type_ids)',
+    'CREATE INDEX provider_search_entry_location_idx ON users_providersearchentry USING gist (pinned_location)',
+    'CREATE INDEX mother_search_entry_mother_idx ON users_mothersearchentry (mother_id)',
+    'CREATE INDEX mother_search_entry_location_idx ON users_mothersearchentry USING gist (pinned_location)',
+]
+
+DROP_TABLES = [
+    'DROP TABLE IF EXISTS users_providersearchentry',
+    'DROP TABLE IF EXISTS users_mothersearchentry',
+]
+
+BACKFILL = {
+    'users_providerprofile': """
+        INSERT INTO users_providersearchentry (provider_id, country, service_type_ids, pinned_location, updated_at)
+        SELECT p.id, upper(trim(p.country)),
+               coalesce(array_agg(st.servicetype_id) FILTER (WHERE st.id IS NOT NULL), '{}'),
+               p.pinned_location, now()
+        FROM users_providerprofile p
+        LEFT JOIN users_providerprofile_service_types st ON st.providerprofile_id = p.id
+        WHERE p.id > %s AND p.id <= %s AND p.is_searchable
+        GROUP BY p.id
+        ON CONFLICT (country, provider_id) DO NOTHING
+    """,
+    'users_motherprofile': """
+        INSERT INTO users_mothersearchentry (mother_id, country, pinned_location, updated_at)
+        SELECT m.id, upper(trim(m.country)), m.pinned_location, now()
+        FROM users_motherprofile m
+        WHERE m.id > %s AND m.id <= %s
+        ON CONFLICT (country, mother_id) DO NOTHING
+    """,
+}
+
+
+def backfill(apps, schema_editor):
+    """
+    Copies existing profiles in id ranges, one short transaction each, so
+    profile writes are never blocked behind a single long INSERT ... SELECT.
+    Rows the running code syncs meanwhile win (ON CONFLICT DO NOTHING).
+    """
+    from django.db import transaction
+
+    connection = schema_editor.connection
+    for table, insert in BACKFILL.items():
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT coalesce(max(id), 0) FROM {table}')
+            (max_id,) = cursor.fetchone()
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(insert, [start, start + BACKFILL_BATCH_SIZE])
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE users_providersearchentry')
+        cursor.execute('ANALYZE users_mothersearchentry')
+
+
+class Migration(migrations.Migration):
+
+    # Backfill batches commit one by one
+    atomic = False
+
+    dependencies = [
+        ('users', '0003_user_email_upper_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='MotherSearchEntry',
+                    fields=[
+                        ('mother', models.OneToOneField(on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='users.motherprofile')),
+                        ('country', models.CharField(max_length=100)),
+                        ('pinned_location', django.contrib.gis.db.models.fields.PointField(blank=True, geography=True, null=True, srid=4326)),
+                        ('updated_at', models.DateTimeField()),
+                    ],
+                    options={
+                        'db_table': 'users_mothersearchentry',
+                        'managed': False,
+                    },
+                ),
+                migrations.CreateModel(
+                    name='ProviderSearchEntry',
+                    fields=[
+                        ('provider', models.OneToOneField(on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='users.providerprofile')),
+                        ('country', models.CharField(max_length=100)),
+                        ('service_type_ids', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), default=list, size=None)),
+                        ('pinned_location', django.contrib.gis.db.models.fields.PointField(blank=True, geography=True, null=True, srid=4326)),
+                        ('updated_at', models.DateTimeField()),
+                    ],
+                    options={
+                        'db_table': 'users_providersearchentry',
+                        'managed': False,
+                    },
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(CREATE_TABLES, DROP_TABLES),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.1.3 on 2026-10-19 21:40
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Constant defaults: a catalog-only change on every partition, no rewrite
+ADD_COLUMNS = """
+    ALTER TABLE users_providersearchentry
+        ADD COLUMN term_buckets smallint[] NOT NULL DEFAULT '{}',
+        ADD COLUMN language smallint NOT NULL DEFAULT -1
+"""
+
+DROP_COLUMNS = """
+    ALTER TABLE users_providersearchentry
+        DROP COLUMN term_buckets,
+        DROP COLUMN language
+"""
+
+UPDATE = """
+    UPDATE users_providersearchentry e
+    SET term_buckets = f.term_buckets::smallint[], language = f.language
+    FROM unnest(%s::bigint[], %s::text[], %s::smallint[]) AS f (id, term_buckets, language)
+    WHERE e.provider_id = f.id
+"""
+
+
+def backfill(apps, schema_editor):
+    """
+    Fills the ranking inputs of existing entries in id ranges, one short
+    transaction each. Entries synced meanwhile by the running code are
+    recomputed from the same profile rows, so either write is correct.
+    """
+    from django.db import transaction
+
+    from onboarding.ranking import language_index, term_buckets
+
+    ProviderProfile = apps.get_model('users', 'ProviderProfile')
+    connection = schema_editor.connection
+    last = 0
+    while True:
+        batch = list(
+            ProviderProfile.objects.filter(pk__gt=last, is_searchable=True)
+            .order_by('pk')
+            .values_list('pk', 'preferred_language')[:BACKFILL_BATCH_SIZE]
+        )
+        if not batch:
+            return
+        ids = [pk for pk, _ in batch]
+        names = {pk: [] for pk in ids}
+        for field in ('service_types__name', 'specialities__name'):
+            for pk, name in ProviderProfile.objects.filter(
+                pk__in=ids, **{f'{field}__isnull': False}
+            ).values_list('pk', field):
+                names[pk].append(name)
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                UPDATE,
+                [
+                    ids,
+                    ['{' + ','.join(map(str, term_buckets(names[pk]))) + '}' for pk in ids],
+                    [language_index(language) for _, language in batch],
+                ],
+            )
+        last = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    # Backfill batches commit one by one
+    atomic = False
+
+    dependencies = [
+        ('users', '0004_search_partitions'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='providersearchentry',
+                    name='term_buckets',
+                    field=django.contrib.postgres.fields.ArrayField(base_field=models.SmallIntegerField(), default=list, size=None),
+                ),
+                migrations.AddField(
+                    model_name='providersearchentry',
+                    name='language',
+                    field=models.SmallIntegerField(default=-1),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(ADD_COLUMNS, DROP_COLUMNS),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-19 22:10
+
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY: no write lock on large tables, no transaction
+    atomic = False
+
+    dependencies = [
+        ('users', '0005_search_entry_features'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Upper('username'), name='users_user_username_upper_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.contrib.gis.db import models
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.db.models import Q
+from django.db.models.functions import Upper
 
 
 class User(AbstractUser):
@@ -16,6 +18,14 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, null=True, blank=True)
     email = models.EmailField(unique=True, blank=False, null=False)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Login/forgot-password look emails up with iexact -> UPPER(email)
+            models.Index(Upper("email"), name="users_user_email_upper_idx"),
+            # Roster imports check usernames case-insensitively
+            models.Index(Upper("username"), name="users_user_username_upper_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.id})"
 
@@ -23,6 +33,7 @@ class User(AbstractUser):
 # === Other Models ===
 class Interest(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    name_fr = models.CharField(max_length=255, blank=True, default="")
 
     def __str__(self):
         return self.name
@@ -38,6 +49,12 @@ LANGUAGE_CHOICES = (
     ("French", "French"),
 )
 
+# Maps LANGUAGE_CHOICES values to the codes used by translation and *_fr fields
+LANGUAGE_CODES = {
+    "English": "en",
+    "French": "fr",
+}
+
 
 class MotherProfile(models.Model):
     user = models.OneToOneField(
@@ -72,6 +89,13 @@ class MotherProfile(models.Model):
 
 class ServiceType(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    name_fr = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            # Provider search matches service names with iexact
+            models.Index(Upper("name"), name="servicetype_name_upper_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -79,6 +103,7 @@ class ServiceType(models.Model):
 
 class Speciality(models.Model):
     name = models.CharField(max_length=100)
+    name_fr = models.CharField(max_length=255, blank=True, default="")
     service_type = models.ForeignKey(
         ServiceType, on_delete=models.CASCADE, related_name="specialities"
     )
@@ -105,6 +130,9 @@ class ProviderProfile(models.Model):
     )
     pinned_location = models.PointField(geography=True, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
+    # Precomputed bio variants, filled in the background (users.tasks)
+    bio_en = models.TextField(blank=True, default="")
+    bio_fr = models.TextField(blank=True, default="")
     license_number = models.CharField(max_length=100, blank=True, null=True)
     credentials = models.TextField(blank=True, null=True)
     associated_clinic = models.CharField(max_length=100, blank=True, null=True)
@@ -140,5 +168,62 @@ class ProviderProfile(models.Model):
     # 🚩 Tutorial flag
     has_completed_tutorial = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Provider search: is_searchable = true AND country iexact (UPPER)
+            models.Index(
+                Upper("country"),
+                name="provider_search_country_idx",
+                condition=Q(is_searchable=True),
+            ),
+        ]
+
     def __str__(self):
         return f"ProviderProfile: {self.user.username}"
+
+
+# 🌍 Country-partitioned search copies (users.country_partitions). The tables
+# are PARTITION BY LIST (country) with PRIMARY KEY (country, <profile>_id),
+# created in SQL by the 0004 migration; Django does not manage them.
+class ProviderSearchEntry(models.Model):
+    provider = models.OneToOneField(
+        ProviderProfile,
+        on_delete=models.DO_NOTHING,  # ON DELETE CASCADE in the database
+        primary_key=True,
+        related_name="search_entry",
+    )
+    # country_key(): upper-cased, one partition per COUNTRY_CHOICES value
+    country = models.CharField(max_length=100)
+    service_type_ids = ArrayField(models.BigIntegerField(), default=list)
+    # Ranking inputs (onboarding.ranking): hashed tokens of the provider's
+    # service and speciality names, and the index of preferred_language
+    term_buckets = ArrayField(models.SmallIntegerField(), default=list)
+    language = models.SmallIntegerField(default=-1)
+    pinned_location = models.PointField(geography=True, blank=True, null=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "users_providersearchentry"
+
+    def __str__(self):
+        return f"ProviderSearchEntry: {self.provider_id} ({self.country})"
+
+
+class MotherSearchEntry(models.Model):
+    mother = models.OneToOneField(
+        MotherProfile,
+        on_delete=models.DO_NOTHING,  # ON DELETE CASCADE in the database
+        primary_key=True,
+        related_name="search_entry",
+    )
+    country = models.CharField(max_length=100)
+    pinned_location = models.PointField(geography=True, blank=True, null=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "users_mothersearchentry"
+
+    def __str__(self):
+        return f"MotherSearchEntry: {self.mother_id} ({self.country})"
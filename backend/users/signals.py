@@ -0,0 +1,69 @@
+# users/signals.py
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from MothersGarage.tasks import run_in_background
+
+from .country_partitions import sync_mother_entries, sync_provider_entries
+from .models import Interest, MotherProfile, ProviderProfile, ServiceType, Speciality
+from .tasks import translate_catalog_entries, translate_provider_bios
+
+
+def _touches(update_fields, *fields):
+    return update_fields is None or any(f in update_fields for f in fields)
+
+
+@receiver(post_save, sender=Interest)
+@receiver(post_save, sender=ServiceType)
+@receiver(post_save, sender=Speciality)
+def queue_catalog_translation(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, "name"):
+        run_in_background(
+            translate_catalog_entries, sender._meta.label, [instance.pk]
+        )
+
+
+@receiver(post_save, sender=ProviderProfile)
+def queue_bio_translation(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, "bio", "preferred_language"):
+        run_in_background(translate_provider_bios, [instance.pk])
+
+
+# Search entries are synced in the saving transaction: search reads them, so
+# they must never lag behind the profile (users.country_partitions)
+@receiver(post_save, sender=ProviderProfile)
+def sync_provider_search_entry(sender, instance, update_fields=None, **kwargs):
+    if _touches(
+        update_fields, "is_searchable", "country", "pinned_location", "preferred_language"
+    ):
+        sync_provider_entries([instance.pk])
+
+
+@receiver(m2m_changed, sender=ProviderProfile.service_types.through)
+@receiver(m2m_changed, sender=ProviderProfile.specialities.through)
+def sync_provider_services_entry(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # instance is a catalog item; post_clear leaves pk_set empty, so the
+        # affected providers are caught up by search_partitions --rebuild
+        sync_provider_entries(pk_set or ())
+    else:
+        sync_provider_entries([instance.pk])
+
+
+@receiver(post_save, sender=ServiceType)
+@receiver(post_save, sender=Speciality)
+def queue_catalog_entry_sync(sender, instance, created, update_fields=None, **kwargs):
+    # A renamed item changes the term buckets of every provider offering it
+    if not created and _touches(update_fields, "name"):
+        run_in_background(
+            sync_provider_entries,
+            list(instance.providerprofile_set.values_list("pk", flat=True)),
+        )
+
+
+@receiver(post_save, sender=MotherProfile)
+def sync_mother_search_entry(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, "country", "pinned_location"):
+        sync_mother_entries([instance.pk])
@@ -0,0 +1,62 @@
+# users/tasks.py
+from django.apps import apps
+
+from onboarding.translation import translate_many
+
+from .localization import DEFAULT_LANGUAGE_CODE, language_code
+from .models import ProviderProfile
+
+# Catalog entries are maintained in English by admins
+CATALOG_MODELS = ("users.Interest", "users.ServiceType", "users.Speciality")
+
+
+def translate_catalog_entries(model_label, pks):
+    """
+    Fills name_fr for the given catalog rows in one translation batch.
+    """
+    model = apps.get_model(model_label)
+    rows = list(model.objects.filter(pk__in=pks).only("id", "name"))
+    translated = translate_many(
+        [row.name for row in rows],
+        source_lang=DEFAULT_LANGUAGE_CODE,
+        target_lang="fr",
+        fallback=False,
+    )
+    for row, name_fr in zip(rows, translated):
+        # .update() keeps post_save quiet so this job doesn't re-queue itself.
+        # A failed translation leaves name_fr empty: readers fall back to name
+        # and `manage.py translate_content` picks the row up again
+        model.objects.filter(pk=row.pk).update(name_fr=name_fr or "")
+
+
+def translate_provider_bios(profile_ids):
+    """
+    Stores English and French variants of each provider bio, translating from
+    the provider's preferred_language.
+    """
+    profiles = ProviderProfile.objects.filter(id__in=profile_ids).only(
+        "id", "bio", "bio_en", "bio_fr", "preferred_language"
+    )
+    by_source = {}
+    for profile in profiles:
+        source = language_code(profile.preferred_language)
+        if not profile.bio:
+            if profile.bio_en or profile.bio_fr:
+                ProviderProfile.objects.filter(pk=profile.pk).update(
+                    bio_en="", bio_fr=""
+                )
+            continue
+        target = "fr" if source == "en" else "en"
+        if getattr(profile, f"bio_{source}") == profile.bio and getattr(
+            profile, f"bio_{target}"
+        ):
+            continue  # variants already match the current bio
+        by_source.setdefault((source, target), []).append(profile)
+
+    for (source, target), group in by_source.items():
+        translated = translate_many([p.bio for p in group], source, target, fallback=False)
+        for profile, bio_translated in zip(group, translated):
+            # Untranslated (None): an empty target variant is retried later
+            ProviderProfile.objects.filter(pk=profile.pk).update(
+                **{f"bio_{source}": profile.bio, f"bio_{target}": bio_translated or ""}
+            )